@@ -0,0 +1,74 @@
+"""
+문서 해제 벤치마크
+DocumentManager가 문서를 해제했을 때 파서 객체를 계속 참조하는 곳(뷰어의 현재 문서 등)이 있어도
+트리, 검색 인덱스와 Dataset의 메모리가 실제로 해제되는지 tracemalloc으로 확인합니다.
+해제 후 남은 메모리가 로드한 메모리의 허용 비율을 넘으면 실패로 표시하고 종료 코드 1을 반환합니다.
+
+사용법:
+    python benchmarks/bench_documents.py [--items 5000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from common import timed
+from sr_generator import SRGenerator, groups_for_items
+
+# 해제 후 남아도 되는 메모리 비율 (로드한 문서 메모리 대비)
+RETAINED_LIMIT = 0.05
+
+def traced_memory():
+    """가비지 컬렉션 후 tracemalloc이 추적하는 현재 메모리(bytes)를 반환합니다."""
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+def main():
+    parser = argparse.ArgumentParser(description='문서 해제 벤치마크')
+    parser.add_argument('--items', type=int, default=5000, help='콘텐츠 아이템 수')
+    args = parser.parse_args()
+    
+    from models.dicom_sr_parser import DicomSRParser
+    from models.document_manager import DocumentManager
+    
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'documents.dcm')
+        count = SRGenerator(groups=groups_for_items(args.items, 2, 4), depth=2, fanout=4).write(file_path)
+        
+        for lazy in (False, True):
+            # 처음 로드할 때 임포트되는 모듈과 캐시가 남은 메모리로 잡히지 않도록 한 번 먼저 로드
+            warmup = DicomSRParser(lazy=lazy)
+            warmup.load_file(file_path)
+            warmup.parse_sr()
+            warmup.release()
+            
+            documents = DocumentManager()
+            tracemalloc.start()
+            before = traced_memory()
+            
+            sr_parser = DicomSRParser(lazy=lazy)
+            load_time, _ = timed(sr_parser.load_file, file_path)
+            # parse_sr가 반환하는 루트 노드를 변수에 남기지 않도록 시간만 받음
+            load_time += timed(sr_parser.parse_sr)[0]
+            documents.add(file_path, sr_parser)
+            loaded = traced_memory() - before
+            
+            # 뷰어의 현재 문서처럼 sr_parser 참조를 유지한 채 해제
+            documents.remove(file_path)
+            retained = traced_memory() - before
+            tracemalloc.stop()
+            
+            ok = retained <= loaded * RETAINED_LIMIT and sr_parser.get_tree() is None and not sr_parser.nodes
+            failed = failed or not ok
+            print(f'{"지연 로딩" if lazy else "전체 로드":<8} 아이템 {count}개  로드 {load_time:6.2f}초  '
+                  f'문서 {loaded / (1024 * 1024):8.1f} MB  해제 후 {retained / (1024 * 1024):6.2f} MB  '
+                  f'{"통과" if ok else "실패"}')
+    
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
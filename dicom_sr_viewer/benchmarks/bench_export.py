@@ -0,0 +1,79 @@
+"""
+내보내기 벤치마크
+파싱된 트리를 dict 트리로 바꾼 뒤 json.dumps로 한 번에 직렬화하는 방식과
+SRExportWriter로 노드마다 바로 쓰는 방식의 시간과 추가 메모리(tracemalloc 최대값)를 비교합니다.
+
+사용법:
+    python benchmarks/bench_export.py [--items 200000]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import tracemalloc
+
+from common import timed
+from sr_generator import SRGenerator
+
+def measure(func):
+    """
+    함수의 실행 시간과 tracemalloc 최대 할당량을 측정합니다.
+    
+    tracemalloc은 실행을 크게 느리게 하므로 시간은 추적 없이 따로 한 번 더 실행하여 측정합니다.
+    
+    Returns:
+        tuple: (경과 시간(초), 최대 추가 메모리(MB))
+    """
+    elapsed, _ = timed(func)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+def main():
+    parser = argparse.ArgumentParser(description='내보내기 벤치마크')
+    parser.add_argument('--items', type=int, default=200000, help='콘텐츠 아이템 수')
+    args = parser.parse_args()
+    
+    from models.dicom_sr_parser import DicomSRParser
+    from models.sr_export import SRExportWriter
+    from models.sr_tree import tree_to_dicts
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'export.dcm')
+        generator = SRGenerator(groups=max(1, (args.items - 1) // 11), depth=1, fanout=10)
+        elapsed, count = timed(generator.write, file_path)
+        print(f'콘텐츠 아이템 {count}개, {os.path.getsize(file_path) / (1024 * 1024):.1f} MB '
+              f'({elapsed:.1f}초에 생성)')
+        
+        sr_parser = DicomSRParser(build_index=False)
+        sr_parser.load_file(file_path)
+        sr_parser.parse_sr()
+        
+        def write_with(export_format):
+            def run():
+                with open(os.devnull, 'w', encoding='utf-8', newline='') as out:
+                    writer = SRExportWriter(out, export_format)
+                    writer.begin()
+                    writer.write_document(sr_parser)
+                    writer.end()
+            return run
+        
+        def dump_all():
+            with open(os.devnull, 'w', encoding='utf-8') as out:
+                out.write(json.dumps(tree_to_dicts(sr_parser.get_tree()), ensure_ascii=False))
+        
+        cases = [('json.dumps (dict 트리)', dump_all)]
+        cases += [(f'SRExportWriter {export_format}', write_with(export_format))
+                  for export_format in ('json', 'jsonl', 'csv', 'dicom-json')]
+        
+        print(f'{"방식":<28} {"시간(초)":>9} {"추가 메모리(MB)":>16}')
+        for name, func in cases:
+            elapsed, peak = measure(func)
+            print(f'{name:<28} {elapsed:>9.2f} {peak:>16.1f}')
+        sr_parser.close()
+
+if __name__ == '__main__':
+    main()
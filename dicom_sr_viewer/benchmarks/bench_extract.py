@@ -0,0 +1,151 @@
+"""
+콘텐츠 아이템 추출 벤치마크
+키워드로 속성을 찾는 기존 방식(hasattr/getattr, 아이템마다 값 처리 함수 dict 생성)과
+태그 표 기반 추출기(ContentItemExtractor)의 아이템당 노드 생성 시간을 ValueType별로 비교합니다.
+
+pydicom은 요소 값을 처음 읽을 때 변환하여 저장하므로 방식마다 파일을 새로 읽어서 측정합니다.
+
+사용법:
+    python benchmarks/bench_extract.py [--items 50000] [--lazy]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from common import timed
+from sr_generator import NAME_CODES, SRGenerator
+
+def legacy_extract(codes, content_item, node_id):
+    """기존 _create_node_from_content_item과 같은 키워드 기반 노드 생성"""
+    from models.sr_tree import SRNode
+    
+    def code_id(item, sequence_name):
+        if not hasattr(item, sequence_name) or not getattr(item, sequence_name):
+            return None
+        code_seq = getattr(item, sequence_name)[0]
+        return codes.intern(*(str(getattr(code_seq, keyword, None) or '').strip()
+                              for keyword in ('CodeValue', 'CodingSchemeDesignator', 'CodeMeaning')))
+    
+    def text_value(item, node, name_code):
+        if hasattr(item, 'TextValue') and name_code is not None:
+            name_value, name_scheme, name_meaning = codes.get(name_code)
+            node.value = f"{name_meaning} : {item.TextValue} ({name_value} {name_scheme})"
+    
+    def code_value(item, node, name_code):
+        concept_code = code_id(item, 'ConceptCodeSequence')
+        if concept_code is not None:
+            node.concept_code = concept_code
+            if name_code is not None:
+                name_value, name_scheme, name_meaning = codes.get(name_code)
+                code_value, _, code_meaning = codes.get(concept_code)
+                node.value = f"{name_meaning} ({name_value} {name_scheme}) : {code_meaning} ({code_value})"
+    
+    def num_value(item, node, name_code):
+        if not hasattr(item, 'MeasuredValueSequence'):
+            return
+        measured_value = item.MeasuredValueSequence[0]
+        if not hasattr(measured_value, 'NumericValue'):
+            return
+        num_value = measured_value.NumericValue
+        node.numeric = float(getattr(measured_value, 'FloatingPointValue', None) or num_value)
+        node.unit_code = code_id(measured_value, 'MeasurementUnitsCodeSequence')
+        if name_code is not None:
+            name_value, name_scheme, name_meaning = codes.get(name_code)
+            node.value = f"{name_meaning} : {num_value} ({name_value} {name_scheme})"
+    
+    def container_value(item, node, name_code):
+        if name_code is not None:
+            name_value, name_scheme, name_meaning = codes.get(name_code)
+            node.value = f"{name_meaning} ({name_value} {name_scheme})"
+    
+    def default_value(item, node, name_code):
+        node.value = f"ValueType: {item.ValueType}"
+    
+    node = SRNode(node_id, codes)
+    if not hasattr(content_item, 'ValueType'):
+        node.type = 'UNKNOWN'
+        return node, getattr(content_item, 'ContentSequence', None)
+    node.type = sys.intern(content_item.ValueType)
+    name_code = code_id(content_item, 'ConceptNameCodeSequence')
+    node.name_code = name_code
+    value_handlers = {
+        'TEXT': text_value,
+        'CODE': code_value,
+        'NUM': num_value,
+        'CONTAINER': container_value,
+    }
+    value_handlers.get(content_item.ValueType, default_value)(content_item, node, name_code)
+    if hasattr(content_item, 'RelationshipType'):
+        node.relationship = sys.intern(content_item.RelationshipType)
+    return node, getattr(content_item, 'ContentSequence', None)
+
+def measure(file_path, method, lazy):
+    """
+    파일을 새로 읽고 모든 콘텐츠 아이템의 노드 생성 시간을 ValueType별로 누적합니다.
+    
+    Returns:
+        dict: ValueType → [누적 시간(초), 아이템 수]
+    """
+    from models.dicom_sr_parser import DicomSRParser
+    from models.sr_extractor import ContentItemExtractor, text_encoding
+    from models.sr_tree import CodeTable
+    
+    parser = DicomSRParser(lazy=lazy, build_index=False)
+    if not parser.load_file(file_path):
+        raise SystemExit(f'로드 실패: {file_path}')
+    
+    codes = CodeTable()
+    if method == 'legacy':
+        extract = lambda item, node_id: legacy_extract(codes, item, node_id)
+    else:
+        extract = ContentItemExtractor(codes, text_encoding(parser.dataset.get('SpecificCharacterSet'))).extract
+    
+    perf_counter = time.perf_counter
+    totals = {}
+    stack = [(parser.dataset.ContentSequence[0], '1')]
+    while stack:
+        item, node_id = stack.pop()
+        start = perf_counter()
+        node, children = extract(item, node_id)
+        elapsed = perf_counter() - start
+        total = totals.setdefault(node.type, [0.0, 0])
+        total[0] += elapsed
+        total[1] += 1
+        if children:
+            stack.extend((child, f'{node_id}.{i + 1}') for i, child in enumerate(children))
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description='콘텐츠 아이템 추출 벤치마크')
+    parser.add_argument('--items', type=int, default=50000, help='콘텐츠 아이템 수')
+    parser.add_argument('--lazy', action='store_true', help='뷰어와 같이 지연 로딩 모드로 읽기')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'all_types.dcm')
+        generator = SRGenerator(groups=max(1, (args.items - 1) // 5), depth=1, fanout=4,
+                                mix={value_type: 1 for value_type in NAME_CODES})
+        elapsed, count = timed(generator.write, file_path)
+        print(f'콘텐츠 아이템 {count}개, {os.path.getsize(file_path) / (1024 * 1024):.1f} MB '
+              f'({elapsed:.1f}초에 생성)')
+        
+        legacy = measure(file_path, 'legacy', args.lazy)
+        table = measure(file_path, 'table', args.lazy)
+    
+    print(f'{"ValueType":<11} {"아이템":>8} {"기존 µs/아이템":>15} {"태그 표 µs/아이템":>17} {"배율":>7}')
+    for value_type in sorted(table, key=lambda value_type: -table[value_type][1]):
+        base_time, items = legacy[value_type]
+        new_time, _ = table[value_type]
+        print(f'{value_type:<11} {items:>8} {base_time / items * 1e6:>15.1f} {new_time / items * 1e6:>17.1f} '
+              f'{base_time / new_time:>6.1f}x')
+    base_total = sum(total[0] for total in legacy.values())
+    new_total = sum(total[0] for total in table.values())
+    items = sum(total[1] for total in table.values())
+    print(f'{"전체":<11} {items:>8} {base_total / items * 1e6:>15.1f} {new_total / items * 1e6:>17.1f} '
+          f'{base_total / new_total:>6.1f}x')
+
+if __name__ == '__main__':
+    main()
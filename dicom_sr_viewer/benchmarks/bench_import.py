@@ -0,0 +1,77 @@
+"""
+임포트 시간 벤치마크
+새 인터프리터에서 모듈 임포트 시간과 뷰어 창이 표시되기까지의 시간을 측정하고 예산과 비교합니다.
+모델 계층이 PyQt5, pydicom, NumPy 없이 임포트되는지도 확인합니다.
+
+사용법:
+    python benchmarks/bench_import.py [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# 측정 대상 → (실행할 코드, 예산(ms), 임포트되면 안 되는 모듈)
+TARGETS = {
+    'models.dicom_sr_parser': ('import models.dicom_sr_parser', 150, ('PyQt5', 'pydicom', 'numpy')),
+    'models.search': ('import models.search', 50, ('PyQt5', 'pydicom', 'numpy')),
+    'cli': ('import cli', 150, ('PyQt5', 'pydicom', 'numpy')),
+    'main': ('import main', 500, ('pydicom',)),
+    'window': ('import main\n'
+               'from PyQt5.QtWidgets import QApplication\n'
+               'app = QApplication([])\n'
+               'viewer = main.DicomSRViewer()\n'
+               'viewer.show()\n'
+               'app.processEvents()', 1000, ('pydicom',)),
+}
+
+# 자식 인터프리터에서 실행하는 측정 코드
+MEASURE_TEMPLATE = '''
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'modules': sorted({{name.split('.')[0] for name in sys.modules}})}}))
+'''
+
+def measure(code):
+    """
+    새 인터프리터에서 코드를 실행하고 걸린 시간과 임포트된 최상위 모듈을 반환합니다.
+    
+    Returns:
+        tuple: (시간(ms), 최상위 모듈 이름 집합)
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    output = subprocess.run([sys.executable, '-c', MEASURE_TEMPLATE.format(code=code)],
+                            cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result['ms'], set(result['modules'])
+
+def main():
+    parser = argparse.ArgumentParser(description='임포트 시간 벤치마크')
+    parser.add_argument('--repeat', type=int, default=5, help='대상마다 반복 측정 횟수 (중앙값 사용)')
+    args = parser.parse_args()
+    
+    failed = False
+    for name, (code, budget_ms, forbidden) in TARGETS.items():
+        times = []
+        for _ in range(args.repeat):
+            elapsed_ms, modules = measure(code)
+            times.append(elapsed_ms)
+        median_ms = statistics.median(times)
+        
+        loaded = [module for module in forbidden if module in modules]
+        ok = median_ms <= budget_ms and not loaded
+        failed = failed or not ok
+        note = f'  임포트됨: {", ".join(loaded)}' if loaded else ''
+        print(f'{name:<24} {median_ms:8.1f} ms  (예산 {budget_ms:5d} ms)  {"통과" if ok else "초과"}{note}')
+    
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
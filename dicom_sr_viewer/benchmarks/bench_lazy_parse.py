@@ -0,0 +1,56 @@
+"""
+깊이/너비 제한 파싱 벤치마크
+문서 크기별로 전체 파싱(parse_sr)과 뷰어가 사용하는 깊이/너비 제한 파싱의 첫 표시까지의 변환 시간,
+깊은 노드 하나를 펼치는 시간, 남은 노드를 모두 만드는 시간(finish_parse)을 비교합니다.
+pydicom이 파일을 읽는 시간은 두 방식이 같으므로 측정에서 제외합니다.
+
+사용법:
+    python benchmarks/bench_lazy_parse.py [--sizes 10000 100000]
+"""
+
+import argparse
+import os
+import tempfile
+
+from common import timed
+from sr_generator import SRGenerator, groups_for_items
+
+# 뷰어(SRLoader)와 같은 제한 (views.tree_view.DEFAULT_EXPAND_DEPTH, views.tree_model.FETCH_BATCH_SIZE)
+PARSE_DEPTH = 2
+PARSE_BREADTH = 256
+
+def main():
+    parser = argparse.ArgumentParser(description='깊이/너비 제한 파싱 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000], help='콘텐츠 아이템 수')
+    args = parser.parse_args()
+    
+    from models.dicom_sr_parser import DicomSRParser
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            file_path = os.path.join(tmp_dir, f'lazy_{size}.dcm')
+            generator = SRGenerator(groups=groups_for_items(size, 2, 4), depth=2, fanout=4)
+            count = generator.write(file_path)
+            
+            full_parser = DicomSRParser(lazy=True)
+            full_parser.load_file(file_path)
+            full_time, _ = timed(full_parser.parse_sr)
+            full_parser.close()
+            
+            sr_parser = DicomSRParser(lazy=True, parse_depth=PARSE_DEPTH, parse_breadth=PARSE_BREADTH)
+            sr_parser.load_file(file_path)
+            first_time, _ = timed(sr_parser.parse_sr)
+            first_count = len(sr_parser.nodes)
+            
+            # 마지막 측정 그룹의 깊은 항목 하나를 선택할 때처럼 조상을 펼침
+            expand_time, node = timed(sr_parser.node_for_path, f'1.{generator.groups}.4.4')
+            finish_time, _ = timed(sr_parser.finish_parse)
+            sr_parser.close()
+            
+            print(f'아이템 {count:>8}개  전체 파싱 {full_time * 1000:9.1f} ms  '
+                  f'첫 표시 {first_time * 1000:7.1f} ms ({first_count}개)  '
+                  f'펼치기 {expand_time * 1000:6.2f} ms  나머지 {finish_time * 1000:9.1f} ms'
+                  f'{"" if node is not None else "  (노드 없음)"}')
+
+if __name__ == '__main__':
+    main()
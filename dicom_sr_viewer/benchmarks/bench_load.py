@@ -0,0 +1,59 @@
+"""
+로드 벤치마크
+전체 읽기와 지연 로딩(일반/메모리 매핑) 모드의 load_file + parse_sr 시간과 최대 RSS를 비교합니다.
+
+사용법:
+    python benchmarks/bench_load.py [--groups N] [--blob-mb M]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import peak_rss_mb, timed
+from sr_generator import SRGenerator
+
+MODES = {
+    'full': {},
+    'lazy': {'lazy': True},
+    'lazy+mmap': {'lazy': True, 'use_mmap': True},
+}
+
+def run_single(file_path, mode):
+    """한 프로세스에서 한 가지 모드만 측정합니다 (RSS가 섞이지 않도록)."""
+    from models.dicom_sr_parser import DicomSRParser
+    
+    parser = DicomSRParser(**MODES[mode])
+    base_rss = peak_rss_mb()
+    load_time, ok = timed(parser.load_file, file_path)
+    load_rss = peak_rss_mb() - base_rss
+    parse_time, tree = timed(parser.parse_sr)
+    if not ok or tree is None:
+        raise SystemExit(f'{mode}: 로드 실패')
+    print(f'{mode:<10} load {load_time * 1000:9.1f} ms  parse {parse_time * 1000:9.1f} ms  '
+          f'load RSS +{load_rss:7.1f} MB  peak RSS {peak_rss_mb():8.1f} MB')
+
+def main():
+    parser = argparse.ArgumentParser(description='DICOM SR 로드 벤치마크')
+    parser.add_argument('--groups', type=int, default=500, help='측정 그룹 수')
+    parser.add_argument('--blob-mb', type=int, default=20, help='대용량 요소 크기 (MB)')
+    parser.add_argument('--single', nargs=2, metavar=('FILE', 'MODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.single:
+        run_single(*args.single)
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'large_sr.dcm')
+        SRGenerator(groups=args.groups, depth=1, fanout=3, blob_size=args.blob_mb * 1024 * 1024).write(file_path)
+        print(f'파일 크기: {os.path.getsize(file_path) / (1024 * 1024):.1f} MB, '
+              f'측정 그룹 {args.groups}개')
+        for mode in MODES:
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--single', file_path, mode],
+                           check=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+검색 벤치마크
+역색인(TextIndex) 검색과 기존 방식(트리 전체 순회 + 값 소문자 변환)의 질의 시간,
+버킷 인덱스(AttributeIndex)를 사용하는 advanced_search와 기존 방식(모든 노드 수집 후 목록 필터링)의
+질의 시간을 비교합니다.
+
+사용법:
+    python benchmarks/bench_search.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+
+from common import make_node_tree, timed
+
+QUERIES = ['nodule', 'right upper', 'lung', 'size : 4', 'xyz-not-found']
+
+CRITERIA = [
+    {'type': 'TEXT'},
+    {'text': 'nodule', 'type': 'TEXT', 'relationship': 'CONTAINS'},
+    {'text': 'size', 'type': 'NUM'},
+    {'type': 'CONTAINER', 'relationship': 'CONTAINS'},
+]
+
+def walk_search(root, search_term):
+    """기존 search_in_tree와 같은 전체 순회 검색"""
+    from models.dicom_sr_parser import walk_tree
+    
+    search_term = search_term.lower()
+    return [node for _, _, node in walk_tree(root)
+            if isinstance(node.get('value'), str) and search_term in node['value'].lower()]
+
+def filter_search(root, criteria):
+    """기존 advanced_search와 같은 모든 노드 수집 후 목록 필터링"""
+    from models.dicom_sr_parser import walk_tree
+    
+    results = [node for _, _, node in walk_tree(root)]
+    if criteria.get('text'):
+        results = [node for node in results
+                   if isinstance(node.get('value'), str) and criteria['text'].lower() in node['value'].lower()]
+    if criteria.get('type'):
+        results = [node for node in results if node.get('type') == criteria['type'].upper()]
+    if criteria.get('relationship'):
+        results = [node for node in results if node.get('relationship') == criteria['relationship'].upper()]
+    return results
+
+class _TreeParser:
+    """DicomSRSearcher에 넘길 최소한의 파서 (이미 만든 트리와 인덱스 사용)"""
+    
+    def __init__(self, root, nodes):
+        from models.search_index import AttributeIndex, TextIndex
+        
+        self.tree = root
+        self.nodes = nodes
+        self.codes = root.codes
+        self.text_index = TextIndex(nodes)
+        self.attribute_index = AttributeIndex(nodes)
+    
+    def get_tree(self):
+        return self.tree
+
+def main():
+    parser = argparse.ArgumentParser(description='텍스트 검색 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='트리 노드 수')
+    args = parser.parse_args()
+    
+    from models.search import DicomSRSearcher
+    from models.search_index import TextIndex
+    
+    for size in args.sizes:
+        root, nodes = make_node_tree(size)
+        build_time, index = timed(TextIndex, nodes)
+        print(f'노드 {size}개 - 인덱스 생성 {build_time * 1000:.0f} ms')
+        for query in QUERIES:
+            walk_time, expected = timed(walk_search, root, query)
+            index_time, found = timed(index.search, query)
+            assert [nodes[i] for i in found] == expected
+            print(f'  {query!r:<18} 결과 {len(found):7d}개  순회 {walk_time * 1000:9.2f} ms  '
+                  f'인덱스 {index_time * 1000:8.3f} ms  ({walk_time / max(index_time, 1e-9):7.0f}배)')
+        
+        searcher = DicomSRSearcher(_TreeParser(root, nodes))
+        for criteria in CRITERIA:
+            filter_time, expected = timed(filter_search, root, criteria)
+            index_time, found = timed(searcher.advanced_search, criteria)
+            assert found == expected
+            print(f'  {str(criteria):<58} 결과 {len(found):7d}개  필터 {filter_time * 1000:9.2f} ms  '
+                  f'인덱스 {index_time * 1000:8.3f} ms  ({filter_time / max(index_time, 1e-9):5.0f}배)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+트리 메모리 벤치마크
+같은 SR을 기존 중첩 dict 트리와 SRNode 트리로 표현했을 때의 메모리 사용량을 비교합니다.
+기존 파서는 노드마다 코드 문자열을 새로 만들었으므로 dict 트리는 코드 문자열을 노드별로 복사하고,
+SRNode 트리는 문서 코드 사전(CodeTable)을 공유합니다.
+
+사용법:
+    python benchmarks/bench_tree_memory.py [--groups N]
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import tracemalloc
+
+from common import timed
+from sr_generator import SRGenerator
+
+def measure(build):
+    """
+    build()가 만든 객체가 점유하는 메모리(bytes)를 측정합니다.
+    
+    Returns:
+        tuple: (점유 메모리, build 결과)
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+def main():
+    parser = argparse.ArgumentParser(description='SR 트리 메모리 벤치마크')
+    parser.add_argument('--groups', type=int, default=5000, help='측정 그룹 수 (그룹당 콘텐츠 아이템 4개)')
+    args = parser.parse_args()
+    
+    from models.dicom_sr_parser import DicomSRParser
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'large_sr.dcm')
+        SRGenerator(groups=args.groups, depth=1, fanout=3).write(file_path)
+        
+        sr_parser = DicomSRParser()
+        sr_parser.load_file(file_path)
+        parse_time, tree = timed(sr_parser.parse_sr)
+        node_count = len(sr_parser.nodes)
+        
+        # 두 표현을 새로 만들어 비교 (parse_sr 자체는 pydicom 요소 변환 비용이 섞이므로 측정에 쓰지 않음)
+        dict_bytes, _ = measure(lambda: tree_to_legacy_dicts(tree))
+        tree_bytes, _ = measure(lambda: tree_to_nodes(tree))
+    
+    print(f'콘텐츠 아이템 {node_count}개, parse_sr {parse_time:.2f} s')
+    print(f'dict 트리   : {dict_bytes / (1024 * 1024):8.1f} MB ({dict_bytes / node_count:6.0f} B/노드)')
+    print(f'SRNode 트리 : {tree_bytes / (1024 * 1024):8.1f} MB ({tree_bytes / node_count:6.0f} B/노드)')
+    print(f'감소율      : {(1 - tree_bytes / dict_bytes) * 100:8.1f} %')
+
+def tree_to_legacy_dicts(root):
+    """기존 파서처럼 노드마다 코드 문자열을 따로 가지는 중첩 dict 트리를 만듭니다."""
+    from models.dicom_sr_parser import walk_tree
+    from models.sr_tree import CODE_KEYS, tree_to_dicts
+    
+    dict_tree = tree_to_dicts(root)
+    for _, _, node in walk_tree(dict_tree):
+        for key in CODE_KEYS:
+            if key in node:
+                # 같은 내용의 새 문자열 객체
+                node[key] = (node[key] + '.')[:-1]
+    return dict_tree
+
+def tree_to_nodes(root):
+    """SRNode 트리를 같은 문자열을 공유하는 새 SRNode 트리로 복사합니다."""
+    from models.dicom_sr_parser import walk_tree
+    from models.sr_tree import SRNode
+    
+    copies = {}
+    for _, _, node in walk_tree(root):
+        copy = SRNode(node.id, node.codes, node.index)
+        for slot in SRNode.__slots__:
+            if slot != 'children':
+                setattr(copy, slot, getattr(node, slot))
+        copies[node.index] = copy
+    for _, _, node in walk_tree(root):
+        copies[node.index].children = [copies[child.index] for child in node.children]
+    return copies[root.index]
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+트리 뷰 벤치마크
+기존 방식(노드마다 QTreeWidgetItem 생성 후 expandAll)과 지연 로딩 모델(DicomSRTreeView)의
+트리 표시 시간과 검색 결과 하이라이트 시간을 비교합니다. 오프스크린 Qt 플랫폼에서 실행됩니다.
+
+사용법:
+    python benchmarks/bench_tree_view.py [--sizes 10000 100000]
+"""
+
+import argparse
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from common import make_node_tree, timed
+
+def build_tree_widget(tree_widget, root):
+    """기존 set_tree_data와 같이 모든 노드의 QTreeWidgetItem을 만들고 모두 펼칩니다."""
+    from PyQt5.QtWidgets import QTreeWidgetItem
+    
+    tree_widget.clear()
+    root_item = QTreeWidgetItem(tree_widget)
+    root_item.setText(0, root.get('value', 'DICOM SR Document'))
+    stack = [(root_item, root)]
+    while stack:
+        parent_item, node = stack.pop()
+        for child in node.get('children', []):
+            item = QTreeWidgetItem(parent_item)
+            item.setText(0, str(child.get('value', '')))
+            relationship = child.get('relationship', '')
+            item.setText(1, f"{relationship}: {child.get('type', '')}" if relationship else child.get('type', ''))
+            stack.append((item, child))
+    tree_widget.expandAll()
+
+def main():
+    parser = argparse.ArgumentParser(description='트리 뷰 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000], help='트리 노드 수')
+    args = parser.parse_args()
+    
+    from PyQt5.QtWidgets import QApplication, QTreeWidget
+    from views.tree_view import DicomSRTreeView
+    
+    app = QApplication([])
+    
+    for size in args.sizes:
+        root, nodes = make_node_tree(size)
+        matches = nodes[::50]
+        
+        tree_widget = QTreeWidget()
+        tree_widget.setHeaderLabels(["값", "항목"])
+        tree_widget.show()
+        widget_time, _ = timed(build_tree_widget, tree_widget, root)
+        paint_time, _ = timed(app.processEvents)
+        widget_time += paint_time
+        
+        tree_view = DicomSRTreeView()
+        tree_view.show()
+        view_time, _ = timed(tree_view.set_tree_data, root)
+        paint_time, _ = timed(app.processEvents)
+        view_time += paint_time
+        highlight_time, _ = timed(tree_view.highlight_search_results, matches)
+        paint_time, _ = timed(app.processEvents)
+        highlight_time += paint_time
+        
+        print(f'노드 {size}개  QTreeWidget {widget_time * 1000:9.1f} ms  '
+              f'모델/뷰 {view_time * 1000:8.1f} ms  ({widget_time / view_time:5.0f}배)  '
+              f'하이라이트 {len(matches)}개 {highlight_time * 1000:8.1f} ms')
+        
+        tree_widget.deleteLater()
+        tree_view.deleteLater()
+        app.processEvents()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+벤치마크 공통 모듈
+벤치마크 스크립트에서 사용하는 측정 도구와 합성 SRNode 트리를 제공합니다.
+합성 DICOM SR 파일은 sr_generator 모듈로 생성합니다.
+"""
+
+import os
+import random
+import sys
+import time
+
+# src 디렉터리를 모듈 검색 경로에 추가
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+def make_node_tree(size):
+    """
+    pydicom을 거치지 않고 측정 그룹이 반복되는 SRNode 트리를 만듭니다.
+    
+    Returns:
+        tuple: (루트 노드, 노드 리스트)
+    """
+    from models.sr_tree import CodeTable, SRNode
+    
+    rng = random.Random(0)
+    codes = CodeTable()
+    sites = ['right upper lobe', 'left lower lobe', 'liver segment 4', 'right kidney']
+    root = SRNode('1', codes, 0)
+    root.type = 'CONTAINER'
+    root.value = 'Imaging Measurement Report (126000 DCM)'
+    nodes = [root]
+    group = None
+    while len(nodes) < size:
+        index = len(nodes)
+        if index % 4 == 1:
+            group = SRNode(f'1.{len(root.children) + 1}', codes, index)
+            group.type = 'CONTAINER'
+            group.value = 'Measurement Group (125007 DCM)'
+            group.relationship = 'CONTAINS'
+            root.children.append(group)
+            node = group
+        else:
+            node = SRNode(f'{group.id}.{len(group.children) + 1}', codes, index)
+            node.type = 'TEXT' if index % 4 == 2 else 'NUM'
+            node.relationship = 'CONTAINS' if index % 4 == 2 else 'HAS PROPERTIES'
+            if node.type == 'TEXT':
+                node.value = f'Finding : Nodule {index} in the {rng.choice(sites)} (121071 DCM)'
+            else:
+                node.value = f'Size : {rng.randint(1, 60) / 2} (410668003 SCT)'
+            group.children.append(node)
+        nodes.append(node)
+    return root, nodes
+
+def timed(func, *args, **kwargs):
+    """
+    함수를 실행하고 경과 시간(초)과 결과를 반환합니다.
+    
+    Returns:
+        tuple: (경과 시간, 함수 결과)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS(MB)를 반환합니다."""
+    # Linux의 ru_maxrss는 exec 이전 부모 프로세스의 값을 물려받으므로 VmHWM을 우선 사용
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 bytes, Linux는 KB 단위
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
@@ -0,0 +1,272 @@
+"""
+벤치마크 모음
+합성 SR 시나리오마다 load_file, parse_sr, search_in_tree, 입력하는 대로 검색, advanced_search,
+측정값 검색, set_tree_data, highlight_search_results 시간을 측정하고 결과를 JSON으로 저장합니다.
+이전 결과 파일과 비교하여 느려진 단계를 표시할 수 있습니다.
+
+사용법:
+    python benchmarks/run_suite.py [--scenarios small medium] [-o results.json] [--compare baseline.json]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from common import peak_rss_mb, timed
+from sr_generator import DEFAULT_MIX, SRGenerator, groups_for_items
+
+# 결과 파일 형식 버전
+RESULT_FORMAT_VERSION = 1
+
+# 시나리오 → 생성기 설정
+SCENARIOS = {
+    'small': {'items': 500, 'depth': 1, 'fanout': 4},
+    'medium': {'items': 10000, 'depth': 2, 'fanout': 4},
+    'deep': {'items': 10000, 'depth': 8, 'fanout': 2},
+    'text-heavy': {'items': 10000, 'depth': 1, 'fanout': 8, 'mix': {'TEXT': 1}, 'text_length': 400},
+    'large': {'items': 100000, 'depth': 2, 'fanout': 6},
+    'xlarge': {'items': 1000000, 'depth': 2, 'fanout': 8},
+}
+DEFAULT_SCENARIOS = ['small', 'medium', 'deep']
+
+# 검색 단계에서 사용하는 검색어와 조건
+SEARCH_QUERIES = {
+    'search_substring': ('nodule', 'substring'),
+    'search_short': ('lu', 'substring'),
+    'search_exact': ('right lobe', 'exact'),
+    'search_prefix': ('calc', 'prefix'),
+}
+# 한 글자씩 입력하며 검색하는 검색어 (입력하는 대로 검색의 최소 길이부터)
+TYPING_QUERY = 'nodule'
+TYPING_MIN_LENGTH = 2
+ADVANCED_QUERIES = {
+    'advanced_type': {'type': 'NUM'},
+    'advanced_text_type': {'type': 'TEXT', 'text': 'nodule'},
+    'advanced_code': {'concept_code': ('39607008', 'SCT')},
+}
+
+# 측정값 검색 단계 → search_measurements / search_measurement_range 인자
+MEASUREMENT_QUERIES = {
+    'measurement_compare': ('search_measurements', ('>', 1, 'cm')),
+    'measurement_range': ('search_measurement_range', (5, 20, 'mm')),
+}
+
+# 이 비율 이상 느려지면 회귀로 표시
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+def scenario_file(data_dir, name, config):
+    """
+    시나리오의 SR 파일을 생성합니다. 같은 설정의 파일이 이미 있으면 재사용합니다.
+    
+    Returns:
+        tuple: (파일 경로, 콘텐츠 아이템 수)
+    """
+    depth, fanout = config['depth'], config['fanout']
+    generator = SRGenerator(groups_for_items(config['items'], depth, fanout), depth, fanout,
+                            config.get('mix', DEFAULT_MIX), config.get('text_length', 40))
+    mix = '-'.join(f'{value_type}{weight:g}' for value_type, weight in sorted(generator.mix.items()))
+    file_name = f'{name}_g{generator.groups}_d{depth}_f{fanout}_{mix}_t{generator.text_length}.dcm'
+    file_path = os.path.join(data_dir, file_name)
+    if not os.path.exists(file_path):
+        generator.write(file_path)
+    return file_path, generator.item_count
+
+def repeat(func, repeat_count, *args):
+    """
+    함수를 여러 번 실행하고 (실행 시간 리스트, 마지막 결과)를 반환합니다.
+    """
+    runs = []
+    result = None
+    for _ in range(repeat_count):
+        elapsed, result = timed(func, *args)
+        runs.append(elapsed)
+    return runs, result
+
+def record(stages, stage, runs, **counts):
+    """단계 측정 결과를 기록합니다 (최솟값을 대표값으로 사용)."""
+    stages[stage] = dict({'seconds': min(runs), 'runs': runs}, **counts)
+
+def run_scenario(name, config, args, app):
+    """
+    시나리오 하나의 모든 단계를 측정합니다.
+    
+    Returns:
+        dict: 시나리오 측정 결과
+    """
+    from models.dicom_sr_parser import DicomSRParser
+    from models.search import DicomSRSearcher
+    
+    file_path, items = scenario_file(args.data_dir, name, config)
+    stages = {}
+    
+    # 로드와 파싱은 오래 걸리므로 parse_repeat번만 반복
+    load_runs, parse_runs = [], []
+    for _ in range(args.parse_repeat):
+        parser = DicomSRParser(lazy=True)
+        elapsed, ok = timed(parser.load_file, file_path)
+        if not ok:
+            raise SystemExit(f'{name}: 로드 실패')
+        load_runs.append(elapsed)
+        elapsed, tree = timed(parser.parse_sr)
+        if tree is None:
+            raise SystemExit(f'{name}: 파싱 실패')
+        parse_runs.append(elapsed)
+    record(stages, 'load_file', load_runs)
+    record(stages, 'parse_sr', parse_runs, nodes=len(parser.nodes))
+    
+    def cold_search(term, mode):
+        # 직전 결과를 좁히지 않고 색인에서 새로 찾는 시간을 측정
+        parser.text_index.forget_last_search()
+        return parser.search_in_tree(term, mode)
+    
+    for stage, (term, mode) in SEARCH_QUERIES.items():
+        runs, results = repeat(cold_search, args.repeat, term, mode)
+        record(stages, stage, runs, matches=len(results))
+    
+    def type_query():
+        # 검색어가 길어질 때마다 직전 결과를 좁힘
+        parser.text_index.forget_last_search()
+        for length in range(TYPING_MIN_LENGTH, len(TYPING_QUERY) + 1):
+            results = parser.search_in_tree(TYPING_QUERY[:length])
+        return results
+    
+    runs, results = repeat(type_query, args.repeat)
+    record(stages, 'search_typing', runs, matches=len(results))
+    
+    searcher = DicomSRSearcher(parser)
+    for stage, criteria in ADVANCED_QUERIES.items():
+        runs, results = repeat(searcher.advanced_search, args.repeat, criteria)
+        record(stages, stage, runs, matches=len(results))
+    
+    for stage, (method, query) in MEASUREMENT_QUERIES.items():
+        runs, results = repeat(getattr(searcher, method), args.repeat, *query)
+        record(stages, stage, runs, matches=len(results))
+    
+    if app is not None:
+        from views.tree_view import DicomSRTreeView
+        
+        highlight = parser.search_in_tree(SEARCH_QUERIES['search_substring'][0])
+        set_runs, highlight_runs = [], []
+        for _ in range(args.repeat):
+            view = DicomSRTreeView()
+            view.show()
+            elapsed, _ = timed(view.set_tree_data, tree)
+            paint, _ = timed(app.processEvents)
+            set_runs.append(elapsed + paint)
+            elapsed, _ = timed(view.highlight_search_results, highlight)
+            paint, _ = timed(app.processEvents)
+            highlight_runs.append(elapsed + paint)
+            view.deleteLater()
+            app.processEvents()
+        record(stages, 'set_tree_data', set_runs)
+        record(stages, 'highlight_search_results', highlight_runs, matches=len(highlight))
+    
+    return {
+        'config': config,
+        'items': items,
+        'file_bytes': os.path.getsize(file_path),
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': stages,
+    }
+
+def environment():
+    """결과를 비교할 때 참고할 실행 환경 정보를 반환합니다."""
+    import pydicom
+    
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'pydicom': pydicom.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def compare(baseline, current, threshold):
+    """
+    두 결과를 단계별로 비교하여 출력합니다.
+    
+    Returns:
+        int: 회귀로 판단된 단계 수
+    """
+    regressions = 0
+    print(f'\n기준: {baseline["environment"].get("commit", "?")}  현재: {current["environment"].get("commit", "?")}')
+    for name, result in current['results'].items():
+        base_result = baseline['results'].get(name)
+        if base_result is None:
+            continue
+        for stage, measurement in result['stages'].items():
+            base = base_result['stages'].get(stage)
+            if base is None or base['seconds'] <= 0:
+                continue
+            ratio = measurement['seconds'] / base['seconds']
+            flag = ''
+            if ratio > 1 + threshold:
+                flag = '  << 회귀'
+                regressions += 1
+            print(f'{name:<12} {stage:<26} {base["seconds"] * 1000:10.2f} ms -> '
+                  f'{measurement["seconds"] * 1000:10.2f} ms  ({ratio:5.2f}x){flag}')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='DICOM SR 벤치마크 모음')
+    parser.add_argument('--scenarios', nargs='+', default=DEFAULT_SCENARIOS, choices=list(SCENARIOS),
+                        help='실행할 시나리오')
+    parser.add_argument('--repeat', type=int, default=5, help='검색/표시 단계 반복 횟수')
+    parser.add_argument('--parse-repeat', type=int, default=1, help='로드/파싱 단계 반복 횟수')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'dicom_sr_bench'),
+                        help='생성한 SR 파일을 보관할 디렉터리')
+    parser.add_argument('--no-gui', action='store_true', help='트리 뷰 단계를 건너뜀')
+    parser.add_argument('-o', '--output', default=None, help='결과 JSON 파일')
+    parser.add_argument('--compare', default=None, help='비교할 이전 결과 JSON 파일')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help='회귀로 판단할 비율 (기본값: 0.10 = 10%% 느려짐)')
+    args = parser.parse_args()
+    
+    os.makedirs(args.data_dir, exist_ok=True)
+    
+    # 첫 load_file에 pydicom 임포트 시간이 포함되지 않도록 미리 임포트
+    from models.dicom_sr_parser import preload_dependencies
+    preload_dependencies()
+    
+    app = None
+    if not args.no_gui:
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+    
+    results = {}
+    for name in args.scenarios:
+        result = run_scenario(name, SCENARIOS[name], args, app)
+        results[name] = result
+        print(f'{name}: 콘텐츠 아이템 {result["items"]}개, {result["file_bytes"] / 1024 / 1024:.1f} MB')
+        for stage, measurement in result['stages'].items():
+            counts = ', '.join(f'{key} {value}' for key, value in measurement.items() if key not in ('seconds', 'runs'))
+            print(f'  {stage:<26} {measurement["seconds"] * 1000:10.2f} ms  {counts}')
+    
+    current = {'version': RESULT_FORMAT_VERSION, 'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fp:
+            json.dump(current, fp, indent=2, ensure_ascii=False)
+        print(f'\n결과 저장: {args.output}')
+    
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fp:
+            baseline = json.load(fp)
+        if compare(baseline, current, args.threshold):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
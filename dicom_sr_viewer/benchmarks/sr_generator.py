@@ -0,0 +1,365 @@
+"""
+합성 DICOM SR 생성기
+깊이, 분기 수, ValueType 비율, 텍스트 길이, 반복 측정 그룹 수를 지정하여 DICOM SR 파일을 생성합니다.
+
+pydicom Dataset을 만들지 않고 Explicit VR Little Endian 바이트를 바로 파일에 쓰며,
+시퀀스는 길이 미정(undefined length)으로 인코딩하므로 수백만 개의 콘텐츠 아이템도
+일정한 메모리로 생성할 수 있습니다.
+
+사용법:
+    python benchmarks/sr_generator.py out.dcm --groups 1000 --depth 2 --fanout 4 --mix TEXT=3,NUM=4,CODE=2
+"""
+
+import argparse
+import os
+import random
+import struct
+import uuid
+
+SR_SOP_CLASS_UID = '1.2.840.10008.5.1.4.1.1.88.22'  # Enhanced SR
+EXPLICIT_VR_LITTLE_ENDIAN = '1.2.840.10008.1.2.1'
+
+# 4바이트 길이 필드를 사용하는 VR
+LONG_VRS = {'OB', 'OD', 'OF', 'OL', 'OV', 'OW', 'SQ', 'SV', 'UC', 'UN', 'UR', 'UT', 'UV'}
+
+# 길이 미정 시퀀스/아이템과 구분자
+UNDEFINED_LENGTH = 0xFFFFFFFF
+ITEM_TAG = (0xFFFE, 0xE000)
+ITEM_DELIMITER = struct.pack('<HHI', 0xFFFE, 0xE00D, 0)
+SEQUENCE_DELIMITER = struct.pack('<HHI', 0xFFFE, 0xE0DD, 0)
+
+# 기본 리프 ValueType 비율
+DEFAULT_MIX = {'TEXT': 3, 'NUM': 4, 'CODE': 2, 'DATE': 1}
+
+# 개념 이름 코드 (CodeValue, CodingSchemeDesignator, CodeMeaning)
+REPORT_CODE = ('126000', 'DCM', 'Imaging Measurement Report')
+GROUP_CODE = ('125007', 'DCM', 'Measurement Group')
+SECTION_CODE = ('111028', 'DCM', 'Image Library')
+NAME_CODES = {
+    'TEXT': [('121071', 'DCM', 'Finding'), ('121106', 'DCM', 'Comment'), ('121073', 'DCM', 'Impression')],
+    'NUM': [('410668003', 'SCT', 'Length'), ('103339001', 'SCT', 'Long Axis'), ('42798000', 'SCT', 'Area')],
+    'CODE': [('363698007', 'SCT', 'Finding site'), ('121071', 'DCM', 'Finding')],
+    'DATE': [('111060', 'DCM', 'Study Date')],
+    'UIDREF': [('121232', 'DCM', 'Source series for image segmentation')],
+    'PNAME': [('121008', 'DCM', 'Person Observer Name')],
+    'DATETIME': [('111526', 'DCM', 'DateTime Started')],
+    'TIME': [('111527', 'DCM', 'Time Started')],
+    'IMAGE': [('121112', 'DCM', 'Source of Measurement')],
+    'COMPOSITE': [('121112', 'DCM', 'Source of Measurement')],
+    'WAVEFORM': [('121112', 'DCM', 'Source of Measurement')],
+    'SCOORD': [('111030', 'DCM', 'Image Region')],
+    'SCOORD3D': [('111030', 'DCM', 'Image Region')],
+    'TCOORD': [('113017', 'DCM', 'Stage Start Time')],
+}
+
+# IMAGE/COMPOSITE/WAVEFORM 아이템이 참조하는 SOP Class UID
+REFERENCED_SOP_CLASSES = {
+    'IMAGE': '1.2.840.10008.5.1.4.1.1.2',            # CT Image Storage
+    'COMPOSITE': '1.2.840.10008.5.1.4.1.1.88.22',    # Enhanced SR
+    'WAVEFORM': '1.2.840.10008.5.1.4.1.1.9.1.1',     # 12-lead ECG Waveform Storage
+}
+CONCEPT_CODES = [('39607008', 'SCT', 'Lung'), ('10200004', 'SCT', 'Liver'), ('64033007', 'SCT', 'Kidney'),
+                 ('27925004', 'SCT', 'Nodule'), ('4147007', 'SCT', 'Mass'), ('52988006', 'SCT', 'Lesion')]
+UNIT_CODES = [('mm', 'UCUM', 'millimeter'), ('cm', 'UCUM', 'centimeter'), ('mm2', 'UCUM', 'square millimeter')]
+LEAF_RELATIONSHIPS = ['CONTAINS', 'CONTAINS', 'HAS PROPERTIES', 'HAS CONCEPT MOD', 'HAS OBS CONTEXT']
+WORDS = ('nodule mass lesion right left upper lower lobe segment liver kidney lung margin spiculated '
+         'solid ground glass calcified stable increased decreased since prior study measured axial '
+         'image series no evidence of metastasis suspicious benign follow up recommended').split()
+
+def parse_mix(text):
+    """
+    'TEXT=3,NUM=4' 형식의 ValueType 비율을 dict로 변환합니다.
+    
+    Args:
+        text (str): ValueType=가중치 목록
+    
+    Returns:
+        dict: ValueType → 가중치
+    """
+    mix = {}
+    for part in text.split(','):
+        value_type, _, weight = part.partition('=')
+        value_type = value_type.strip().upper()
+        if value_type not in NAME_CODES:
+            raise ValueError(f'지원하지 않는 ValueType입니다: {value_type}')
+        mix[value_type] = float(weight or 1)
+    return mix
+
+def count_items(groups, depth, fanout):
+    """
+    생성될 콘텐츠 아이템 수를 계산합니다.
+    
+    Args:
+        groups (int): 반복 측정 그룹 수
+        depth (int): 측정 그룹 아래의 단계 수 (1이면 그룹 바로 아래가 리프)
+        fanout (int): 컨테이너마다의 자식 수
+    
+    Returns:
+        int: 루트를 포함한 콘텐츠 아이템 수
+    """
+    per_group = 1 + sum(fanout ** level for level in range(1, depth + 1))
+    return 1 + groups * per_group
+
+def groups_for_items(items, depth, fanout):
+    """
+    목표 콘텐츠 아이템 수에 가장 가까운 측정 그룹 수를 계산합니다.
+    
+    Returns:
+        int: 측정 그룹 수 (1 이상)
+    """
+    per_group = count_items(1, depth, fanout) - 1
+    return max(1, round((items - 1) / per_group))
+
+def _uid():
+    """UUID 기반 DICOM UID를 생성합니다 (2.25 루트)."""
+    return f'2.25.{uuid.uuid4().int}'
+
+def _pad(value, vr):
+    """값을 짝수 길이 bytes로 인코딩합니다 (UI는 NUL, 나머지 문자열은 공백으로 채움)."""
+    data = value if isinstance(value, bytes) else value.encode('utf-8')
+    if len(data) % 2:
+        data += b'\0' if vr in ('UI', 'OB') else b' '
+    return data
+
+def element(group, elem, vr, value):
+    """
+    Explicit VR Little Endian 데이터 요소 하나를 인코딩합니다.
+    
+    Returns:
+        bytes: 인코딩된 요소
+    """
+    data = _pad(value, vr)
+    if vr in LONG_VRS:
+        return struct.pack('<HH2sHI', group, elem, vr.encode('ascii'), 0, len(data)) + data
+    return struct.pack('<HH2sH', group, elem, vr.encode('ascii'), len(data)) + data
+
+def sequence_start(group, elem):
+    """길이 미정 시퀀스의 시작을 인코딩합니다."""
+    return struct.pack('<HH2sHI', group, elem, b'SQ', 0, UNDEFINED_LENGTH)
+
+def item_start():
+    """길이 미정 시퀀스 아이템의 시작을 인코딩합니다."""
+    return struct.pack('<HHI', ITEM_TAG[0], ITEM_TAG[1], UNDEFINED_LENGTH)
+
+def code_sequence(group, elem, code):
+    """코드 아이템 하나를 가진 코드 시퀀스를 인코딩합니다."""
+    code_value, coding_scheme, code_meaning = code
+    return (sequence_start(group, elem) + item_start()
+            + element(0x0008, 0x0100, 'SH', code_value)
+            + element(0x0008, 0x0102, 'SH', coding_scheme)
+            + element(0x0008, 0x0104, 'LO', code_meaning)
+            + ITEM_DELIMITER + SEQUENCE_DELIMITER)
+
+class SRGenerator:
+    """
+    합성 DICOM SR 생성기
+    
+    문서 구조: 루트 CONTAINER 아래에 측정 그룹 CONTAINER가 groups개 반복되고, 각 그룹은
+    depth 단계, 컨테이너마다 fanout개의 자식을 가집니다. 마지막 단계의 아이템은 mix 비율에 따라
+    NAME_CODES에 있는 ValueType(TEXT, NUM, CODE, DATE, IMAGE, SCOORD 등) 중 하나이며, 중간 단계는 CONTAINER입니다.
+    blob_size를 지정하면 ContentSequence 앞뒤에 사설 태그, EncapsulatedDocument, 파형 데이터를 넣습니다.
+    """
+    
+    def __init__(self, groups=100, depth=1, fanout=4, mix=None, text_length=40, seed=0, blob_size=0):
+        """
+        SRGenerator 클래스 초기화
+        
+        Args:
+            groups (int, optional): 반복 측정 그룹 수
+            depth (int, optional): 측정 그룹 아래의 단계 수
+            fanout (int, optional): 컨테이너마다의 자식 수
+            mix (dict, optional): 리프 ValueType → 가중치 (기본값: DEFAULT_MIX)
+            text_length (int, optional): TEXT 값의 평균 길이 (문자)
+            seed (int, optional): 난수 시드 (같은 설정이면 같은 내용 생성)
+            blob_size (int, optional): 사설 태그/EncapsulatedDocument/WaveformData에 넣을 대용량 데이터 크기 (bytes)
+        """
+        self.groups = groups
+        self.depth = depth
+        self.fanout = fanout
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.text_length = text_length
+        self.seed = seed
+        self.blob_size = blob_size
+    
+    @property
+    def item_count(self):
+        """생성될 콘텐츠 아이템 수"""
+        return count_items(self.groups, self.depth, self.fanout)
+    
+    def write(self, file_path):
+        """
+        DICOM SR 파일을 생성합니다.
+        
+        Args:
+            file_path (str): 저장할 파일 경로
+        
+        Returns:
+            int: 생성한 콘텐츠 아이템 수
+        """
+        rng = random.Random(self.seed)
+        value_types = list(self.mix)
+        weights = [self.mix[value_type] for value_type in value_types]
+        sop_instance_uid = _uid()
+        
+        with open(file_path, 'wb') as fp:
+            fp.write(self._header(sop_instance_uid))
+            fp.write(sequence_start(0x0040, 0xA730))
+            
+            # 루트 CONTAINER
+            fp.write(item_start() + self._container(None, REPORT_CODE))
+            fp.write(sequence_start(0x0040, 0xA730))
+            count = 1
+            
+            # 측정 그룹마다 (단계, 남은 자식 수) 스택으로 깊이 우선 생성
+            for group_index in range(self.groups):
+                fp.write(item_start() + self._container('CONTAINS', GROUP_CODE))
+                count += 1
+                stack = [self.fanout]
+                fp.write(sequence_start(0x0040, 0xA730))
+                chunks = []
+                while stack:
+                    if stack[-1] == 0:
+                        # 컨테이너의 자식을 모두 썼으면 시퀀스와 아이템을 닫음
+                        stack.pop()
+                        chunks.append(SEQUENCE_DELIMITER + ITEM_DELIMITER)
+                        continue
+                    
+                    stack[-1] -= 1
+                    count += 1
+                    if len(stack) < self.depth:
+                        chunks.append(item_start() + self._container('CONTAINS', SECTION_CODE)
+                                      + sequence_start(0x0040, 0xA730))
+                        stack.append(self.fanout)
+                    else:
+                        value_type = rng.choices(value_types, weights)[0]
+                        chunks.append(item_start() + self._leaf(rng, value_type, group_index) + ITEM_DELIMITER)
+                    
+                    if len(chunks) >= 1024:
+                        fp.write(b''.join(chunks))
+                        chunks = []
+                fp.write(b''.join(chunks))
+            
+            # 루트의 ContentSequence, 루트 아이템, 최상위 ContentSequence를 닫음
+            fp.write(SEQUENCE_DELIMITER + ITEM_DELIMITER + SEQUENCE_DELIMITER)
+            
+            if self.blob_size:
+                # ContentSequence 뒤의 캡슐화 문서와 파형 데이터
+                fp.write(element(0x0042, 0x0011, 'OB', os.urandom(self.blob_size)))
+                fp.write(sequence_start(0x5400, 0x0100) + item_start()
+                         + element(0x5400, 0x1004, 'US', struct.pack('<H', 16))
+                         + element(0x5400, 0x1010, 'OW', os.urandom(self.blob_size))
+                         + ITEM_DELIMITER + SEQUENCE_DELIMITER)
+        return count
+    
+    def _header(self, sop_instance_uid):
+        """프리앰블, 파일 메타 정보와 ContentSequence 이전의 최상위 요소를 인코딩합니다."""
+        meta = (element(0x0002, 0x0001, 'OB', b'\0\1')
+                + element(0x0002, 0x0002, 'UI', SR_SOP_CLASS_UID)
+                + element(0x0002, 0x0003, 'UI', sop_instance_uid)
+                + element(0x0002, 0x0010, 'UI', EXPLICIT_VR_LITTLE_ENDIAN))
+        header = b'\0' * 128 + b'DICM'
+        header += struct.pack('<HH2sHI', 0x0002, 0x0000, b'UL', 4, len(meta)) + meta
+        header += (element(0x0008, 0x0016, 'UI', SR_SOP_CLASS_UID)
+                   + element(0x0008, 0x0018, 'UI', sop_instance_uid)
+                   + element(0x0008, 0x0060, 'CS', 'SR'))
+        if self.blob_size:
+            # 일부 장비가 넣는 사설 대용량 데이터
+            header += (element(0x0009, 0x0010, 'LO', 'BENCH PRIVATE')
+                       + element(0x0009, 0x1001, 'OB', os.urandom(self.blob_size)))
+        header += (element(0x0010, 0x0010, 'PN', 'Synthetic^SR')
+                   + element(0x0010, 0x0020, 'LO', f'BENCH-{self.seed:04d}')
+                   + element(0x0040, 0xA040, 'CS', 'CONTAINER')
+                   + code_sequence(0x0040, 0xA043, REPORT_CODE)
+                   + element(0x0040, 0xA050, 'CS', 'SEPARATE'))
+        return header
+    
+    def _container(self, relationship, code):
+        """CONTAINER 아이템의 ContentSequence 이전 요소를 인코딩합니다."""
+        data = b''
+        if relationship:
+            data += element(0x0040, 0xA010, 'CS', relationship)
+        return (data + element(0x0040, 0xA040, 'CS', 'CONTAINER')
+                + code_sequence(0x0040, 0xA043, code)
+                + element(0x0040, 0xA050, 'CS', 'SEPARATE'))
+    
+    def _leaf(self, rng, value_type, group_index):
+        """리프 콘텐츠 아이템의 요소를 태그 순서대로 인코딩합니다."""
+        relationship = rng.choice(LEAF_RELATIONSHIPS)
+        data = b''
+        if value_type in REFERENCED_SOP_CLASSES:
+            # ReferencedSOPSequence (0008,1199)는 태그 순서상 RelationshipType보다 앞
+            data += (sequence_start(0x0008, 0x1199) + item_start()
+                     + element(0x0008, 0x1150, 'UI', REFERENCED_SOP_CLASSES[value_type])
+                     + element(0x0008, 0x1155, 'UI', _uid())
+                     + ITEM_DELIMITER + SEQUENCE_DELIMITER)
+        data += (element(0x0040, 0xA010, 'CS', relationship)
+                + element(0x0040, 0xA040, 'CS', value_type)
+                + code_sequence(0x0040, 0xA043, rng.choice(NAME_CODES[value_type])))
+        
+        if value_type == 'TEXT':
+            data += element(0x0040, 0xA160, 'UT', self._text(rng, group_index))
+        elif value_type == 'CODE':
+            data += code_sequence(0x0040, 0xA168, rng.choice(CONCEPT_CODES))
+        elif value_type == 'NUM':
+            data += (sequence_start(0x0040, 0xA300) + item_start()
+                     + code_sequence(0x0040, 0x08EA, rng.choice(UNIT_CODES))
+                     + element(0x0040, 0xA30A, 'DS', f'{rng.randint(1, 999) / 10:g}')
+                     + ITEM_DELIMITER + SEQUENCE_DELIMITER)
+        elif value_type == 'DATE':
+            data += element(0x0040, 0xA121, 'DA', f'20{rng.randint(10, 25)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}')
+        elif value_type == 'UIDREF':
+            data += element(0x0040, 0xA124, 'UI', _uid())
+        elif value_type == 'PNAME':
+            data += element(0x0040, 0xA123, 'PN', f'Observer^{rng.choice(WORDS).title()}')
+        elif value_type == 'DATETIME':
+            data += element(0x0040, 0xA120, 'DT', f'2024{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}'
+                                                  f'{rng.randint(0, 23):02d}{rng.randint(0, 59):02d}00')
+        elif value_type == 'TIME':
+            data += element(0x0040, 0xA122, 'TM', f'{rng.randint(0, 23):02d}{rng.randint(0, 59):02d}00')
+        elif value_type in ('SCOORD', 'SCOORD3D'):
+            dimensions = 2 if value_type == 'SCOORD' else 3
+            points = [rng.uniform(0, 512) for _ in range(dimensions * rng.randint(1, 8))]
+            graphic_type = 'POINT' if len(points) == dimensions else 'POLYLINE'
+            data += (element(0x0070, 0x0022, 'FL', struct.pack(f'<{len(points)}f', *points))
+                     + element(0x0070, 0x0023, 'CS', graphic_type))
+            if value_type == 'SCOORD3D':
+                data += element(0x3006, 0x0024, 'UI', _uid())
+        elif value_type == 'TCOORD':
+            positions = sorted(rng.randint(0, 5000) for _ in range(rng.randint(1, 4)))
+            data += (element(0x0040, 0xA130, 'CS', 'POINT' if len(positions) == 1 else 'MULTIPOINT')
+                     + element(0x0040, 0xA132, 'UL', struct.pack(f'<{len(positions)}I', *positions)))
+        return data
+    
+    def _text(self, rng, group_index):
+        """평균 text_length 문자 길이의 텍스트 값을 생성합니다."""
+        target = max(1, int(rng.uniform(0.5, 1.5) * self.text_length))
+        words = [f'group {group_index}']
+        length = len(words[0])
+        while length < target:
+            word = rng.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return ' '.join(words)[:max(target, len(words[0]))]
+
+def main():
+    parser = argparse.ArgumentParser(description='합성 DICOM SR 생성기')
+    parser.add_argument('output', help='저장할 파일 경로')
+    parser.add_argument('--groups', type=int, default=None, help='반복 측정 그룹 수')
+    parser.add_argument('--items', type=int, default=None, help='목표 콘텐츠 아이템 수 (--groups 대신 사용)')
+    parser.add_argument('--depth', type=int, default=1, help='측정 그룹 아래의 단계 수')
+    parser.add_argument('--fanout', type=int, default=4, help='컨테이너마다의 자식 수')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX, help='리프 ValueType 비율 (예: TEXT=3,NUM=4,CODE=2)')
+    parser.add_argument('--text-length', type=int, default=40, help='TEXT 값의 평균 길이')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    args = parser.parse_args()
+    
+    groups = args.groups
+    if groups is None:
+        groups = groups_for_items(args.items or 1000, args.depth, args.fanout)
+    
+    generator = SRGenerator(groups, args.depth, args.fanout, args.mix, args.text_length, args.seed)
+    count = generator.write(args.output)
+    print(f'{args.output}: 콘텐츠 아이템 {count}개')
+
+if __name__ == '__main__':
+    main()
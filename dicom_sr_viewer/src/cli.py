@@ -0,0 +1,643 @@
+"""
+명령줄 모듈
+GUI 없이 DICOM SR 파일을 일괄 처리하는 명령줄 도구를 제공합니다.
+이 모듈과 이 모듈이 사용하는 모델 모듈은 PyQt5를 임포트하지 않습니다.
+
+사용법:
+    python src/cli.py parse <파일 또는 디렉터리>... [-o out.jsonl] [-j 작업 프로세스 수] [--profile trace.json]
+    cat report.dcm | python src/cli.py parse -
+    python src/cli.py parse studies.zip bundle.tar.gz ...   (번들 안의 SR 인스턴스만 파싱)
+    python src/cli.py export <파일, 번들 또는 디렉터리>... -o out.json [-f json|dicom-json|jsonl|csv]
+    python src/cli.py index <파일 또는 디렉터리>... [--db archive.sqlite] [-j 작업 프로세스 수]
+    python src/cli.py sync <디렉터리>... [--db archive.sqlite] [--hash] [--watch --interval 초]
+    python src/cli.py query <검색어> [--code CodeValue] [--documents] [--db archive.sqlite]
+"""
+
+import argparse
+import fnmatch
+import io
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+
+from models.archive_index import ArchiveIndex, default_archive_path, document_rows
+from models.dicom_sr_parser import DicomSRParser
+from models.parse_cache import ParseCache
+from models.profiling import profiler
+from models.sr_bundle import BundleReader, is_bundle, member_path
+from models.sr_export import EXPORT_FORMATS, SRExportWriter, format_for_path
+
+# 작업 프로세스마다 재사용하는 파서
+_parser = None
+
+# parse 명령에서 표준 입력을 뜻하는 입력 경로
+STDIN_PATH = '-'
+
+# 번들 멤버를 작업 프로세스로 보낼 때 작업 프로세스마다 미리 읽어 둘 최대 멤버 수
+# (번들 전체를 메모리에 올리지 않도록 처리되지 않은 멤버 수를 제한)
+BUNDLE_TASKS_PER_JOB = 8
+
+def iter_input_files(paths, pattern=None):
+    """
+    입력 경로에서 처리할 파일을 찾습니다. 디렉터리는 하위 디렉터리까지 탐색합니다.
+    
+    Args:
+        paths (list): 파일 또는 디렉터리 경로 리스트
+        pattern (str, optional): 디렉터리에서 찾을 파일 이름 패턴 (예: '*.dcm', 기본값: 모든 파일)
+    
+    Yields:
+        str: 파일 경로
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        
+        for dir_path, dir_names, file_names in os.walk(path):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                if pattern is None or fnmatch.fnmatch(file_name, pattern):
+                    yield os.path.join(dir_path, file_name)
+
+def default_jobs():
+    """
+    기본 작업 프로세스 수를 반환합니다. 이 프로세스가 사용할 수 있는 CPU 수를 따릅니다.
+    
+    Returns:
+        int: 작업 프로세스 수
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def _init_worker(log_level, cache_dir=None, profile=False):
+    """작업 프로세스 초기화 - 프로세스마다 파서를 하나 만듭니다."""
+    global _parser
+    logging.basicConfig(level=log_level)
+    # 주 프로세스의 감시 모드 종료 처리를 물려받지 않도록 기본 동작으로 되돌림
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if profile:
+        profiler.enable()
+    # 트리만 내보내므로 ContentSequence까지만 읽고 검색 인덱스는 만들지 않음
+    cache = ParseCache(cache_dir) if cache_dir else None
+    _parser = DicomSRParser(lazy=True, build_index=False, cache=cache)
+
+def iter_parse_tasks(files, stats):
+    """
+    입력 파일을 parse_file 작업으로 바꿉니다. 번들(zip/tar)은 SR 멤버마다 작업 하나로 펼칩니다.
+    
+    Args:
+        files (list): 입력 파일 경로 리스트
+        stats (dict): 번들 통계를 누적할 dict ('members', 'skipped', 'failed' 키)
+    
+    Yields:
+        str or tuple: 파일 경로 또는 (번들 경로, 멤버 이름, 멤버 내용)
+    """
+    for file_path in files:
+        if file_path == STDIN_PATH or not is_bundle(file_path):
+            yield file_path
+            continue
+        
+        reader = BundleReader(file_path)
+        try:
+            for name, data in reader:
+                yield file_path, name, data
+        except Exception as e:
+            stats['failed'] += 1
+            print(f'번들 읽기 실패: {file_path}: {e}', file=sys.stderr)
+        stats['members'] += reader.member_count
+        stats['skipped'] += reader.skipped_count
+
+def _throttled(tasks, semaphore):
+    """작업을 하나 넘길 때마다 semaphore를 획득하여 결과를 받기 전에 미리 읽는 작업 수를 제한합니다."""
+    for task in tasks:
+        semaphore.acquire()
+        yield task
+
+def parse_file(task):
+    """
+    파일 하나를 파싱하여 콘텐츠 아이템마다 JSON 한 줄로 변환합니다.
+    
+    변환은 작업 프로세스에서 이루어지므로 주 프로세스에는 완성된 문자열만 전달됩니다.
+    
+    Args:
+        task (str or tuple): DICOM SR 파일 경로 또는 (번들 경로, 멤버 이름, 멤버 내용)
+    
+    Returns:
+        tuple: (파일 경로, JSONL 문자열, 노드 수, 처리 시간(초), 오류 메시지 또는 None, 캐시 적중 여부,
+                프로파일 기록 또는 None) - 번들 멤버의 파일 경로는 "번들 경로!/멤버 이름"
+    """
+    if _parser is None:
+        _init_worker(logging.getLogger().level)
+    
+    with profiler.span('file'):
+        result = _parse_file(task)
+    
+    # 작업 프로세스의 프로파일 기록은 결과와 함께 주 프로세스로 보냄
+    return result + (profiler.drain() if profiler.enabled else None,)
+
+def _load_task(parser, task):
+    """
+    parse/export 작업 하나를 파서로 로드합니다.
+    
+    Args:
+        parser (DicomSRParser): 로드할 파서
+        task (str or tuple): 파일 경로, 표준 입력('-') 또는 (번들 경로, 멤버 이름, 멤버 내용)
+    
+    Returns:
+        tuple: (결과에 기록할 원본 이름, 문서 단위 필드 dict 또는 None, 로드 성공 여부)
+    """
+    if isinstance(task, tuple):
+        # 번들 멤버는 디스크에 풀지 않고 메모리에서 바로 읽음 (파싱 캐시는 사용하지 않음)
+        bundle_path, name, data = task
+        source = member_path(bundle_path, name)
+        return source, {'archive': bundle_path, 'member': name}, parser.load_bytes(data, name=source)
+    if task == STDIN_PATH:
+        # 표준 입력은 임시 파일 없이 스트림에서 바로 읽음
+        return task, None, parser.load_stream(sys.stdin.buffer, name='<stdin>')
+    return task, None, parser.load_file(task)
+
+def _parse_file(task):
+    """parse_file의 본문 - 프로파일 기록을 제외한 결과를 반환합니다."""
+    start = time.perf_counter()
+    try:
+        file_path, fields, loaded = _load_task(_parser, task)
+        if not loaded:
+            return file_path, '', 0, time.perf_counter() - start, 'DICOM 파일을 읽을 수 없습니다', False
+        
+        tree = _parser.parse_sr()
+        if tree is None:
+            return file_path, '', 0, time.perf_counter() - start, 'SR 파싱 실패', _parser.from_cache
+        
+        buffer = io.StringIO()
+        with profiler.span('export.jsonl') as span:
+            count = SRExportWriter(buffer, 'jsonl').write_document(_parser, fields)
+            span.count('items', count)
+        return file_path, buffer.getvalue(), count, time.perf_counter() - start, None, _parser.from_cache
+    finally:
+        _parser.close()
+
+def index_file(task):
+    """
+    파일 하나를 파싱하여 아카이브 인덱스에 저장할 아이템 행을 만듭니다.
+    
+    Args:
+        task (tuple): (파일 경로, 색인할 때의 파일 지문)
+    
+    Returns:
+        tuple: (파일 경로, 파일 지문, SOPInstanceUID, 아이템 행 리스트, 처리 시간(초), 오류 메시지 또는 None)
+    """
+    file_path, fingerprint = task
+    start = time.perf_counter()
+    if _parser is None:
+        _init_worker(logging.getLogger().level)
+    
+    try:
+        if not _parser.load_file(file_path):
+            return file_path, fingerprint, None, [], time.perf_counter() - start, 'DICOM 파일을 읽을 수 없습니다'
+        rows = document_rows(_parser.iter_nodes())
+        if _parser.get_tree() is None:
+            return file_path, fingerprint, None, [], time.perf_counter() - start, 'SR 파싱 실패'
+        return file_path, fingerprint, _parser.sop_instance_uid, rows, time.perf_counter() - start, None
+    except Exception as e:
+        return file_path, fingerprint, None, [], time.perf_counter() - start, str(e)
+    finally:
+        _parser.close()
+
+def run_parse(args):
+    """
+    parse 명령을 실행합니다.
+    
+    Args:
+        args (argparse.Namespace): 명령줄 인자
+    
+    Returns:
+        int: 종료 코드 (실패한 파일이 있으면 1)
+    """
+    files = list(iter_input_files(args.paths, args.pattern))
+    if not files:
+        print('처리할 파일이 없습니다.', file=sys.stderr)
+        return 1
+    
+    # 번들은 멤버 수를 미리 알 수 없으므로 작업 프로세스 수를 입력 파일 수로 제한하지 않음
+    bundle_count = sum(1 for file_path in files if is_bundle(file_path))
+    jobs = args.jobs or default_jobs()
+    if not bundle_count:
+        jobs = min(jobs, len(files))
+    jobs = max(1, jobs)
+    if STDIN_PATH in files:
+        # 표준 입력은 주 프로세스에서만 읽을 수 있음
+        jobs = 1
+    log_level = logging.getLogger().level
+    cache_dir = args.cache_dir
+    profile = args.profile is not None
+    if profile:
+        profiler.enable()
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    
+    file_count = 0
+    failed_count = 0
+    node_count = 0
+    cache_hits = 0
+    bundle_stats = {'members': 0, 'skipped': 0, 'failed': 0}
+    tasks = iter_parse_tasks(files, bundle_stats)
+    pending = None
+    start = time.perf_counter()
+    try:
+        if jobs == 1:
+            _init_worker(log_level, cache_dir, profile)
+            results = map(parse_file, tasks)
+            pool = None
+        else:
+            # 작업 공급 스레드가 번들 멤버를 끝까지 미리 읽지 않도록 결과를 받을 때마다 하나씩 허용
+            pending = threading.Semaphore(jobs * max(BUNDLE_TASKS_PER_JOB, 2 * args.chunksize))
+            pool = multiprocessing.Pool(jobs, initializer=_init_worker, initargs=(log_level, cache_dir, profile))
+            results = pool.imap_unordered(parse_file, _throttled(tasks, pending), chunksize=args.chunksize)
+        
+        # 결과가 도착하는 대로 기록하므로 전체 결과를 메모리에 모으지 않음
+        for file_path, text, count, elapsed, error, from_cache, profile_data in results:
+            if pending is not None:
+                pending.release()
+            file_count += 1
+            if profile_data is not None:
+                profiler.absorb(profile_data)
+            if error is not None:
+                failed_count += 1
+                print(f'실패 {elapsed * 1000:8.1f} ms  {file_path}: {error}', file=sys.stderr)
+                continue
+            
+            out.write(text)
+            node_count += count
+            cache_hits += from_cache
+            if not args.quiet:
+                source = '  (캐시)' if from_cache else ''
+                print(f'완료 {elapsed * 1000:8.1f} ms  {count:7d}개 항목  {file_path}{source}', file=sys.stderr)
+        
+        if pool is not None:
+            pool.close()
+            pool.join()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    
+    failed_count += bundle_stats['failed']
+    elapsed = time.perf_counter() - start
+    files_per_sec = file_count / elapsed if elapsed > 0 else 0.0
+    print(f'파일 {file_count}개 (실패 {failed_count}개), {node_count}개 항목, '
+          f'{elapsed:.2f}초, {files_per_sec:.1f} 파일/초 (작업 프로세스 {jobs}개)', file=sys.stderr)
+    if bundle_count:
+        print(f'번들 {bundle_count}개: 멤버 {bundle_stats["members"]}개 중 SR이 아닌 멤버 '
+              f'{bundle_stats["skipped"]}개 건너뜀', file=sys.stderr)
+    if cache_dir:
+        print(f'캐시 적중 {cache_hits}개, 미스 {file_count - cache_hits}개', file=sys.stderr)
+    if profile:
+        print(f'프로파일: {profiler.format_summary(limit=10)}', file=sys.stderr)
+        profiler.dump(args.profile)
+        print(f'프로파일 저장: {args.profile}', file=sys.stderr)
+    return 1 if failed_count else 0
+
+def run_export(args):
+    """
+    export 명령을 실행합니다.
+    
+    문서를 하나씩 로드하여 출력 파일에 바로 쓰므로 배치 전체의 트리나 출력 문자열을
+    메모리에 모으지 않습니다. 출력 순서를 유지하도록 주 프로세스 하나에서 처리합니다.
+    
+    Args:
+        args (argparse.Namespace): 명령줄 인자
+    
+    Returns:
+        int: 종료 코드 (실패한 파일이 있으면 1)
+    """
+    files = list(iter_input_files(args.paths, args.pattern))
+    if not files:
+        print('처리할 파일이 없습니다.', file=sys.stderr)
+        return 1
+    
+    export_format = args.format or format_for_path(args.output)
+    # CSV 모듈이 줄 끝을 직접 쓰므로 CSV 파일은 newline=''로 엶
+    out = (sys.stdout if args.output == '-'
+           else open(args.output, 'w', encoding='utf-8', newline='' if export_format == 'csv' else None))
+    writer = SRExportWriter(out, export_format)
+    
+    # DICOM JSON은 ContentSequence 뒤의 요소까지 필요하므로 전체를 읽고, 트리는 만들지 않음
+    cache = ParseCache(args.cache_dir) if args.cache_dir and not writer.needs_dataset else None
+    parser = DicomSRParser(lazy=not writer.needs_dataset, build_index=False, cache=cache)
+    
+    file_count = 0
+    failed_count = 0
+    item_count = 0
+    bundle_stats = {'members': 0, 'skipped': 0, 'failed': 0}
+    start = time.perf_counter()
+    try:
+        writer.begin()
+        for task in iter_parse_tasks(files, bundle_stats):
+            file_start = time.perf_counter()
+            error = None
+            try:
+                file_path, fields, loaded = _load_task(parser, task)
+                if not loaded:
+                    error = 'DICOM 파일을 읽을 수 없습니다'
+                elif not writer.needs_dataset and parser.parse_sr() is None:
+                    error = 'SR 파싱 실패'
+                else:
+                    count = writer.write_document(parser, fields)
+            finally:
+                parser.close()
+            
+            file_count += 1
+            elapsed = time.perf_counter() - file_start
+            if error is not None:
+                failed_count += 1
+                print(f'실패 {elapsed * 1000:8.1f} ms  {file_path}: {error}', file=sys.stderr)
+                continue
+            item_count += count
+            if not args.quiet:
+                print(f'완료 {elapsed * 1000:8.1f} ms  {count:7d}개 항목  {file_path}', file=sys.stderr)
+        writer.end()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    
+    failed_count += bundle_stats['failed']
+    elapsed = time.perf_counter() - start
+    print(f'파일 {file_count}개 (실패 {failed_count}개), {item_count}개 항목, {elapsed:.2f}초, '
+          f'형식 {export_format} ({EXPORT_FORMATS[export_format]})', file=sys.stderr)
+    return 1 if failed_count else 0
+
+def run_index(args):
+    """
+    index 명령을 실행합니다. 새 파일과 바뀐 파일만 파싱하여 아카이브 인덱스에 저장합니다.
+    
+    Args:
+        args (argparse.Namespace): 명령줄 인자
+    
+    Returns:
+        int: 종료 코드 (실패한 파일이 있으면 1)
+    """
+    return _run_archive_sync(args, prune=False)
+
+def run_sync(args):
+    """
+    sync 명령을 실행합니다. index와 같이 바뀐 파일만 다시 색인하고, 없어진 파일은 인덱스에서 삭제합니다.
+    --watch를 지정하면 중단할 때까지 일정 간격으로 동기화를 반복합니다.
+    
+    Args:
+        args (argparse.Namespace): 명령줄 인자
+    
+    Returns:
+        int: 종료 코드 (마지막 동기화에서 실패한 파일이 있으면 1)
+    """
+    return _run_archive_sync(args, prune=True)
+
+def _run_archive_sync(args, prune):
+    """
+    아카이브 인덱스를 입력 경로와 동기화합니다.
+    
+    작업 프로세스 풀은 파싱할 파일이 여러 개일 때 처음 한 번만 만들어 감시 모드에서도 재사용하며,
+    데이터베이스 쓰기는 주 프로세스에서만 합니다.
+    
+    Args:
+        args (argparse.Namespace): 명령줄 인자
+        prune (bool): 없어진 파일을 인덱스에서 삭제할지 여부
+    
+    Returns:
+        int: 종료 코드
+    """
+    archive = ArchiveIndex(args.db)
+    log_level = logging.getLogger().level
+    jobs = max(1, args.jobs or default_jobs())
+    watch = getattr(args, 'watch', False)
+    
+    # 파싱할 파일이 하나뿐이면 주 프로세스에서 파싱
+    _init_worker(log_level, args.cache_dir)
+    pool = None
+    
+    if watch:
+        # 서비스로 실행할 때 종료 신호(SIGTERM)도 Ctrl+C와 같이 정리한 뒤 종료
+        signal.signal(signal.SIGTERM, _stop_watching)
+    
+    def get_pool():
+        nonlocal pool
+        if pool is None and jobs > 1:
+            pool = multiprocessing.Pool(jobs, initializer=_init_worker, initargs=(log_level, args.cache_dir))
+        return pool
+    
+    exit_code = 0
+    first = True
+    try:
+        while True:
+            # 감시 모드에서는 바뀐 것이 있을 때만 보고
+            exit_code = _sync_once(archive, args, get_pool, prune, report_unchanged=first)
+            first = False
+            if not watch:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print('감시를 중단합니다.', file=sys.stderr)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        archive.close()
+    return exit_code
+
+def _stop_watching(signum, frame):
+    """감시 모드의 SIGTERM 처리 - Ctrl+C와 같이 감시를 중단합니다."""
+    raise KeyboardInterrupt
+
+def _sync_once(archive, args, get_pool, prune, report_unchanged=True):
+    """
+    동기화를 한 번 실행하고 건너뛴 작업량을 보고합니다.
+    
+    Args:
+        archive (ArchiveIndex): 아카이브 인덱스
+        args (argparse.Namespace): 명령줄 인자
+        get_pool (callable): 작업 프로세스 풀을 반환하는 함수 (None을 반환하면 주 프로세스에서 파싱)
+        prune (bool): 없어진 파일을 인덱스에서 삭제할지 여부
+        report_unchanged (bool, optional): 바뀐 것이 없어도 요약을 출력할지 여부
+    
+    Returns:
+        int: 종료 코드 (이번에 새로 실패한 파일이 있으면 1, 바뀌지 않은 채 전에 실패한 파일은 제외)
+    """
+    start = time.perf_counter()
+    files = list(iter_input_files(args.paths, args.pattern))
+    plan = archive.plan_sync(files, args.paths, use_hash=args.hash)
+    
+    failed_count = len(plan['unreadable'])
+    for file_path in plan['unreadable']:
+        print(f'실패  {file_path}: 파일을 읽을 수 없습니다', file=sys.stderr)
+    
+    deleted_count = 0
+    if prune and plan['deleted']:
+        deleted_count = archive.remove(plan['deleted'])
+        if not args.quiet:
+            for file_path in plan['deleted']:
+                print(f'삭제  {file_path}', file=sys.stderr)
+    
+    tasks = plan['new'] + plan['changed']
+    pool = get_pool() if len(tasks) > 1 else None
+    if pool is None:
+        results = map(index_file, tasks)
+    else:
+        results = pool.imap_unordered(index_file, tasks, chunksize=args.chunksize)
+    
+    indexed_count = 0
+    item_count = 0
+    for file_path, fingerprint, sop_instance_uid, rows, elapsed, error in results:
+        if error is not None:
+            # 실패도 지문과 함께 기록하여 파일이 바뀌기 전까지는 다시 파싱하지 않음
+            archive.add_document(file_path, fingerprint, None, [], error=error)
+            failed_count += 1
+            print(f'실패 {elapsed * 1000:8.1f} ms  {file_path}: {error}', file=sys.stderr)
+            continue
+        
+        archive.add_document(file_path, fingerprint, sop_instance_uid, rows)
+        indexed_count += 1
+        item_count += len(rows)
+        if not args.quiet:
+            print(f'색인 {elapsed * 1000:8.1f} ms  {len(rows):7d}개 항목  {file_path}', file=sys.stderr)
+    
+    elapsed = time.perf_counter() - start
+    if not (report_unchanged or tasks or failed_count or deleted_count or plan['touched']):
+        return 0
+    
+    skipped = plan['unchanged'] + plan['touched']
+    skipped_ratio = skipped * 100 / len(files) if files else 100.0
+    touched = f" (내용 같음 {plan['touched']}개)" if args.hash else ''
+    known_failed = f" (이전 실패 {plan['failed']}개)" if plan['failed'] else ''
+    removed = f", 삭제 {deleted_count}개" if prune else ''
+    print(f"파일 {len(files)}개: 새 파일 {len(plan['new'])}개, 변경 {len(plan['changed'])}개, "
+          f"변경 없음 {skipped}개{touched}{known_failed}{removed}, 실패 {failed_count}개 - "
+          f"{skipped_ratio:.1f}% 파싱 생략, 색인 {item_count}개 항목, {elapsed:.2f}초", file=sys.stderr)
+    stats = archive.stats()
+    print(f'인덱스: 문서 {stats["documents"]}개 (파싱 실패 {stats["failed"]}개 제외), 아이템 {stats["items"]}개, '
+          f'{stats["bytes"] / (1024 * 1024):.1f} MB ({archive.db_path})', file=sys.stderr)
+    return 1 if failed_count else 0
+
+def run_query(args):
+    """
+    query 명령을 실행합니다. 아카이브 인덱스에서 아이템 또는 문서를 찾아 출력합니다.
+    
+    Args:
+        args (argparse.Namespace): 명령줄 인자
+    
+    Returns:
+        int: 종료 코드 (인덱스가 없거나 검색 조건이 없으면 1)
+    """
+    db_path = args.db or default_archive_path()
+    if not os.path.exists(db_path):
+        print(f'아카이브 인덱스가 없습니다: {db_path} (먼저 index 명령을 실행하세요)', file=sys.stderr)
+        return 1
+    if not args.text and not args.code and not args.type:
+        print('검색어, --code 또는 --type을 지정하세요.', file=sys.stderr)
+        return 1
+    
+    code = (args.code, args.scheme) if args.code and args.scheme else args.code
+    archive = ArchiveIndex(db_path)
+    start = time.perf_counter()
+    try:
+        if args.documents:
+            results = archive.query_documents(args.text, code, args.type, args.prefix, args.limit)
+        else:
+            results = archive.query(args.text, code, args.type, args.prefix, args.limit)
+    finally:
+        archive.close()
+    elapsed = time.perf_counter() - start
+    
+    for result in results:
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False))
+        elif args.documents:
+            print(f'{result["matches"]}\t{result["file"]}\t{result["first_path"]}')
+        else:
+            print(f'{result["file"]}\t{result["path"]}\t{result["type"]}\t{result["value"]}')
+    print(f'{len(results)}개 결과, {elapsed * 1000:.1f} ms', file=sys.stderr)
+    return 0
+
+def build_arg_parser():
+    """
+    명령줄 인자 파서를 만듭니다.
+    
+    Returns:
+        argparse.ArgumentParser: 인자 파서
+    """
+    parser = argparse.ArgumentParser(description='DICOM SR 일괄 처리 도구')
+    parser.add_argument('-v', '--verbose', action='store_true', help='파일별 로그 출력')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    parse_parser = subparsers.add_parser('parse', help='SR 파일을 파싱하여 콘텐츠 아이템별 JSONL로 출력')
+    parse_parser.add_argument('paths', nargs='+',
+                              help="SR 파일, zip/tar 번들 또는 디렉터리 ('-'이면 표준 입력)")
+    parse_parser.add_argument('-o', '--output', default='-', help='JSONL 출력 파일 (기본값: 표준 출력)')
+    parse_parser.add_argument('-j', '--jobs', type=int, default=None, help='작업 프로세스 수 (기본값: 사용 가능한 CPU 수)')
+    parse_parser.add_argument('--pattern', default=None, help="디렉터리에서 찾을 파일 이름 패턴 (예: '*.dcm')")
+    parse_parser.add_argument('--chunksize', type=int, default=4, help='작업 프로세스에 한 번에 보낼 파일 수')
+    parse_parser.add_argument('--cache-dir', default=None, help='파싱 캐시 디렉터리 (지정하면 바뀌지 않은 파일은 다시 파싱하지 않음)')
+    parse_parser.add_argument('--profile', default=None, metavar='PATH',
+                              help='단계별 시간 기록 저장 (.trace.json: Chrome 트레이스, .folded: 플레임 그래프, 그 외: JSON)')
+    parse_parser.add_argument('-q', '--quiet', action='store_true', help='파일별 처리 시간을 출력하지 않음')
+    parse_parser.set_defaults(func=run_parse)
+    
+    export_parser = subparsers.add_parser('export', help='SR 문서를 중첩 JSON, DICOM JSON, JSONL 또는 CSV로 내보내기')
+    export_parser.add_argument('paths', nargs='+',
+                               help="SR 파일, zip/tar 번들 또는 디렉터리 ('-'이면 표준 입력)")
+    export_parser.add_argument('-o', '--output', default='-', help='출력 파일 (기본값: 표준 출력)')
+    export_parser.add_argument('-f', '--format', choices=list(EXPORT_FORMATS), default=None,
+                               help='내보내기 형식 (기본값: 출력 파일 확장자로 판단, .dcm.json은 dicom-json, 알 수 없으면 jsonl)')
+    export_parser.add_argument('--pattern', default=None, help="디렉터리에서 찾을 파일 이름 패턴 (예: '*.dcm')")
+    export_parser.add_argument('--cache-dir', default=None, help='파싱 캐시 디렉터리 (dicom-json 형식에는 사용하지 않음)')
+    export_parser.add_argument('-q', '--quiet', action='store_true', help='파일별 처리 시간을 출력하지 않음')
+    export_parser.set_defaults(func=run_export)
+    
+    index_parser = subparsers.add_parser('index', help='SR 파일을 아카이브 전문 검색 인덱스에 저장')
+    index_parser.add_argument('paths', nargs='+', help='SR 파일 또는 디렉터리')
+    index_parser.add_argument('--db', default=None, help='인덱스 데이터베이스 (기본값: ~/.cache/dicom_sr_viewer/archive_index.sqlite)')
+    index_parser.add_argument('-j', '--jobs', type=int, default=None, help='작업 프로세스 수 (기본값: 사용 가능한 CPU 수)')
+    index_parser.add_argument('--pattern', default=None, help="디렉터리에서 찾을 파일 이름 패턴 (예: '*.dcm')")
+    index_parser.add_argument('--chunksize', type=int, default=4, help='작업 프로세스에 한 번에 보낼 파일 수')
+    index_parser.add_argument('--cache-dir', default=None, help='파싱 캐시 디렉터리')
+    index_parser.add_argument('--hash', action='store_true', help='크기나 수정 시각이 바뀐 파일은 내용 해시로 실제 변경 여부 확인')
+    index_parser.add_argument('-q', '--quiet', action='store_true', help='파일별 처리 시간을 출력하지 않음')
+    index_parser.set_defaults(func=run_index)
+    
+    sync_parser = subparsers.add_parser('sync', help='폴더와 아카이브 인덱스를 동기화 (바뀐 파일만 다시 색인, 없어진 파일 삭제)')
+    sync_parser.add_argument('paths', nargs='+', help='동기화할 SR 파일 또는 디렉터리')
+    sync_parser.add_argument('--db', default=None, help='인덱스 데이터베이스 (기본값: ~/.cache/dicom_sr_viewer/archive_index.sqlite)')
+    sync_parser.add_argument('-j', '--jobs', type=int, default=None, help='작업 프로세스 수 (기본값: 사용 가능한 CPU 수)')
+    sync_parser.add_argument('--pattern', default=None, help="디렉터리에서 찾을 파일 이름 패턴 (예: '*.dcm')")
+    sync_parser.add_argument('--chunksize', type=int, default=4, help='작업 프로세스에 한 번에 보낼 파일 수')
+    sync_parser.add_argument('--cache-dir', default=None, help='파싱 캐시 디렉터리')
+    sync_parser.add_argument('--hash', action='store_true', help='크기나 수정 시각이 바뀐 파일은 내용 해시로 실제 변경 여부 확인')
+    sync_parser.add_argument('--watch', action='store_true', help='중단할 때까지(Ctrl+C) 일정 간격으로 동기화 반복')
+    sync_parser.add_argument('--interval', type=float, default=60.0, help='--watch 동기화 간격 (초)')
+    sync_parser.add_argument('-q', '--quiet', action='store_true', help='파일별 처리 시간을 출력하지 않음')
+    sync_parser.set_defaults(func=run_sync)
+    
+    query_parser = subparsers.add_parser('query', help='아카이브 인덱스에서 아이템 또는 문서 검색')
+    query_parser.add_argument('text', nargs='?', default=None, help='검색어 (모든 단어를 포함하는 아이템)')
+    query_parser.add_argument('--db', default=None, help='인덱스 데이터베이스 (기본값: ~/.cache/dicom_sr_viewer/archive_index.sqlite)')
+    query_parser.add_argument('--code', default=None, help='개념 이름 또는 개념 값의 CodeValue')
+    query_parser.add_argument('--scheme', default=None, help='--code의 CodingSchemeDesignator')
+    query_parser.add_argument('--type', default=None, help='ValueType (예: TEXT, NUM)')
+    query_parser.add_argument('--prefix', action='store_true', help='검색어의 각 단어로 시작하는 단어도 찾음')
+    query_parser.add_argument('--documents', action='store_true', help='아이템 대신 일치하는 문서를 출력')
+    query_parser.add_argument('--limit', type=int, default=100, help='최대 결과 수')
+    query_parser.add_argument('--json', action='store_true', help='결과를 JSONL로 출력')
+    query_parser.set_defaults(func=run_query)
+    
+    return parser
+
+def main(argv=None):
+    """명령줄 메인 함수"""
+    args = build_arg_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+SR 내보내기 모듈
+열린 문서를 작업 스레드에서 파일로 내보내고 결과를 GUI 스레드로 전달합니다.
+"""
+
+import logging
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from models.dicom_sr_parser import DicomSRParser
+from models.sr_export import SRExportWriter
+
+class SRExportWorker(QObject):
+    """
+    작업 스레드에서 문서 하나를 내보내는 작업 객체
+    
+    트리 형식은 GUI 스레드가 로드한 파서의 트리를 읽기만 하며,
+    DICOM JSON은 ContentSequence 뒤의 요소까지 필요하므로 원본을 새 파서로 다시 읽습니다.
+    """
+    
+    # 내보내기 완료 (기록한 항목 수)
+    finished = pyqtSignal(int)
+    
+    # 내보내기 실패 (오류 메시지)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, sr_parser, output_path, export_format, data=None):
+        """
+        SRExportWorker 클래스 초기화
+        
+        Args:
+            sr_parser (DicomSRParser): 내보낼 문서의 파서
+            output_path (str): 출력 파일 경로
+            export_format (str): 내보내기 형식 (EXPORT_FORMATS의 형식 이름)
+            data (bytes-like, optional): 메모리에서 연 문서의 DICOM 데이터 (DICOM JSON을 다시 읽을 때 사용)
+        """
+        super().__init__()
+        self.logger = logging.getLogger('SRExportWorker')
+        self.sr_parser = sr_parser
+        self.output_path = output_path
+        self.export_format = export_format
+        self.data = data
+    
+    def run(self):
+        """문서를 내보냅니다. 작업 스레드에서 실행됩니다."""
+        reloaded = None
+        try:
+            # CSV 모듈이 줄 끝을 직접 쓰므로 newline=''로 엶
+            with open(self.output_path, 'w', encoding='utf-8', newline='') as out:
+                writer = SRExportWriter(out, self.export_format)
+                source = self.sr_parser
+                if writer.needs_dataset:
+                    reloaded = DicomSRParser(build_index=False)
+                    if self.data is not None:
+                        loaded = reloaded.load_bytes(self.data, name=self.sr_parser.file_path)
+                    else:
+                        loaded = reloaded.load_file(self.sr_parser.file_path)
+                    if not loaded:
+                        self.failed.emit('DICOM 파일을 다시 읽을 수 없습니다')
+                        return
+                    source = reloaded
+                
+                writer.begin()
+                count = writer.write_document(source)
+                writer.end()
+        except Exception as e:
+            self.logger.error(f"내보내기 실패: {e}")
+            self.failed.emit(str(e))
+            return
+        finally:
+            if reloaded is not None:
+                reloaded.close()
+        self.finished.emit(count)
+
+class SRExporter(QObject):
+    """
+    작업 스레드에서 문서를 내보내는 컨트롤러
+    
+    내보내기는 한 번에 하나씩 실행하며, 진행 중에는 새 요청을 받지 않습니다.
+    """
+    
+    # 내보내기 완료 (출력 파일 경로, 기록한 항목 수)
+    finished = pyqtSignal(str, int)
+    
+    # 내보내기 실패 (출력 파일 경로, 오류 메시지)
+    failed = pyqtSignal(str, str)
+    
+    def __init__(self, parent=None):
+        """
+        SRExporter 클래스 초기화
+        
+        Args:
+            parent (QObject, optional): 부모 객체
+        """
+        super().__init__(parent)
+        self.logger = logging.getLogger('SRExporter')
+        self._thread = None
+        self._worker = None
+    
+    def export(self, sr_parser, output_path, export_format, data=None):
+        """
+        내보내기를 시작합니다.
+        
+        Args:
+            sr_parser (DicomSRParser): 내보낼 문서의 파서
+            output_path (str): 출력 파일 경로
+            export_format (str): 내보내기 형식
+            data (bytes-like, optional): 메모리에서 연 문서의 DICOM 데이터
+        
+        Returns:
+            bool: 시작 여부 (이미 내보내는 중이면 False)
+        """
+        if self.is_exporting():
+            return False
+        
+        thread = QThread()
+        worker = SRExportWorker(sr_parser, output_path, export_format, data)
+        worker.moveToThread(thread)
+        worker.finished.connect(lambda count: self.finished.emit(output_path, count))
+        worker.failed.connect(lambda message: self.failed.emit(output_path, message))
+        for signal in (worker.finished, worker.failed):
+            signal.connect(thread.quit)
+        thread.started.connect(worker.run)
+        thread.finished.connect(self._on_thread_finished)
+        
+        self._thread = thread
+        self._worker = worker
+        thread.start()
+        return True
+    
+    def is_exporting(self):
+        """
+        진행 중인 내보내기가 있는지 확인합니다.
+        
+        Returns:
+            bool: 내보내기 진행 여부
+        """
+        return self._thread is not None
+    
+    def shutdown(self, timeout_ms=5000):
+        """
+        진행 중인 내보내기가 끝날 때까지 기다립니다.
+        
+        Args:
+            timeout_ms (int, optional): 기다릴 최대 시간 (밀리초)
+        """
+        if self._thread is not None and not self._thread.wait(timeout_ms):
+            self.logger.warning("내보내기 스레드가 제한 시간 안에 종료되지 않았습니다.")
+    
+    def _on_thread_finished(self):
+        self._thread = None
+        self._worker = None
@@ -0,0 +1,361 @@
+"""
+SR 로더 모듈
+DICOM SR 파일(또는 메모리에 있는 SR 데이터)의 로드와 파싱을 작업 스레드에서 실행하고 진행 상황과 노드를 GUI 스레드로 전달합니다.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from models.dicom_sr_parser import DicomSRParser
+
+# 한 번에 GUI 스레드로 보낼 최대 노드 수
+NODE_BATCH_SIZE = 500
+
+# 노드 묶음이 다 차지 않아도 GUI 스레드로 보내는 간격 (초)
+NODE_BATCH_INTERVAL = 0.1
+
+class LoadCancelled(Exception):
+    """로드가 취소되었을 때 작업 스레드 안에서 사용하는 예외"""
+
+class SRLoadWorker(QObject):
+    """
+    작업 스레드에서 파일 하나를 로드하고 파싱하는 작업 객체
+    
+    GUI 스레드와 공유하는 상태는 취소 플래그뿐이며, 결과는 시그널로만 전달합니다.
+    파서는 작업 객체마다 새로 만들므로 GUI 스레드가 사용 중인 파서에 영향을 주지 않습니다.
+    
+    깊이/너비 제한 파싱이면 제한 안의 노드를 보낸 뒤 finished로 파서를 넘기고, 같은 스레드에서
+    남은 노드를 모두 만든 뒤 completed를 보냅니다. 이때부터 GUI 스레드도 파서의 expand()를 호출하며,
+    둘 사이의 동기화는 파서의 잠금이 맡습니다.
+    """
+    
+    # 읽기 진행 상황 (읽은 bytes, 전체 bytes)
+    bytes_read = pyqtSignal(int, int)
+    
+    # 파싱 진행 상황 (지금까지 파싱한 노드 수)
+    items_parsed = pyqtSignal(int)
+    
+    # 파싱된 (path, depth, node) 묶음
+    nodes_ready = pyqtSignal(list)
+    
+    # 파싱 완료 (파서, 노드 수) - 깊이/너비 제한 파싱이면 제한 안의 노드 수
+    finished = pyqtSignal(object, int)
+    
+    # 깊이/너비 제한 파싱에서 남은 노드까지 모두 만듦 (파서, 전체 노드 수)
+    completed = pyqtSignal(object, int)
+    
+    # 로드 또는 파싱 실패 (오류 메시지)
+    failed = pyqtSignal(str)
+    
+    # 취소 완료
+    cancelled = pyqtSignal()
+    
+    def __init__(self, file_path, lazy=True, batch_size=NODE_BATCH_SIZE, cache=None, data=None,
+                 parse_depth=None, parse_breadth=None):
+        """
+        SRLoadWorker 클래스 초기화
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로 (data가 있으면 문서 이름)
+            lazy (bool, optional): 지연 로딩 모드 사용 여부
+            batch_size (int, optional): 한 번에 보낼 최대 노드 수
+            cache (ParseCache, optional): 파싱 결과 디스크 캐시
+            data (bytes-like, optional): 파일 대신 읽을 메모리의 DICOM 데이터
+            parse_depth (int, optional): 먼저 만들어 보낼 최대 깊이 (None이면 제한 없음)
+            parse_breadth (int, optional): 먼저 만들어 보낼 노드마다의 최대 자식 노드 수 (None이면 제한 없음)
+        """
+        super().__init__()
+        self.logger = logging.getLogger('SRLoadWorker')
+        self.file_path = file_path
+        self.data = data
+        self.lazy = lazy
+        self.batch_size = batch_size
+        self.cache = cache
+        self.parse_depth = parse_depth
+        self.parse_breadth = parse_breadth
+        self._cancel_event = threading.Event()
+    
+    def cancel(self):
+        """작업 취소를 요청합니다. 어느 스레드에서나 호출할 수 있습니다."""
+        self._cancel_event.set()
+    
+    def is_cancelled(self):
+        """
+        작업 취소가 요청되었는지 확인합니다.
+        
+        Returns:
+            bool: 취소 요청 여부
+        """
+        return self._cancel_event.is_set()
+    
+    def _on_bytes_read(self, position, total):
+        """파서의 읽기 진행 콜백 - 취소 요청이 있으면 읽기를 중단합니다."""
+        if self._cancel_event.is_set():
+            raise LoadCancelled()
+        self.bytes_read.emit(position, total)
+    
+    def run(self):
+        """파일 또는 메모리의 데이터를 로드하고 파싱합니다. 작업 스레드에서 실행됩니다."""
+        parser = DicomSRParser(lazy=self.lazy, cache=self.cache,
+                               parse_depth=self.parse_depth, parse_breadth=self.parse_breadth)
+        
+        if self.data is not None:
+            total = memoryview(self.data).nbytes
+            loaded = parser.load_bytes(self.data, name=self.file_path, progress=self._on_bytes_read)
+        else:
+            try:
+                total = os.path.getsize(self.file_path)
+            except OSError as e:
+                self.failed.emit(f'파일을 열 수 없습니다: {e}')
+                return
+            loaded = parser.load_file(self.file_path, progress=self._on_bytes_read)
+        
+        if not loaded:
+            if self.is_cancelled():
+                self.cancelled.emit()
+            else:
+                self.failed.emit('DICOM 파일을 읽을 수 없습니다')
+            return
+        
+        # 읽기 단계 완료 (지연 로딩에서는 ContentSequence 이후 요소는 읽지 않음)
+        self.bytes_read.emit(total, total)
+        
+        batch = []
+        node_count = 0
+        last_emit = time.monotonic()
+        stream = parser.iter_nodes()
+        try:
+            for entry in stream:
+                if self._cancel_event.is_set():
+                    raise LoadCancelled()
+                
+                batch.append(entry)
+                node_count += 1
+                if len(batch) >= self.batch_size or time.monotonic() - last_emit >= NODE_BATCH_INTERVAL:
+                    self.nodes_ready.emit(batch)
+                    self.items_parsed.emit(node_count)
+                    batch = []
+                    last_emit = time.monotonic()
+        except LoadCancelled:
+            stream.close()
+            parser.close()
+            self.cancelled.emit()
+            return
+        except Exception as e:
+            parser.close()
+            self.logger.error(f"SR 파싱 중 오류 발생: {e}")
+            self.failed.emit(str(e))
+            return
+        
+        if batch:
+            self.nodes_ready.emit(batch)
+        self.items_parsed.emit(node_count)
+        self.finished.emit(parser, node_count)
+        
+        if not parser.is_complete():
+            self._complete(parser)
+    
+    def _complete(self, parser):
+        """
+        깊이/너비 제한 파싱에서 남은 노드를 모두 만듭니다 (검색 인덱스와 캐시 포함).
+        
+        파서는 이미 GUI 스레드로 넘어갔으므로 취소되더라도 닫지 않습니다.
+        
+        Args:
+            parser (DicomSRParser): finished로 보낸 파서
+        """
+        stream = parser.iter_remaining()
+        try:
+            for _ in stream:
+                if self._cancel_event.is_set():
+                    raise LoadCancelled()
+        except LoadCancelled:
+            stream.close()
+            self.cancelled.emit()
+            return
+        except Exception as e:
+            self.logger.error(f"남은 서브트리 파싱 중 오류 발생: {e}")
+            self.failed.emit(str(e))
+            return
+        
+        if parser.is_complete():
+            self.completed.emit(parser, len(parser.nodes))
+        else:
+            # 파싱 도중 GUI 스레드가 문서를 닫은 경우
+            self.cancelled.emit()
+
+class SRLoader(QObject):
+    """
+    작업 스레드에서 SR 파일을 로드하는 컨트롤러
+    
+    파일마다 새 작업 스레드를 만들고, 새 파일을 로드하면 진행 중인 작업을 취소합니다.
+    취소된 작업이 이미 보낸 시그널은 무시하므로 GUI에는 마지막으로 요청한 파일의 결과만 전달됩니다.
+    
+    깊이/너비 제한 파싱이면 loaded 뒤에도 작업 스레드가 남은 노드를 만들며, 이 작업은 다른 파일을
+    로드해도 취소하지 않고 문서를 닫을 때 cancel_completion으로 취소합니다.
+    """
+    
+    # 읽기 진행 상황 (읽은 bytes, 전체 bytes)
+    bytes_read = pyqtSignal(int, int)
+    
+    # 파싱 진행 상황 (지금까지 파싱한 노드 수)
+    items_parsed = pyqtSignal(int)
+    
+    # 파싱된 (path, depth, node) 묶음
+    nodes_ready = pyqtSignal(list)
+    
+    # 로드 완료 (파일 경로, 파서, 노드 수)
+    loaded = pyqtSignal(str, object, int)
+    
+    # 깊이/너비 제한 파싱에서 남은 노드까지 모두 만듦 (파일 경로, 파서, 전체 노드 수)
+    completed = pyqtSignal(str, object, int)
+    
+    # 로드 실패 (파일 경로, 오류 메시지)
+    failed = pyqtSignal(str, str)
+    
+    def __init__(self, parent=None, lazy=True, cache=None, parse_depth=None, parse_breadth=None):
+        """
+        SRLoader 클래스 초기화
+        
+        Args:
+            parent (QObject, optional): 부모 객체
+            lazy (bool, optional): 지연 로딩 모드 사용 여부
+            cache (ParseCache, optional): 모든 작업이 함께 사용하는 파싱 결과 디스크 캐시
+            parse_depth (int, optional): 로드할 때 먼저 만들 최대 깊이 (None이면 제한 없음)
+            parse_breadth (int, optional): 로드할 때 먼저 만들 노드마다의 최대 자식 노드 수 (None이면 제한 없음)
+        """
+        super().__init__(parent)
+        self.logger = logging.getLogger('SRLoader')
+        self.lazy = lazy
+        self.cache = cache
+        self.parse_depth = parse_depth
+        self.parse_breadth = parse_breadth
+        self._worker = None
+        # 파일 경로 → 남은 노드를 만드는 작업 객체
+        self._completing = {}
+        # 종료를 기다리는 (스레드, 작업 객체) - 스레드가 끝날 때까지 참조를 유지
+        self._running = {}
+    
+    def load(self, file_path, data=None):
+        """
+        파일 로드를 시작합니다. 진행 중인 로드가 있으면 취소합니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로 (data가 있으면 문서 이름)
+            data (bytes-like, optional): 파일 대신 읽을 메모리의 DICOM 데이터 (복사하지 않고 그대로 읽음)
+        """
+        self.cancel()
+        self.cancel_completion(file_path)
+        
+        thread = QThread()
+        worker = SRLoadWorker(file_path, lazy=self.lazy, cache=self.cache, data=data,
+                              parse_depth=self.parse_depth, parse_breadth=self.parse_breadth)
+        worker.moveToThread(thread)
+        
+        worker.bytes_read.connect(self._on_bytes_read)
+        worker.items_parsed.connect(self._on_items_parsed)
+        worker.nodes_ready.connect(self._on_nodes_ready)
+        worker.finished.connect(self._on_finished)
+        worker.completed.connect(self._on_completed)
+        worker.failed.connect(self._on_failed)
+        
+        # 작업이 어떤 방식으로 끝나든 스레드를 종료하고 참조를 정리
+        # (finished 뒤에 남은 노드를 만드는 동안에는 run()이 끝난 뒤 스레드가 종료됨)
+        for signal in (worker.finished, worker.completed, worker.failed, worker.cancelled):
+            signal.connect(thread.quit)
+        thread.started.connect(worker.run)
+        thread.finished.connect(lambda: self._running.pop(thread, None))
+        
+        self._worker = worker
+        self._running[thread] = worker
+        thread.start()
+    
+    def cancel(self):
+        """진행 중인 로드를 취소합니다."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+    
+    def cancel_completion(self, file_path):
+        """
+        문서의 남은 노드를 만드는 작업을 취소합니다 (문서를 닫거나 해제할 때).
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+        """
+        worker = self._completing.pop(file_path, None)
+        if worker is not None:
+            worker.cancel()
+    
+    def is_loading(self):
+        """
+        진행 중인 로드가 있는지 확인합니다.
+        
+        Returns:
+            bool: 로드 진행 여부
+        """
+        return self._worker is not None
+    
+    def shutdown(self, timeout_ms=5000):
+        """
+        모든 작업을 취소하고 작업 스레드가 끝날 때까지 기다립니다.
+        
+        Args:
+            timeout_ms (int, optional): 스레드마다 기다릴 최대 시간 (밀리초)
+        """
+        self.cancel()
+        self._completing.clear()
+        for thread, worker in list(self._running.items()):
+            worker.cancel()
+            thread.quit()
+            if not thread.wait(timeout_ms):
+                self.logger.warning("작업 스레드가 제한 시간 안에 종료되지 않았습니다.")
+        self._running.clear()
+    
+    # 작업 객체 시그널 처리 (현재 작업이 보낸 시그널만 전달)
+    
+    def _is_current(self):
+        """시그널을 보낸 작업 객체가 현재 작업인지 확인합니다."""
+        return self._worker is not None and self.sender() is self._worker
+    
+    def _on_bytes_read(self, position, total):
+        if self._is_current():
+            self.bytes_read.emit(position, total)
+    
+    def _on_items_parsed(self, node_count):
+        if self._is_current():
+            self.items_parsed.emit(node_count)
+    
+    def _on_nodes_ready(self, entries):
+        if self._is_current():
+            self.nodes_ready.emit(entries)
+    
+    def _on_finished(self, parser, node_count):
+        if not self._is_current():
+            parser.close()
+            return
+        file_path = self._worker.file_path
+        if not parser.is_complete():
+            self._completing[file_path] = self._worker
+        self._worker = None
+        self.loaded.emit(file_path, parser, node_count)
+    
+    def _on_completed(self, parser, node_count):
+        worker = self.sender()
+        if self._completing.get(worker.file_path) is worker:
+            del self._completing[worker.file_path]
+            self.completed.emit(worker.file_path, parser, node_count)
+    
+    def _on_failed(self, message):
+        if self._is_current():
+            file_path = self._worker.file_path
+            self._worker = None
+            self.failed.emit(file_path, message)
+        elif self._completing.get(self.sender().file_path) is self.sender():
+            # 남은 노드를 만들다 실패하면 표시된 트리는 그대로 두고 작업만 정리
+            del self._completing[self.sender().file_path]
+            self.logger.error(f"남은 서브트리 파싱 실패: {self.sender().file_path} - {message}")
@@ -3,39 +3,110 @@
 DICOM SR 뷰어의 메인 애플리케이션 클래스를 제공합니다.
 """
 
+import time
+
+# 시작 시간 측정 기준 (PyQt5 임포트 전)
+START_TIME = time.perf_counter()
+
 import sys
 import os
 import logging
+import threading
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QFileDialog, QLabel, 
-                            QLineEdit, QStatusBar, QSplitter, QFrame)
-from PyQt5.QtCore import Qt
+                            QLineEdit, QStatusBar, QSplitter, QFrame, QTabWidget, QMenu)
+from PyQt5.QtCore import Qt, QTimer
 
-# 모델 및 뷰 모듈 임포트
-from models.dicom_sr_parser import DicomSRParser
+# 모델, 뷰 및 컨트롤러 모듈 임포트
+from models.archive_index import ArchiveIndex, default_archive_path
+from models.dicom_sr_parser import DicomSRParser, preload_dependencies
+from models.document_manager import DocumentManager, DEFAULT_MEMORY_BUDGET
+from models.parse_cache import ParseCache
+from models.profiling import profiler
 from models.search import DicomSRSearcher
-from views.tree_view import DicomSRTreeView
+from models.sr_export import DEFAULT_EXTENSIONS, EXPORT_FORMATS
+from models.sr_tree import format_path, parse_path
+from views.tree_model import FETCH_BATCH_SIZE
+from views.tree_view import DEFAULT_EXPAND_DEPTH, DicomSRTreeView
+from views.archive_search_dialog import ArchiveSearchDialog
+from controllers.sr_exporter import SRExporter
+from controllers.sr_loader import SRLoader
+
+# 입력을 멈춘 뒤 검색을 실행하기까지 기다리는 시간 (ms)
+SEARCH_DEBOUNCE_MS = 250
+
+# 입력하는 대로 검색할 최소 검색어 길이 (더 짧은 검색어는 Enter로 검색)
+LIVE_SEARCH_MIN_LENGTH = 2
+
+# 메모리에서 연 문서의 이름 앞에 붙여 파일 경로와 구분하는 접두사
+MEMORY_DOCUMENT_PREFIX = 'memory:'
 
 class DicomSRViewer(QMainWindow):
     """DICOM SR 뷰어 메인 애플리케이션 클래스"""
     
-    def __init__(self):
-        """DicomSRViewer 클래스 초기화"""
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        """
+        DicomSRViewer 클래스 초기화
+        
+        Args:
+            memory_budget (int, optional): 열어 둔 문서들이 사용할 메모리 예산 (bytes)
+        """
         super().__init__()
         
         # 로깅 설정
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger('DicomSRViewer')
         
-        # 모델 초기화
-        self.sr_parser = DicomSRParser()
+        # 모델 초기화 (뷰어는 ContentSequence 트리만 필요하므로 지연 로딩 사용)
+        # sr_parser는 현재 탭 문서의 파서이며, 열린 문서가 없을 때는 빈 파서
+        self.sr_parser = DicomSRParser(lazy=True)
         self.sr_searcher = DicomSRSearcher(self.sr_parser)
         
+        # 여러 문서를 탭으로 열어 두고 메모리 예산을 넘으면 오래 사용하지 않은 문서를 해제
+        self.documents = DocumentManager(memory_budget)
+        
+        # 파일 경로 → 탭의 트리 뷰
+        self.tree_views = {}
+        
+        # 현재 탭의 트리 뷰 (열린 문서가 없으면 None)
+        self.tree_view = None
+        
+        # 작업 스레드에서 로드 중인 파일 경로와 로드 시작 시각 (프로파일 요약 기준)
+        self._loading_file = None
+        self._load_started = profiler.now()
+        
+        # 다시 여는 파일은 디스크 캐시에서 복원
+        self.parse_cache = ParseCache()
+        
+        # 파일 로드와 파싱은 작업 스레드에서 실행 (로드가 끝나면 새 파서로 교체)
+        # 처음 펼쳐 보이는 깊이와 한 번에 노출하는 자식 행 수까지만 먼저 만들어 문서 크기와 관계없이
+        # 트리를 바로 표시하고, 나머지는 펼칠 때 만들거나 작업 스레드가 이어서 만듦
+        self.loader = SRLoader(self, lazy=True, cache=self.parse_cache,
+                               parse_depth=DEFAULT_EXPAND_DEPTH, parse_breadth=FETCH_BATCH_SIZE)
+        
+        # 내보내기도 작업 스레드에서 실행
+        self.exporter = SRExporter(self)
+        self.exporter.finished.connect(self.on_export_finished)
+        self.exporter.failed.connect(self.on_export_failed)
+        
         # UI 초기화
         self.init_ui()
         
         # 현재 로드된 파일 경로
         self.current_file = None
+        
+        # 아카이브 인덱스와 검색 대화상자 (처음 열 때 생성)
+        self.archive_index = None
+        self.archive_dialog = None
+        
+        # 로드가 끝나면 선택할 (파일 경로, 아이템 위치)
+        self._pending_item = None
+        
+        # 트리가 완성되면 검색할 문서의 파일 경로 (남은 노드를 만드는 동안 요청한 검색)
+        self._deferred_search = None
+        
+        # 메모리에서 연 문서의 이름 → DICOM 데이터 (메모리 예산 때문에 해제된 문서를 다시 로드할 때 사용)
+        self._payloads = {}
     
     def init_ui(self):
         """UI 초기화"""
@@ -58,6 +129,15 @@ class DicomSRViewer(QMainWindow):
         self.open_button.clicked.connect(self.open_file)
         toolbar_layout.addWidget(self.open_button)
         
+        # 내보내기 버튼 (형식 메뉴)
+        self.export_button = QPushButton('내보내기')
+        export_menu = QMenu(self.export_button)
+        for export_format, description in EXPORT_FORMATS.items():
+            action = export_menu.addAction(f'{description} ({DEFAULT_EXTENSIONS[export_format]})')
+            action.triggered.connect(lambda checked, export_format=export_format: self.export_document(export_format))
+        self.export_button.setMenu(export_menu)
+        toolbar_layout.addWidget(self.export_button)
+        
         # 검색 입력창
         self.search_label = QLabel('검색:')
         toolbar_layout.addWidget(self.search_label)
@@ -65,22 +145,38 @@ class DicomSRViewer(QMainWindow):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText('검색어 입력')
         self.search_input.returnPressed.connect(self.search_text)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
         toolbar_layout.addWidget(self.search_input)
         
+        # 입력할 때마다 타이머를 다시 시작하여 입력이 멈춘 뒤의 검색어로만 검색
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.live_search)
+        
         # 검색 버튼
         self.search_button = QPushButton('검색')
         self.search_button.clicked.connect(self.search_text)
         toolbar_layout.addWidget(self.search_button)
         
+        # 아카이브 검색 버튼
+        self.archive_button = QPushButton('아카이브 검색')
+        self.archive_button.clicked.connect(self.open_archive_search)
+        toolbar_layout.addWidget(self.archive_button)
+        
         # 툴바 레이아웃을 메인 레이아웃에 추가
         main_layout.addLayout(toolbar_layout)
         
         # 스플리터 생성
         splitter = QSplitter(Qt.Horizontal)
         
-        # 트리 뷰 위젯
-        self.tree_view = DicomSRTreeView()
-        splitter.addWidget(self.tree_view)
+        # 문서별 트리 뷰 탭
+        self.tabs = QTabWidget()
+        self.tabs.setTabsClosable(True)
+        self.tabs.setMovable(True)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        self.tabs.tabCloseRequested.connect(self.close_tab)
+        splitter.addWidget(self.tabs)
         
         # 상세 정보 패널
         self.detail_panel = QFrame()
@@ -108,8 +204,18 @@ class DicomSRViewer(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage('준비됨')
         
-        # 트리 노드 선택 이벤트 연결
-        self.tree_view.node_selected.connect(self.show_node_details)
+        # 열린 문서들의 추정 메모리 사용량 표시
+        self.memory_label = QLabel()
+        self.status_bar.addPermanentWidget(self.memory_label)
+        self.update_memory_label()
+        
+        # 로더 이벤트 연결 (파싱된 노드는 묶음 단위로 로드 중인 탭의 트리 뷰에 추가)
+        self.loader.bytes_read.connect(self.on_bytes_read)
+        self.loader.items_parsed.connect(self.on_items_parsed)
+        self.loader.nodes_ready.connect(self.on_nodes_ready)
+        self.loader.loaded.connect(self.on_file_loaded)
+        self.loader.completed.connect(self.on_parse_completed)
+        self.loader.failed.connect(self.on_load_failed)
     
     def open_file(self):
         """DICOM SR 파일 열기 대화상자 표시"""
@@ -120,37 +226,437 @@ class DicomSRViewer(QMainWindow):
         if file_path:
             self.load_file(file_path)
     
+    def open_archive_search(self):
+        """아카이브 검색 대화상자 표시"""
+        if self.archive_dialog is None:
+            db_path = default_archive_path()
+            if not os.path.exists(db_path):
+                self.status_bar.showMessage(
+                    f'아카이브 인덱스가 없습니다: {db_path} (python src/cli.py index <디렉터리>로 만드세요)')
+                return
+            self.archive_index = ArchiveIndex(db_path)
+            self.archive_dialog = ArchiveSearchDialog(self.archive_index, self)
+            self.archive_dialog.item_activated.connect(self.open_item)
+        
+        self.archive_dialog.show()
+        self.archive_dialog.raise_()
+        self.archive_dialog.activateWindow()
+    
+    def open_item(self, file_path, item_path):
+        """
+        파일을 열고 트리 위치의 아이템을 선택합니다. 파일이 로드 중이면 로드가 끝난 뒤 선택합니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+            item_path (str): 아이템 위치 (예: "1.2.3")
+        """
+        file_path = os.path.abspath(file_path)
+        self._pending_item = (file_path, parse_path(item_path))
+        self.load_file(file_path)
+        if self.documents.is_resident(file_path):
+            self._select_pending_item(file_path)
+    
+    def _select_pending_item(self, file_path):
+        """로드가 끝난 파일에 선택을 기다리는 아이템이 있으면 선택합니다."""
+        if self._pending_item is None or self._pending_item[0] != file_path:
+            return
+        
+        _, path = self._pending_item
+        self._pending_item = None
+        if not self.tree_views[file_path].select_path(path):
+            self.status_bar.showMessage(f'항목을 찾을 수 없습니다: {format_path(path)}')
+    
     def load_file(self, file_path):
         """
         DICOM SR 파일 로드 및 파싱
         
+        파일마다 탭을 하나 열며, 이미 열려 있고 메모리에 있는 문서는 다시 읽지 않고 탭만 전환합니다.
+        로드와 파싱은 작업 스레드에서 실행되며, 파싱된 노드는 끝나기 전에도 묶음 단위로
+        트리에 표시됩니다. 다른 파일의 로드가 진행 중이면 취소합니다.
+        
         Args:
             file_path (str): DICOM SR 파일 경로
         """
+        self._open_document(os.path.abspath(file_path))
+    
+    def open_bytes(self, data, name):
+        """
+        메모리에 있는 DICOM SR 데이터를 임시 파일 없이 탭으로 엽니다 (표준 입력, 네트워크로 받은 SR 등).
+        
+        데이터는 탭을 닫을 때까지 유지되며, 같은 이름으로 다시 열면 새 데이터로 다시 로드합니다.
+        
+        Args:
+            data (bytes-like): DICOM 파일 내용
+            name (str): 탭에 표시할 문서 이름
+        """
+        key = MEMORY_DOCUMENT_PREFIX + name
+        if key in self._payloads:
+            # 같은 이름의 이전 데이터는 버리고 새 데이터로 다시 로드
+            self.documents.remove(key)
+            if key == self._loading_file:
+                self.loader.cancel()
+                self._loading_file = None
+        self._payloads[key] = data
+        self._open_document(key)
+    
+    def _open_document(self, file_path):
+        """
+        문서의 탭을 열거나 전환하고, 메모리에 없는 문서는 로드를 시작합니다.
+        
+        Args:
+            file_path (str): 절대 파일 경로 또는 메모리 문서 이름
+        """
+        view = self.tree_views.get(file_path)
+        if view is None:
+            view = DicomSRTreeView()
+            view.node_selected.connect(self.show_node_details)
+            view.reference_not_found.connect(
+                lambda reference: self.status_bar.showMessage(f'참조 대상 항목을 찾을 수 없습니다: {reference}'))
+            self.tree_views[file_path] = view
+            index = self.tabs.addTab(view, os.path.basename(file_path))
+            self.tabs.setTabToolTip(index, file_path)
+        
+        if not self.documents.is_resident(file_path) and file_path != self._loading_file:
+            self._start_load(file_path)
+        
+        if self.tabs.currentWidget() is view:
+            self.on_tab_changed(self.tabs.currentIndex())
+        else:
+            self.tabs.setCurrentWidget(view)
+    
+    def _start_load(self, file_path):
+        """
+        작업 스레드에서 파일 로드를 시작합니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+        """
+        # 취소되는 이전 로드의 탭은 비워 두고, 다시 선택하면 새로 로드
+        previous_view = self.tree_views.get(self._loading_file)
+        if previous_view is not None:
+            previous_view.clear()
+        
+        self._loading_file = file_path
+        self._load_started = profiler.now()
+        self.tree_views[file_path].clear()
+        self.loader.load(file_path, self._payloads.get(file_path))
+    
+    def on_tab_changed(self, index):
+        """
+        탭 전환 이벤트 핸들러
+        
+        메모리에 있는 문서는 바로 전환하고, 메모리 예산 때문에 해제된 문서는 다시 로드합니다.
+        
+        Args:
+            index (int): 선택된 탭 번호 (탭이 없으면 -1)
+        """
+        view = self.tabs.widget(index)
+        self.tree_view = view
+        file_path = self._file_for_view(view)
+        
+        # 다른 문서에서 기다리던 검색은 그 탭으로 돌아왔을 때 실행하지 않음
+        self._deferred_search = None
+        
+        if file_path is None:
+            self._set_active_document(None)
+            self.setWindowTitle('DICOM SR 뷰어')
+            return
+        
+        if self.documents.is_resident(file_path):
+            document = self.documents.get(file_path)
+            self._set_active_document(document.sr_parser, file_path)
+            self.status_bar.showMessage(f'{os.path.basename(file_path)} ({document.node_count}개 항목)')
+            return
+        
+        # 로드가 끝날 때까지 검색은 비활성화
+        self._set_active_document(None)
         self.status_bar.showMessage(f'파일 로드 중: {file_path}')
+        if file_path != self._loading_file:
+            self._start_load(file_path)
+    
+    def _file_for_view(self, view):
+        """트리 뷰가 표시하는 문서의 파일 경로를 반환합니다."""
+        for file_path, tree_view in self.tree_views.items():
+            if tree_view is view:
+                return file_path
+        return None
+    
+    def _set_active_document(self, sr_parser, file_path=None):
+        """
+        검색 대상 문서를 설정합니다.
+        
+        Args:
+            sr_parser (DicomSRParser): 문서의 파서 (None이면 빈 파서)
+            file_path (str, optional): 문서의 파일 경로
+        """
+        self.sr_parser = sr_parser if sr_parser is not None else DicomSRParser(lazy=True)
+        self.sr_searcher.set_parser(self.sr_parser)
+        self.current_file = file_path
+        if file_path is not None:
+            self.setWindowTitle(f'DICOM SR 뷰어 - {os.path.basename(file_path)}')
+    
+    def close_tab(self, index):
+        """
+        탭을 닫고 문서의 메모리를 해제합니다.
+        
+        Args:
+            index (int): 닫을 탭 번호
+        """
+        view = self.tabs.widget(index)
+        file_path = self._file_for_view(view)
+        
+        if file_path == self._loading_file:
+            self.loader.cancel()
+            self._loading_file = None
+        
+        self.loader.cancel_completion(file_path)
+        if self._deferred_search == file_path:
+            self._deferred_search = None
+        self.documents.remove(file_path)
+        self._payloads.pop(file_path, None)
+        self.tree_views.pop(file_path, None)
+        self.tabs.removeTab(index)
+        view.deleteLater()
+        self.update_memory_label()
+    
+    def update_memory_label(self):
+        """상태 바의 메모리 사용량 표시를 갱신합니다."""
+        usage_mb = self.documents.memory_usage() / (1024 * 1024)
+        budget_mb = self.documents.memory_budget / (1024 * 1024)
+        self.memory_label.setText(f'문서 메모리: {usage_mb:,.0f} / {budget_mb:,.0f} MB')
+    
+    def on_nodes_ready(self, entries):
+        """
+        파싱된 노드 묶음 도착 이벤트 핸들러
+        
+        Args:
+            entries (list): (path, depth, node) 튜플 목록
+        """
+        view = self.tree_views.get(self._loading_file)
+        if view is not None:
+            view.append_nodes(entries)
+    
+    def on_bytes_read(self, position, total):
+        """
+        파일 읽기 진행 이벤트 핸들러
+        
+        Args:
+            position (int): 읽은 bytes
+            total (int): 전체 bytes
+        """
+        percent = position * 100 // total if total else 100
+        self.status_bar.showMessage(f'파일 읽는 중: {percent}% ({position // 1024:,} / {total // 1024:,} KB)')
+    
+    def on_items_parsed(self, node_count):
+        """
+        파싱 진행 이벤트 핸들러
+        
+        Args:
+            node_count (int): 지금까지 파싱된 노드 수
+        """
+        self.status_bar.showMessage(f'파싱 중: {node_count:,}개 항목')
+    
+    def on_file_loaded(self, file_path, sr_parser, node_count):
+        """
+        파일 로드 및 파싱 완료 이벤트 핸들러
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+            sr_parser (DicomSRParser): 파싱이 끝난 파서
+            node_count (int): 트리에 추가된 노드 수
+        """
+        self._loading_file = None
+        
+        # 로드 중에 탭이 닫힌 경우
+        if file_path not in self.tree_views:
+            sr_parser.close()
+            return
+        
+        if sr_parser.get_tree() is None:
+            sr_parser.close()
+            self.on_load_failed(file_path, 'SR 파싱 실패')
+            return
+        
+        # 보고 있지 않은 탭에서 끝난 로드가 보고 있는 문서를 해제하지 않도록 가장 오래된 문서로 추가
+        is_current = self.tree_views[file_path] is self.tabs.currentWidget()
+        self._release_evicted(self.documents.add(file_path, sr_parser, recent=is_current))
+        self.update_memory_label()
+        
+        if not self.documents.is_resident(file_path):
+            # 추가하자마자 예산 때문에 해제된 문서는 탭을 선택할 때 다시 로드
+            return
+        
+        # 아직 만들지 않은 자식 노드는 펼칠 때 파서에서 만듦
+        self.tree_views[file_path].set_expander(sr_parser)
+        
+        if not is_current:
+            return
+        
+        self._set_active_document(sr_parser, file_path)
+        file_name = os.path.basename(file_path)
+        source = ', 캐시' if sr_parser.from_cache else ''
+        if not sr_parser.is_complete():
+            source += ', 나머지는 백그라운드에서 파싱 중'
+        message = f'파일 로드 완료: {file_name} ({node_count}개 항목{source})'
+        if profiler.enabled:
+            message += ' | ' + profiler.format_summary(since=self._load_started)
+        self.status_bar.showMessage(message)
+        self.logger.info(f"파싱 캐시 통계: {self.parse_cache.stats()}")
+        self._select_pending_item(file_path)
+    
+    def on_parse_completed(self, file_path, sr_parser, node_count):
+        """
+        깊이/너비 제한 파싱에서 남은 노드까지 모두 만들었을 때의 이벤트 핸들러
+        
+        문서의 메모리 추정치를 갱신하고, 트리가 완성되기를 기다리던 검색이 있으면 실행합니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+            sr_parser (DicomSRParser): 트리가 완성된 파서
+            node_count (int): 전체 노드 수
+        """
+        # 로더는 닫히거나 다시 로드된 문서의 완료는 보내지 않으므로 해제 여부만 확인
+        if not self.documents.is_resident(file_path):
+            return
+        
+        self._release_evicted(self.documents.refresh(file_path))
+        self.update_memory_label()
         
-        # 파일 로드
-        if self.sr_parser.load_file(file_path):
-            # SR 파싱
-            tree_data = self.sr_parser.parse_sr()
-            
-            if tree_data:
-                # 트리 뷰 업데이트
-                self.tree_view.set_tree_data(tree_data)
-                
-                # 현재 파일 경로 저장
-                self.current_file = file_path
-                
-                file_name = os.path.basename(file_path)
-                self.status_bar.showMessage(f'파일 로드 완료: {file_name}')
-                self.setWindowTitle(f'DICOM SR 뷰어 - {file_name}')
-            else:
-                self.status_bar.showMessage('SR 파싱 실패')
+        if file_path != self.current_file:
+            return
+        if self._deferred_search == file_path:
+            self._deferred_search = None
+            self.search_text()
         else:
-            self.status_bar.showMessage('파일 로드 실패')
+            self.status_bar.showMessage(f'전체 파싱 완료: {os.path.basename(file_path)} ({node_count}개 항목)')
+    
+    def _release_evicted(self, evicted):
+        """
+        메모리 예산을 넘어 해제된 문서의 트리 뷰도 비워서 노드를 해제합니다 (탭을 선택하면 다시 로드).
+        
+        Args:
+            evicted (list): 해제된 SRDocument 리스트
+        """
+        for document in evicted:
+            self.loader.cancel_completion(document.file_path)
+            evicted_view = self.tree_views.get(document.file_path)
+            if evicted_view is not None:
+                evicted_view.clear()
+            if document.file_path == self.current_file:
+                # 해제된 파서로 검색하지 않도록 검색 대상도 비움
+                self._set_active_document(None)
+    
+    def on_load_failed(self, file_path, message):
+        """
+        파일 로드 또는 파싱 실패 이벤트 핸들러 - 파일의 탭을 닫습니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+            message (str): 오류 메시지
+        """
+        self._loading_file = None
+        self.logger.error(f"파일 로드 실패: {file_path} - {message}")
+        
+        view = self.tree_views.get(file_path)
+        if view is not None:
+            self.close_tab(self.tabs.indexOf(view))
+        self.status_bar.showMessage(f'파일 로드 실패: {message}')
+    
+    def export_document(self, export_format):
+        """
+        현재 탭의 문서를 선택한 형식으로 내보냅니다. 출력 파일은 저장 대화상자로 정합니다.
+        
+        Args:
+            export_format (str): 내보내기 형식 (EXPORT_FORMATS의 형식 이름)
+        """
+        if self.current_file is None or self.sr_parser.get_tree() is None:
+            self.status_bar.showMessage('내보낼 문서가 없습니다. 파일을 연 뒤 다시 시도하세요.')
+            return
+        if self.exporter.is_exporting():
+            self.status_bar.showMessage('이전 내보내기가 끝난 뒤 다시 시도하세요.')
+            return
+        
+        extension = DEFAULT_EXTENSIONS[export_format]
+        base_name = os.path.splitext(os.path.basename(self.current_file))[0]
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, '내보내기', base_name + extension, f'{EXPORT_FORMATS[export_format]} (*{extension})'
+        )
+        if not output_path:
+            return
+        
+        self.exporter.export(self.sr_parser, output_path, export_format, self._payloads.get(self.current_file))
+        self.status_bar.showMessage(f'내보내는 중: {output_path}')
+    
+    def on_export_finished(self, output_path, count):
+        """
+        내보내기 완료 이벤트 핸들러
+        
+        Args:
+            output_path (str): 출력 파일 경로
+            count (int): 기록한 항목 수
+        """
+        self.status_bar.showMessage(f'내보내기 완료: {output_path} ({count}개 항목)')
+    
+    def on_export_failed(self, output_path, message):
+        """
+        내보내기 실패 이벤트 핸들러
+        
+        Args:
+            output_path (str): 출력 파일 경로
+            message (str): 오류 메시지
+        """
+        self.logger.error(f"내보내기 실패: {output_path} - {message}")
+        self.status_bar.showMessage(f'내보내기 실패: {message}')
+    
+    def closeEvent(self, event):
+        """
+        윈도우 종료 이벤트 핸들러 - 진행 중인 로드를 취소하고 작업 스레드와 문서를 정리합니다.
+        
+        Args:
+            event (QCloseEvent): 종료 이벤트
+        """
+        self.loader.shutdown()
+        self.exporter.shutdown()
+        if self.archive_index is not None:
+            self.archive_index.close()
+        for document in self.documents.documents():
+            self.documents.remove(document.file_path)
+        
+        # DICOM_SR_PROFILE_OUTPUT이 지정되어 있으면 프로파일 기록을 저장
+        profile_output = os.environ.get('DICOM_SR_PROFILE_OUTPUT')
+        if profiler.enabled and profile_output:
+            try:
+                profiler.dump(profile_output)
+                self.logger.info(f"프로파일 저장: {profile_output}")
+            except OSError as e:
+                self.logger.error(f"프로파일 저장 실패: {str(e)}")
+        super().closeEvent(event)
+    
+    def on_search_text_changed(self, text):
+        """
+        검색어 변경 이벤트 핸들러 - 입력이 멈출 때까지 검색을 미룹니다.
+        
+        Args:
+            text (str): 입력된 검색어
+        """
+        self.search_timer.start()
+    
+    def live_search(self):
+        """입력이 멈춘 뒤 현재 검색어로 검색합니다. 검색어를 지우면 하이라이트를 해제합니다."""
+        if not self.current_file or self.tree_view is None:
+            return
+        
+        search_term = self.search_input.text().strip()
+        if not search_term:
+            self.tree_view.highlight_search_results([])
+            self.status_bar.showMessage('준비됨')
+        elif len(search_term) >= LIVE_SEARCH_MIN_LENGTH:
+            self.search_text()
     
     def search_text(self):
         """검색 기능 실행"""
+        # 대기 중인 입력 검색은 이 검색으로 대체
+        self.search_timer.stop()
         search_term = self.search_input.text().strip()
         
         if not search_term:
@@ -161,7 +667,14 @@ class DicomSRViewer(QMainWindow):
             self.status_bar.showMessage('먼저 DICOM SR 파일을 로드하세요')
             return
         
+        # 남은 노드를 만드는 중이면 GUI를 멈추지 않도록 트리가 완성된 뒤 검색
+        if not self.sr_parser.is_complete():
+            self._deferred_search = self.current_file
+            self.status_bar.showMessage('전체 파싱이 끝나면 검색합니다...')
+            return
+        
         # 검색 실행
+        search_started = profiler.now()
         search_results = self.sr_searcher.search(search_term)
         
         # 검색 결과 하이라이트
@@ -169,14 +682,17 @@ class DicomSRViewer(QMainWindow):
         
         # 상태 바 업데이트
         result_count = len(search_results)
-        self.status_bar.showMessage(f'검색 결과: {result_count}개 항목 발견')
+        message = f'검색 결과: {result_count}개 항목 발견'
+        if profiler.enabled:
+            message += ' | ' + profiler.format_summary(since=search_started)
+        self.status_bar.showMessage(message)
     
     def show_node_details(self, node_data):
         """
         선택한 노드의 상세 정보 표시
         
         Args:
-            node_data (dict): 노드 데이터
+            node_data (Mapping): 노드 데이터 (SRNode 또는 dict)
         """
         if not node_data:
             return
@@ -190,41 +706,50 @@ class DicomSRViewer(QMainWindow):
         if 'value' in node_data:
             details += f"<p><b>값:</b> {node_data['value']}</p>"
         
+        if 'numeric' in node_data:
+            details += f"<p><b>수치:</b> {node_data['numeric']:g} {node_data.get('UnitCodeValue', '')}</p>"
+        
         if 'relationship' in node_data:
             details += f"<p><b>관계:</b> {node_data['relationship']}</p>"
         
         if 'id' in node_data:
             details += f"<p><b>ID:</b> {node_data['id']}</p>"
-            
+        
+        if 'reference' in node_data:
+            # 참조 대상은 위치 사전에서 바로 찾음 (더블클릭하면 트리에서 이동)
+            target = self.sr_parser.resolve_reference(node_data)
+            target_value = target.get('value', '') if target is not None else '(찾을 수 없음)'
+            details += f"<p><b>참조 대상:</b> {node_data['reference']} - {target_value}</p>"
+        
         if 'NameCodeMeaning' in node_data:
             details += f"<p><b>NameCodeMeaning:</b> {node_data['NameCodeMeaning']}</p>"
-            
+        
         if 'NameCodeValue' in node_data:
             details += f"<p><b>NameCodeValue:</b> {node_data['NameCodeValue']}</p>"
-            
+        
         if 'NameCodingSchemeDesignator' in node_data:
             details += f"<p><b>NameCodingSchemeDesignator:</b> {node_data['NameCodingSchemeDesignator']}</p>"
-            
+        
         if 'CodeMeaning' in node_data:
             details += f"<p><b>CodeMeaning:</b> {node_data['CodeMeaning']}</p>"
-            
+        
         if 'CodeValue' in node_data:
             details += f"<p><b>CodeValue:</b> {node_data['CodeValue']}</p>"
-            
+        
         if 'CodingSchemeDesignator' in node_data:
             details += f"<p><b>CodingSchemeDesignator:</b> {node_data['CodingSchemeDesignator']}</p>"
-            
+        
         if 'UnitCodeMeaning' in node_data:
             details += f"<p><b>UnitCodeMeaning:</b> {node_data['UnitCodeMeaning']}</p>"
-            
+        
         if 'UnitCodeValue' in node_data:
             details += f"<p><b>UnitCodeValue:</b> {node_data['UnitCodeValue']}</p>"
-            
+        
         if 'UnitCodingSchemeDesignator' in node_data:
             details += f"<p><b>UnitCodingSchemeDesignator:</b> {node_data['UnitCodingSchemeDesignator']}</p>"
         
-        # 자식 노드 수 표시
-        children_count = len(node_data.get('children', []))
+        # 자식 노드 수 표시 (아직 만들지 않은 자식 노드 포함)
+        children_count = self.sr_parser.child_count(node_data)
         details += f"<p><b>자식 노드:</b> {children_count}개</p>"
         
         # 상세 정보 패널 업데이트
@@ -232,10 +757,23 @@ class DicomSRViewer(QMainWindow):
         self.detail_content.setTextFormat(Qt.RichText)
 
 def main():
-    """애플리케이션 메인 함수"""
+    """
+    애플리케이션 메인 함수
+    
+    명령줄 인자로 받은 파일을 열며, '-'이면 표준 입력의 DICOM 데이터를 엽니다.
+    """
     app = QApplication(sys.argv)
     viewer = DicomSRViewer()
     viewer.show()
+    for file_path in app.arguments()[1:]:
+        if file_path == '-':
+            viewer.open_bytes(sys.stdin.buffer.read(), 'stdin')
+        else:
+            viewer.load_file(file_path)
+    viewer.logger.info(f"창 표시까지 {(time.perf_counter() - START_TIME) * 1000:.0f} ms")
+    
+    # 창을 먼저 표시한 뒤 pydicom을 백그라운드에서 임포트하여 첫 파일 로드를 빠르게 함
+    QTimer.singleShot(0, lambda: threading.Thread(target=preload_dependencies, daemon=True).start())
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
@@ -0,0 +1,496 @@
+"""
+아카이브 인덱스 모듈
+여러 SR 문서의 콘텐츠 아이템을 SQLite FTS5 전문 검색 데이터베이스에 저장하고,
+문서를 열지 않고도 아카이브 전체에서 소견이나 코드를 포함하는 문서와 아이템을 찾습니다.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+
+from models.parse_cache import HASH_CHUNK_SIZE
+from models.sr_tree import format_path
+
+# 데이터베이스 형식 버전 (스키마나 색인하는 노드 값 형식이 바뀌면 올려서 다시 만들도록 함)
+ARCHIVE_FORMAT_VERSION = 6
+
+# 검색 결과 기본 최대 개수
+DEFAULT_QUERY_LIMIT = 100
+
+# 검색어를 FTS5 단어로 나눌 때 사용하는 패턴 (unicode61 토크나이저와 같은 단어 단위)
+QUERY_TOKEN_PATTERN = re.compile(r'\w+')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    sop_instance_uid TEXT,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT,
+    item_count INTEGER NOT NULL,
+    indexed_at REAL NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_uid ON documents(sop_instance_uid);
+
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    doc_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    item_index INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    type TEXT,
+    relationship TEXT,
+    value TEXT,
+    numeric REAL,
+    unit TEXT,
+    name_code TEXT,
+    name_scheme TEXT,
+    name_meaning TEXT,
+    concept_code TEXT,
+    concept_scheme TEXT,
+    concept_meaning TEXT
+);
+CREATE INDEX IF NOT EXISTS items_doc ON items(doc_id, item_index);
+CREATE INDEX IF NOT EXISTS items_name_code ON items(name_code);
+CREATE INDEX IF NOT EXISTS items_concept_code ON items(concept_code);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    value, name_meaning, concept_meaning,
+    content='items', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts(rowid, value, name_meaning, concept_meaning)
+    VALUES (new.id, new.value, new.name_meaning, new.concept_meaning);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, value, name_meaning, concept_meaning)
+    VALUES ('delete', old.id, old.value, old.name_meaning, old.concept_meaning);
+END;
+'''
+
+# items 테이블에 넣는 아이템 행의 열 (document_rows가 이 순서로 만듦)
+ITEM_COLUMNS = ('item_index', 'path', 'depth', 'type', 'relationship', 'value', 'numeric', 'unit',
+                'name_code', 'name_scheme', 'name_meaning',
+                'concept_code', 'concept_scheme', 'concept_meaning')
+
+def default_archive_path():
+    """
+    기본 아카이브 인덱스 데이터베이스 경로를 반환합니다 ($XDG_CACHE_HOME 또는 ~/.cache 아래).
+    
+    Returns:
+        str: 데이터베이스 파일 경로
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'dicom_sr_viewer', 'archive_index.sqlite')
+
+def document_rows(walk):
+    """
+    트리 순회 결과를 items 테이블 행으로 변환합니다.
+    
+    작업 프로세스에서 만들어 주 프로세스로 보낼 수 있도록 기본 타입 튜플만 사용합니다.
+    
+    Args:
+        walk (iterable): walk_tree() 또는 iter_nodes() 형식의 (path, depth, node) 스트림
+    
+    Returns:
+        list: ITEM_COLUMNS 순서의 튜플 리스트
+    """
+    rows = []
+    for item_index, (path, depth, node) in enumerate(walk):
+        rows.append((
+            item_index, format_path(path), depth,
+            node.get('type'), node.get('relationship'), node.get('value'), node.get('numeric'),
+            node.get('UnitCodeValue'),
+            node.get('NameCodeValue'), node.get('NameCodingSchemeDesignator'), node.get('NameCodeMeaning'),
+            node.get('CodeValue'), node.get('CodingSchemeDesignator'), node.get('CodeMeaning'),
+        ))
+    return rows
+
+def fts_query(text, prefix=False):
+    """
+    사용자 검색어를 FTS5 MATCH 식으로 변환합니다. 모든 단어를 포함하는 아이템을 찾습니다.
+    
+    단어마다 따옴표로 감싸므로 검색어에 FTS5 연산자나 특수 문자가 있어도 오류가 나지 않습니다.
+    
+    Args:
+        text (str): 검색어
+        prefix (bool, optional): 각 단어로 시작하는 단어도 찾을지 여부
+    
+    Returns:
+        str: MATCH 식 또는 None (검색할 단어가 없는 경우)
+    """
+    tokens = QUERY_TOKEN_PATTERN.findall(text)
+    if not tokens:
+        return None
+    suffix = '*' if prefix else ''
+    return ' '.join(f'"{token}"{suffix}' for token in tokens)
+
+class ArchiveIndex:
+    """
+    SR 아카이브 전문 검색 인덱스
+    
+    문서마다 파일 경로, SOPInstanceUID, 파일 크기와 수정 시각을 기록하고, 콘텐츠 아이템마다
+    값 문자열, 코드, 수치, 관계와 트리 위치(path, 예: "1.2.3")를 저장합니다.
+    값 문자열과 코드 의미는 FTS5 색인으로 검색하고 코드 값은 일반 인덱스로 찾습니다.
+    파일이 바뀌지 않았으면(크기와 수정 시각이 같으면) 다시 색인하지 않습니다.
+    파싱에 실패한 파일(SR이 아닌 DICOM 등)도 아이템 없이 오류 메시지와 함께 기록하여,
+    파일이 바뀌기 전까지는 다시 파싱하지 않습니다.
+    """
+    
+    def __init__(self, db_path=None):
+        """
+        ArchiveIndex 클래스 초기화
+        
+        Args:
+            db_path (str, optional): 데이터베이스 파일 경로 (기본값: default_archive_path())
+        """
+        self.logger = logging.getLogger('ArchiveIndex')
+        self.db_path = db_path or default_archive_path()
+        
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('PRAGMA foreign_keys=ON')
+        
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        if version not in (0, ARCHIVE_FORMAT_VERSION):
+            self.logger.info(f"아카이브 인덱스 형식이 바뀌어 다시 만듭니다: {version} → {ARCHIVE_FORMAT_VERSION}")
+            self.connection.executescript(
+                'DROP TABLE IF EXISTS items_fts; DROP TABLE IF EXISTS items; DROP TABLE IF EXISTS documents;')
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f'PRAGMA user_version={ARCHIVE_FORMAT_VERSION}')
+        self.connection.commit()
+    
+    def close(self):
+        """데이터베이스 연결을 닫습니다."""
+        self.connection.close()
+    
+    @staticmethod
+    def fingerprint(file_path, use_hash=False):
+        """
+        파일 지문(크기, 수정 시각, 내용 해시)을 계산합니다.
+        
+        Args:
+            file_path (str): 파일 경로
+            use_hash (bool, optional): 내용 해시도 계산할지 여부 (파일 전체를 읽음)
+        
+        Returns:
+            tuple: (크기, 수정 시각(ns), 내용 해시 또는 None) 또는 None (파일을 읽을 수 없는 경우)
+        """
+        try:
+            stat = os.stat(file_path)
+            content_hash = None
+            if use_hash:
+                digest = hashlib.blake2b(digest_size=20)
+                with open(file_path, 'rb') as fp:
+                    for chunk in iter(lambda: fp.read(HASH_CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                content_hash = digest.hexdigest()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns, content_hash
+    
+    def is_current(self, file_path, fingerprint):
+        """
+        파일이 바뀌지 않아 다시 색인할 필요가 없는지 확인합니다.
+        
+        Args:
+            file_path (str): 파일 경로
+            fingerprint (tuple): fingerprint()의 반환값
+        
+        Returns:
+            bool: 같은 지문으로 색인되어 있으면 True
+        """
+        row = self.connection.execute('SELECT size, mtime_ns FROM documents WHERE path = ?',
+                                      (os.path.abspath(file_path),)).fetchone()
+        return row is not None and tuple(row) == tuple(fingerprint[:2])
+    
+    def documents_under(self, roots):
+        """
+        경로 아래에 색인된 문서의 지문을 반환합니다.
+        
+        Args:
+            roots (list): 파일 또는 디렉터리 경로 리스트
+        
+        Returns:
+            dict: 파일 경로 → (크기, 수정 시각(ns), 내용 해시 또는 None, 실패한 경우 오류 메시지 또는 None)
+        """
+        documents = {}
+        for root in roots:
+            root = os.path.abspath(root)
+            prefix = os.path.join(root, '')
+            rows = self.connection.execute(
+                'SELECT path, size, mtime_ns, content_hash, error FROM documents '
+                'WHERE path = ? OR substr(path, 1, ?) = ?', (root, len(prefix), prefix))
+            for path, size, mtime_ns, content_hash, error in rows:
+                documents[path] = (size, mtime_ns, content_hash, error)
+        return documents
+    
+    def plan_sync(self, file_paths, roots, use_hash=False):
+        """
+        폴더 동기화에 필요한 작업을 계산합니다.
+        
+        크기와 수정 시각이 같은 파일은 바뀌지 않은 것으로 봅니다. 전에 파싱에 실패한 파일도
+        바뀌지 않았으면 다시 파싱하지 않고 'failed'로 셉니다. use_hash가 True이면
+        크기나 수정 시각만 바뀐 파일의 내용 해시를 비교하여, 내용이 같으면 다시 파싱하지 않고
+        지문만 갱신합니다 (복사나 touch로 수정 시각만 바뀐 경우).
+        
+        Args:
+            file_paths (iterable): 현재 roots 아래에 있는 파일 경로
+            roots (list): 동기화할 파일 또는 디렉터리 경로 (이 아래의 색인된 문서 중 없어진 파일은 삭제 대상)
+            use_hash (bool, optional): 내용 해시로 변경 여부를 확인할지 여부
+        
+        Returns:
+            dict: 'new'/'changed' - 파싱할 (파일 경로, 지문) 리스트,
+                'unchanged' - 바뀌지 않은 파일 수, 'failed' - 바뀌지 않은 파일 중 전에 파싱에 실패한 파일 수,
+                'touched' - 지문만 갱신한 파일 수,
+                'deleted' - 없어진 파일 경로 리스트, 'unreadable' - 읽을 수 없는 파일 경로 리스트
+        """
+        known = self.documents_under(roots)
+        plan = {'new': [], 'changed': [], 'unchanged': 0, 'failed': 0, 'touched': 0, 'deleted': [], 'unreadable': []}
+        
+        for file_path in file_paths:
+            file_path = os.path.abspath(file_path)
+            stored = known.pop(file_path, None)
+            fingerprint = self.fingerprint(file_path)
+            if fingerprint is None:
+                plan['unreadable'].append(file_path)
+                continue
+            
+            if stored is not None and stored[:2] == fingerprint[:2]:
+                plan['unchanged'] += 1
+                plan['failed'] += stored[3] is not None
+                continue
+            
+            if use_hash:
+                fingerprint = self.fingerprint(file_path, use_hash=True)
+                if fingerprint is None:
+                    plan['unreadable'].append(file_path)
+                    continue
+                if stored is not None and stored[2] == fingerprint[2]:
+                    self.update_fingerprint(file_path, fingerprint)
+                    plan['touched'] += 1
+                    continue
+            
+            plan['new' if stored is None else 'changed'].append((file_path, fingerprint))
+        
+        # 남은 항목은 roots 아래에서 더 이상 찾을 수 없는 파일
+        plan['deleted'] = sorted(known)
+        return plan
+    
+    def update_fingerprint(self, file_path, fingerprint):
+        """
+        내용이 바뀌지 않은 문서의 지문만 갱신합니다.
+        
+        Args:
+            file_path (str): 파일 경로
+            fingerprint (tuple): 새 파일 지문
+        """
+        with self.connection:
+            self.connection.execute('UPDATE documents SET size = ?, mtime_ns = ?, content_hash = ? WHERE path = ?',
+                                    tuple(fingerprint) + (os.path.abspath(file_path),))
+    
+    def add_document(self, file_path, fingerprint, sop_instance_uid, rows, error=None):
+        """
+        문서의 아이템 행을 저장합니다. 이미 색인된 문서는 기존 아이템을 교체합니다.
+        
+        Args:
+            file_path (str): 파일 경로
+            fingerprint (tuple): 색인할 때의 파일 지문 (크기, 수정 시각(ns), 내용 해시 또는 None)
+            sop_instance_uid (str): SOPInstanceUID
+            rows (list): document_rows()로 만든 아이템 행
+            error (str, optional): 파싱 실패 메시지 (지정하면 아이템 없이 실패한 파일로 기록)
+        """
+        path = os.path.abspath(file_path)
+        size, mtime_ns, content_hash = fingerprint
+        with self.connection:
+            self.connection.execute('DELETE FROM documents WHERE path = ?', (path,))
+            cursor = self.connection.execute(
+                'INSERT INTO documents (path, sop_instance_uid, size, mtime_ns, content_hash, item_count, indexed_at, '
+                'error) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (path, sop_instance_uid, size, mtime_ns, content_hash, len(rows), time.time(), error))
+            doc_id = cursor.lastrowid
+            placeholders = ', '.join('?' * (len(ITEM_COLUMNS) + 1))
+            self.connection.executemany(
+                f'INSERT INTO items (doc_id, {", ".join(ITEM_COLUMNS)}) VALUES ({placeholders})',
+                ((doc_id,) + row for row in rows))
+    
+    def index_file(self, file_path, sr_parser):
+        """
+        파일 하나를 파싱하여 색인합니다. 바뀌지 않은 파일은 전에 실패한 파일이라도 건너뜁니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+            sr_parser (DicomSRParser): 파일을 읽을 파서
+        
+        Returns:
+            str: 'indexed', 'unchanged' 또는 'failed'
+        """
+        fingerprint = self.fingerprint(file_path)
+        if fingerprint is None:
+            return 'failed'
+        if self.is_current(file_path, fingerprint):
+            return 'unchanged'
+        
+        try:
+            if not sr_parser.load_file(file_path):
+                error = 'DICOM 파일을 읽을 수 없습니다'
+            else:
+                # 트리를 따로 만들지 않고 파싱 스트림에서 바로 행을 만듦
+                rows = document_rows(sr_parser.iter_nodes())
+                if sr_parser.get_tree() is not None:
+                    self.add_document(file_path, fingerprint, sr_parser.sop_instance_uid, rows)
+                    return 'indexed'
+                error = 'SR 파싱 실패'
+        except Exception as e:
+            self.logger.error(f"색인 실패: {file_path} - {str(e)}")
+            error = str(e)
+        finally:
+            sr_parser.close()
+        
+        self.add_document(file_path, fingerprint, None, [], error=error)
+        return 'failed'
+    
+    def remove(self, file_paths):
+        """
+        문서를 인덱스에서 삭제합니다 (아이템과 전문 검색 색인도 함께 삭제).
+        
+        Args:
+            file_paths (str or list): 파일 경로 또는 파일 경로 리스트
+        
+        Returns:
+            int: 삭제된 문서 수
+        """
+        if isinstance(file_paths, str):
+            file_paths = [file_paths]
+        with self.connection:
+            cursor = self.connection.executemany('DELETE FROM documents WHERE path = ?',
+                                                 ((os.path.abspath(path),) for path in file_paths))
+        return cursor.rowcount
+    
+    def query(self, text=None, code=None, value_type=None, prefix=False, limit=DEFAULT_QUERY_LIMIT):
+        """
+        조건을 만족하는 콘텐츠 아이템을 찾습니다. 결과는 색인된 순서(문서, 트리 순서)입니다.
+        
+        Args:
+            text (str, optional): 값 문자열이나 코드 의미에 포함될 단어들 (모두 포함)
+            code (str or tuple, optional): 개념 이름 또는 개념 값의 CodeValue,
+                또는 (CodeValue, CodingSchemeDesignator)
+            value_type (str, optional): ValueType (예: 'TEXT', 'NUM')
+            prefix (bool, optional): 검색어의 각 단어로 시작하는 단어도 찾을지 여부
+            limit (int, optional): 최대 결과 수
+        
+        Returns:
+            list: {'file', 'SOPInstanceUID', 'path', 'depth', 'type', 'relationship', 'value',
+                   'numeric', 'unit'} dict 리스트
+        """
+        where, params = self._conditions(text, code, value_type, prefix)
+        if where is None:
+            return []
+        
+        sql = ('SELECT d.path, d.sop_instance_uid, i.path, i.depth, i.type, i.relationship, '
+               'i.value, i.numeric, i.unit '
+               f'{self._from_clause(text)} WHERE {where} ORDER BY i.id LIMIT ?')
+        rows = self.connection.execute(sql, params + [limit]).fetchall()
+        keys = ('file', 'SOPInstanceUID', 'path', 'depth', 'type', 'relationship', 'value', 'numeric', 'unit')
+        return [dict(zip(keys, row)) for row in rows]
+    
+    def query_documents(self, text=None, code=None, value_type=None, prefix=False, limit=DEFAULT_QUERY_LIMIT):
+        """
+        조건을 만족하는 아이템이 있는 문서를 찾습니다 (일치하는 아이템이 많은 문서부터).
+        
+        Args:
+            text (str, optional): 값 문자열이나 코드 의미에 포함될 단어들 (모두 포함)
+            code (str or tuple, optional): CodeValue 또는 (CodeValue, CodingSchemeDesignator)
+            value_type (str, optional): ValueType
+            prefix (bool, optional): 검색어의 각 단어로 시작하는 단어도 찾을지 여부
+            limit (int, optional): 최대 문서 수
+        
+        Returns:
+            list: {'file', 'SOPInstanceUID', 'matches', 'first_path'} dict 리스트
+                (first_path는 문서에서 처음 일치하는 아이템의 트리 위치)
+        """
+        where, params = self._conditions(text, code, value_type, prefix)
+        if where is None:
+            return []
+        
+        # 처음 일치하는 아이템의 위치는 결과 문서에 대해서만 (doc_id, item_index) 인덱스로 찾음
+        sql = ('SELECT m.path, m.uid, m.matches, '
+               '(SELECT f.path FROM items f WHERE f.doc_id = m.doc_id AND f.item_index = m.first_index) '
+               'FROM (SELECT i.doc_id AS doc_id, d.path AS path, d.sop_instance_uid AS uid, '
+               'COUNT(*) AS matches, MIN(i.item_index) AS first_index '
+               f'{self._from_clause(text)} WHERE {where} '
+               'GROUP BY i.doc_id ORDER BY COUNT(*) DESC, d.path LIMIT ?) m '
+               'ORDER BY m.matches DESC, m.path')
+        keys = ('file', 'SOPInstanceUID', 'matches', 'first_path')
+        return [dict(zip(keys, row)) for row in self.connection.execute(sql, params + [limit]).fetchall()]
+    
+    @staticmethod
+    def _from_clause(text):
+        """검색 조건에 맞는 FROM 절을 반환합니다 (텍스트 조건이 있으면 FTS 테이블에서 시작)."""
+        if text:
+            return ('FROM items_fts JOIN items i ON i.id = items_fts.rowid '
+                    'JOIN documents d ON d.id = i.doc_id')
+        return 'FROM items i JOIN documents d ON d.id = i.doc_id'
+    
+    @staticmethod
+    def _conditions(text, code, value_type, prefix):
+        """
+        검색 조건을 WHERE 절과 인자로 변환합니다.
+        
+        Returns:
+            tuple: (WHERE 절 또는 None, 인자 리스트) - 조건이 없거나 검색할 단어가 없으면 None
+        """
+        clauses = []
+        params = []
+        
+        if text:
+            match = fts_query(text, prefix)
+            if match is None:
+                return None, []
+            clauses.append('items_fts MATCH ?')
+            params.append(match)
+        
+        if code:
+            if isinstance(code, str):
+                code = (code,)
+            code_value, *scheme = code
+            if scheme:
+                clauses.append('((i.name_code = ? AND i.name_scheme = ?) OR '
+                               '(i.concept_code = ? AND i.concept_scheme = ?))')
+                params.extend([code_value, scheme[0], code_value, scheme[0]])
+            else:
+                clauses.append('(i.name_code = ? OR i.concept_code = ?)')
+                params.extend([code_value, code_value])
+        
+        if value_type:
+            clauses.append('i.type = ?')
+            params.append(value_type.upper())
+        
+        if not clauses:
+            return None, []
+        return ' AND '.join(clauses), params
+    
+    def stats(self):
+        """
+        인덱스 통계를 반환합니다.
+        
+        Returns:
+            dict: 문서 수, 파싱에 실패하여 아이템 없이 기록된 파일 수, 아이템 수, 데이터베이스 크기(bytes)
+        """
+        documents, failed = self.connection.execute(
+            'SELECT COUNT(*) - COUNT(error), COUNT(error) FROM documents').fetchone()
+        items = self.connection.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+        # WAL 모드에서는 아직 반영되지 않은 변경이 -wal 파일에 있음
+        size = sum(os.path.getsize(path) for path in (self.db_path, self.db_path + '-wal') if os.path.exists(path))
+        return {'documents': documents, 'failed': failed, 'items': items, 'bytes': size}
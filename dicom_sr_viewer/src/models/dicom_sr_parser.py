@@ -3,279 +3,918 @@ DICOM SR 파서 모듈
 DICOM SR(Structured Report) 파일을 파싱하고 트리 구조로 변환하는 기능을 제공합니다.
 """
 
-import pydicom
-from pydicom.dataset import Dataset
+from array import array
+import io
+import mmap
+import os
+import threading
+import time
 import logging
 
+from models.parse_cache import flatten_document, restore_document
+from models.profiling import profiler
+from models.measurements import MeasurementStore
+from models.search_index import AttributeIndex, TextIndex
+from models.sr_extractor import ContentItemExtractor, text_encoding
+from models.sr_tree import CodeTable, SRNode, format_path, parse_path
+
+# 지연 로딩 시 이 크기(bytes)보다 큰 최상위 값은 접근할 때까지 읽지 않음
+LAZY_DEFER_SIZE = 64 * 1024
+
+# 최상위 ContentSequence (0040,A730) 태그
+CONTENT_SEQUENCE_TAG = 0x0040A730
+
+# 읽기 진행 콜백을 호출하는 최소 간격 (bytes)
+PROGRESS_INTERVAL = 1024 * 1024
+
+# iter_remaining이 잠금을 한 번 잡고 만드는 최대 자식 노드 수 (그동안 펼치기는 기다림)
+REMAINING_BATCH_SIZE = 256
+
+def preload_dependencies():
+    """
+    pydicom을 미리 임포트합니다.
+    
+    pydicom(과 numpy)은 임포트에 수백 ms가 걸리므로 이 모듈은 파일을 처음 로드할 때 임포트합니다.
+    첫 로드 지연을 없애려면 창을 표시한 뒤 백그라운드 스레드에서 이 함수를 호출합니다.
+    """
+    import pydicom.filereader
+
+def _after_content_sequence(tag, vr, length):
+    """ContentSequence 이후의 최상위 요소(EncapsulatedDocument, Waveform, PixelData 등)에서 읽기를 멈춥니다."""
+    return tag > CONTENT_SEQUENCE_TAG
+
+def count_content_items(items):
+    """
+    콘텐츠 아이템과 그 아래의 모든 콘텐츠 아이템 수를 노드를 만들지 않고 셉니다.
+    
+    Args:
+        items (iterable): pydicom ContentItem Dataset
+    
+    Returns:
+        int: 콘텐츠 아이템 수
+    """
+    count = 0
+    stack = list(items)
+    while stack:
+        item = stack.pop()
+        count += 1
+        children = item.get(CONTENT_SEQUENCE_TAG)
+        if children is not None:
+            stack.extend(children.value)
+    return count
+
+def walk_tree(root):
+    """
+    트리를 명시적 스택으로 전위 순회합니다.
+    
+    Args:
+        root (dict): 시작 노드
+    
+    Yields:
+        tuple: (path, depth, node) - iter_nodes와 같은 형식
+    """
+    stack = [(root, (1,))]
+    while stack:
+        node, path = stack.pop()
+        yield path, len(path) - 1, node
+        
+        children = node.get('children', [])
+        for i in range(len(children) - 1, -1, -1):
+            stack.append((children[i], path + (i + 1,)))
+
+class _ProgressFile(io.BufferedReader):
+    """
+    읽은 위치를 진행 콜백으로 알려주는 파일 객체
+    
+    io.BufferedReader를 상속하므로 pydicom은 일반 파일과 같이 취급하여
+    지연된 값을 파일 경로로 다시 열어서 읽습니다.
+    """
+    
+    def __init__(self, file_path, progress):
+        """
+        _ProgressFile 클래스 초기화
+        
+        Args:
+            file_path (str): 파일 경로
+            progress (callable): progress(읽은 bytes, 전체 bytes) 형식의 콜백
+        """
+        super().__init__(io.FileIO(file_path, 'rb'))
+        self._progress = progress
+        self._total = os.fstat(self.fileno()).st_size
+        self._reported = 0
+    
+    def read(self, size=-1):
+        data = super().read(size)
+        position = self.tell()
+        if position - self._reported >= PROGRESS_INTERVAL:
+            self._reported = position
+            self._progress(position, self._total)
+        return data
+
+class _BufferFile(io.RawIOBase):
+    """
+    bytes, memoryview 등 버퍼 객체를 복사하지 않고 읽는 파일 객체
+    
+    pydicom이 요청하는 크기만큼만 잘라서 bytes로 돌려주므로 전체 버퍼를 다시 복사하지 않습니다.
+    name 속성이 없으므로 pydicom은 지연된 값도 이 객체에서 읽습니다.
+    """
+    
+    def __init__(self, data, progress=None):
+        """
+        _BufferFile 클래스 초기화
+        
+        Args:
+            data (bytes-like): 버퍼 프로토콜을 지원하는 객체 (bytes, bytearray, memoryview, mmap 등)
+            progress (callable, optional): progress(읽은 bytes, 전체 bytes) 형식의 읽기 진행 콜백
+        """
+        super().__init__()
+        self._view = memoryview(data).cast('B')
+        self._position = 0
+        self._progress = progress
+        self._reported = 0
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self._position
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+    
+    def read(self, size=-1):
+        start = self._position
+        end = len(self._view) if size is None or size < 0 else min(start + size, len(self._view))
+        self._position = max(start, end)
+        if self._progress is not None and self._position - self._reported >= PROGRESS_INTERVAL:
+            self._reported = self._position
+            self._progress(self._position, len(self._view))
+        return self._view[start:end].tobytes()
+    
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+    
+    def close(self):
+        self._view.release()
+        super().close()
+
 class DicomSRParser:
     """DICOM SR 파일을 파싱하고 트리 구조로 변환하는 클래스"""
     
-    def __init__(self):
-        """DicomSRParser 클래스 초기화"""
+    def __init__(self, lazy=False, use_mmap=False, build_index=True, cache=None,
+                 parse_depth=None, parse_breadth=None):
+        """
+        DicomSRParser 클래스 초기화
+        
+        Args:
+            lazy (bool, optional): 지연 로딩 모드 사용 여부
+            use_mmap (bool, optional): 지연 로딩 시 메모리 매핑 파일 사용 여부
+            build_index (bool, optional): 파싱 후 검색 인덱스 생성 여부 (검색하지 않는 일괄 처리에서는 False)
+            cache (ParseCache, optional): 파싱 결과 디스크 캐시
+            parse_depth (int, optional): iter_nodes()가 만드는 최대 깊이 (루트가 0, None이면 제한 없음).
+                더 깊은 서브트리는 expand() 또는 iter_remaining()에서 만듭니다.
+            parse_breadth (int, optional): iter_nodes()가 노드마다 만드는 최대 자식 노드 수 (None이면 제한 없음)
+        """
         self.logger = logging.getLogger('DicomSRParser')
         self.dataset = None
         self.tree = None
+        self.nodes = []
+        # 콘텐츠 아이템 위치 문자열(노드 ID) → 노드
+        self.path_index = {}
+        # 노드 번호 → 부모 노드 번호 (루트는 -1)
+        self.parents = array('i')
+        self.codes = CodeTable()
+        self.text_index = None
+        self.attribute_index = None
+        self.measurements = None
+        self.lazy = lazy
+        self.use_mmap = use_mmap
+        self.build_index = build_index
+        self.cache = cache
+        self.parse_depth = parse_depth
+        self.parse_breadth = parse_breadth
+        self.file_path = None
+        self.sop_instance_uid = None
+        # 마지막 로드가 캐시 적중이었는지 여부 (적중 시 dataset은 None)
+        self.from_cache = False
+        self._fingerprint = None
+        self._file = None
+        self._mmap = None
+        # load_bytes/load_stream으로 읽은 데이터 (지연된 값을 읽을 수 있도록 close()까지 유지)
+        self._stream = None
+        # 깊이/너비 제한 파싱에서 자식 노드를 아직 다 만들지 않은 노드 → (ContentSequence, 위치 튜플)
+        # 노드의 children은 항상 ContentSequence 앞부분의 자식 노드
+        self._pending = {}
+        # 남은 서브트리를 만드는 데 사용하는 콘텐츠 아이템 추출기 (트리가 완성되면 None)
+        self._extractor = None
+        # iter_nodes가 끝났지만 아직 만들지 않은 서브트리가 있는지 여부
+        self._partial = False
+        # 깊이/너비 제한 파싱에서 아직 만들지 않은 아이템까지 포함한 콘텐츠 아이템 수 (완성된 트리는 0)
+        self._item_count = 0
+        # 펼치기(GUI 스레드)와 남은 서브트리 파싱(작업 스레드)이 트리를 함께 바꾸지 않도록 보호
+        self._lock = threading.RLock()
     
-    def load_file(self, file_path):
+    def load_file(self, file_path, lazy=None, use_mmap=None, progress=None):
         """
         DICOM SR 파일을 로드합니다.
         
+        지연 로딩 모드에서는 ContentSequence 트리에 필요한 요소까지만 읽고,
+        LAZY_DEFER_SIZE보다 큰 값은 실제로 접근할 때까지 읽지 않습니다.
+        
+        캐시가 설정되어 있고 파일이 바뀌지 않았으면 파일을 읽지 않고 캐시된 트리를 복원합니다.
+        이 경우 dataset은 None이며 parse_sr()/iter_nodes()는 복원된 트리를 그대로 반환합니다.
+        
         Args:
             file_path (str): DICOM SR 파일 경로
-            
+            lazy (bool, optional): 지연 로딩 모드 사용 여부 (기본값: 생성자 설정)
+            use_mmap (bool, optional): 메모리 매핑 파일 사용 여부 (기본값: 생성자 설정)
+            progress (callable, optional): progress(읽은 bytes, 전체 bytes) 형식의 읽기 진행 콜백
+                (메모리 매핑 파일은 읽기 단계가 없으므로 호출되지 않음).
+                콜백에서 예외를 발생시키면 로드를 중단하고 False를 반환합니다.
+        
         Returns:
             bool: 파일 로드 성공 여부
         """
+        lazy = self.lazy if lazy is None else lazy
+        use_mmap = self.use_mmap if use_mmap is None else use_mmap
+        
+        self.close()
+        self.file_path = file_path
+        self.sop_instance_uid = None
+        self.from_cache = False
+        self._fingerprint = None
+        self._partial = False
+        self._item_count = 0
+        
+        if self.cache is not None:
+            # 파일을 읽기 전에 지문을 계산해 두어야 읽는 도중 바뀐 파일을 캐시에 저장하지 않음
+            with profiler.span('cache.lookup') as span:
+                self._fingerprint = self.cache.fingerprint(file_path)
+                document = self.cache.get(file_path, self._fingerprint)
+                if document is not None:
+                    self._restore(document)
+                    span.count('hits')
+                    span.count('items', len(self.nodes))
+            if document is not None:
+                self.logger.info(f"캐시에서 DICOM SR 로드: {file_path}")
+                return True
+        
         try:
-            self.dataset = pydicom.dcmread(file_path)
+            # pydicom은 임포트 비용이 크므로 처음 로드할 때 임포트
+            import pydicom
+            
+            with profiler.span('dcmread') as span:
+                if lazy:
+                    self.dataset = self._read_lazy(file_path, use_mmap, progress)
+                elif progress is not None:
+                    with _ProgressFile(file_path, progress) as fp:
+                        self.dataset = pydicom.dcmread(fp)
+                else:
+                    self.dataset = pydicom.dcmread(file_path)
+                if profiler.enabled:
+                    span.count('bytes', os.path.getsize(file_path))
+            self.sop_instance_uid = str(self.dataset.get('SOPInstanceUID', ''))
             self.logger.info(f"DICOM 파일 로드 성공: {file_path}")
             return True
         except Exception as e:
+            self.close()
             self.logger.error(f"DICOM 파일 로드 실패: {e}")
             return False
     
+    def load_bytes(self, data, name=None, lazy=None, progress=None):
+        """
+        메모리에 있는 DICOM SR 데이터를 로드합니다 (메시지 큐나 HTTP로 받은 SR 등).
+        
+        bytes, bytearray, memoryview처럼 버퍼 프로토콜을 지원하는 객체를 임시 파일이나
+        전체 복사 없이 그대로 읽습니다. 디스크 캐시는 사용하지 않습니다.
+        지연 로딩 모드에서 지연된 값은 data에서 읽으므로 close()할 때까지 data를 바꾸지 않아야 합니다.
+        
+        Args:
+            data (bytes-like): DICOM 파일 내용
+            name (str, optional): 로그와 file_path에 사용할 이름 (기본값: '<memory>')
+            lazy (bool, optional): 지연 로딩 모드 사용 여부 (기본값: 생성자 설정)
+            progress (callable, optional): progress(읽은 bytes, 전체 bytes) 형식의 읽기 진행 콜백
+                (load_file과 같이 콜백에서 예외를 발생시키면 로드를 중단)
+        
+        Returns:
+            bool: 로드 성공 여부
+        """
+        try:
+            stream = _BufferFile(data, progress)
+        except TypeError as e:
+            self.close()
+            self.logger.error(f"DICOM 데이터를 읽을 수 없습니다: {e}")
+            return False
+        return self._load_stream(stream, name or '<memory>', lazy, owned=True)
+    
+    def load_stream(self, stream, name=None, lazy=None):
+        """
+        읽기 가능한 바이너리 파일 객체에서 DICOM SR 데이터를 로드합니다.
+        
+        탐색(seek)할 수 있는 스트림은 그대로 읽고, 소켓이나 HTTP 응답처럼 탐색할 수 없는
+        스트림은 끝까지 읽은 뒤 메모리에서 읽습니다. 스트림은 닫지 않으며, 지연 로딩 모드에서는
+        지연된 값을 스트림에서 읽으므로 close()할 때까지 스트림을 열어 두어야 합니다.
+        디스크 캐시는 사용하지 않습니다.
+        
+        Args:
+            stream: read()를 지원하는 바이너리 파일 객체
+            name (str, optional): 로그와 file_path에 사용할 이름 (기본값: 스트림의 name 속성 또는 '<stream>')
+            lazy (bool, optional): 지연 로딩 모드 사용 여부 (기본값: 생성자 설정)
+        
+        Returns:
+            bool: 로드 성공 여부
+        """
+        name = name or getattr(stream, 'name', None) or '<stream>'
+        try:
+            seekable = stream.seekable()
+        except (AttributeError, OSError, ValueError):
+            seekable = False
+        
+        if seekable:
+            return self._load_stream(stream, str(name), lazy, owned=False)
+        
+        try:
+            data = stream.read()
+        except Exception as e:
+            self.close()
+            self.logger.error(f"DICOM 스트림 읽기 실패: {e}")
+            return False
+        return self._load_stream(_BufferFile(data), str(name), lazy, owned=True)
+    
+    def _load_stream(self, stream, name, lazy, owned):
+        """
+        파일 객체에서 데이터셋을 읽습니다 (load_bytes와 load_stream의 공통 부분).
+        
+        Args:
+            stream: 탐색할 수 있는 바이너리 파일 객체
+            name (str): 로그와 file_path에 사용할 이름
+            lazy (bool): 지연 로딩 모드 사용 여부 (None이면 생성자 설정)
+            owned (bool): close()에서 스트림을 닫을지 여부 (이 파서가 만든 스트림이면 True)
+        
+        Returns:
+            bool: 로드 성공 여부
+        """
+        lazy = self.lazy if lazy is None else lazy
+        
+        self.close()
+        self.file_path = name
+        self.sop_instance_uid = None
+        self.from_cache = False
+        self._fingerprint = None
+        self._partial = False
+        self._item_count = 0
+        self._stream = (stream, owned)
+        
+        try:
+            import pydicom
+            from pydicom.filereader import read_partial
+            
+            with profiler.span('dcmread') as span:
+                start = stream.tell()
+                if lazy:
+                    self.dataset = read_partial(stream, _after_content_sequence, defer_size=LAZY_DEFER_SIZE)
+                    # 스트림의 name이 실제 파일이 아닐 수 있으므로(예: '<stdin>') 지연된 값은 스트림에서 읽음
+                    self.dataset.buffer = stream
+                else:
+                    self.dataset = pydicom.dcmread(stream)
+                if profiler.enabled:
+                    span.count('bytes', stream.tell() - start)
+            self.sop_instance_uid = str(self.dataset.get('SOPInstanceUID', ''))
+            self.logger.info(f"DICOM 데이터 로드 성공: {name}")
+            return True
+        except Exception as e:
+            self.close()
+            self.logger.error(f"DICOM 데이터 로드 실패: {e}")
+            return False
+    
+    def _read_lazy(self, file_path, use_mmap, progress=None):
+        """
+        지연 로딩 모드로 DICOM 파일을 읽습니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+            use_mmap (bool): 메모리 매핑 파일 사용 여부
+            progress (callable, optional): 읽기 진행 콜백 (메모리 매핑 파일에서는 사용하지 않음)
+        
+        Returns:
+            FileDataset: ContentSequence까지 읽은 데이터셋
+        """
+        from pydicom.filereader import read_partial
+        
+        if not use_mmap:
+            fp = open(file_path, 'rb') if progress is None else _ProgressFile(file_path, progress)
+            with fp:
+                dataset = read_partial(fp, _after_content_sequence, defer_size=LAZY_DEFER_SIZE)
+            # 지연된 값은 파일 경로로 다시 열어서 읽음
+            dataset.filename = file_path
+            return dataset
+        
+        # 지연된 값을 읽을 수 있도록 매핑은 다음 로드 또는 close()까지 유지
+        self._file = open(file_path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return read_partial(self._mmap, _after_content_sequence, defer_size=LAZY_DEFER_SIZE)
+    
+    def _restore(self, document):
+        """
+        캐시된 평면 문서 구조에서 트리와 검색 인덱스를 복원합니다.
+        
+        Args:
+            document (dict): flatten_document 형식의 평면 문서 구조
+        """
+        self.tree, self.nodes, self.codes = restore_document(document)
+        self.path_index = {node.id: node for node in self.nodes}
+        self.parents = document['parents']
+        self.sop_instance_uid = document['sop_instance_uid']
+        self.text_index = document['text_index']
+        self.attribute_index = document['attribute_index']
+        self.measurements = document['measurements']
+        if self.build_index and (self.text_index is None or self.attribute_index is None
+                                 or self.measurements is None):
+            self._build_indexes()
+        self.from_cache = True
+    
+    def close(self):
+        """로드된 데이터셋, 열린 메모리 매핑 파일과 load_bytes로 만든 스트림을 해제합니다."""
+        with self._lock:
+            # 남은 서브트리는 더 이상 만들 수 없음 (iter_remaining도 트리를 완성하지 않고 끝남)
+            self._pending = {}
+            self._extractor = None
+        self.dataset = None
+        if self._stream is not None:
+            stream, owned = self._stream
+            self._stream = None
+            if owned:
+                stream.close()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def release(self):
+        """
+        close()에 더해 파싱된 트리, 노드, 위치 사전, 코드 사전, 검색 인덱스와 측정값 저장소도 해제합니다.
+        
+        파서 객체를 계속 참조하는 곳이 있어도 문서 메모리가 해제되며, 다시 사용하려면 파일을 다시 로드해야 합니다.
+        """
+        self.close()
+        with self._lock:
+            self.tree = None
+            self.nodes = []
+            self.path_index = {}
+            self.parents = array('i')
+            self.codes = CodeTable()
+            self.text_index = None
+            self.attribute_index = None
+            self.measurements = None
+            self._partial = False
+            self._item_count = 0
+    
     def parse_sr(self):
         """
         로드된 DICOM SR 파일을 파싱하여 트리 구조로 변환합니다.
         
+        parse_depth/parse_breadth가 설정되어 있으면 제한 안의 노드만 만들며,
+        나머지는 expand() 또는 finish_parse()로 만듭니다.
+        
         Returns:
-            dict: 트리 구조로 변환된 DICOM SR 데이터
+            SRNode: 트리 구조로 변환된 DICOM SR 데이터 (dict 호환 루트 노드)
         """
-        if self.dataset is None:
+        if self.dataset is None and not self.from_cache:
             self.logger.error("파싱할 DICOM 데이터가 없습니다. 먼저 파일을 로드하세요.")
             return None
         
         try:
-            # Content Sequence가 있는지 확인
-            if hasattr(self.dataset, 'ContentSequence'):
-                if len(self.dataset.ContentSequence) > 0:
-                    # 첫 번째 ContentItem을 루트 노드로 사용
-                    root_node = self._create_node_from_content_item(self.dataset.ContentSequence[0], 0)
-                    if isinstance(root_node, list):
-                        root_node = root_node[0]
-                    
-                    # 루트 노드의 ContentSequence가 있는 경우 파싱
-                    if hasattr(self.dataset.ContentSequence[0], 'ContentSequence'):
-                        self._parse_content_sequence(self.dataset.ContentSequence[0].ContentSequence, root_node['children'])
-                    
-                    self.tree = root_node
-                    return self.tree
-                else:
-                    self.logger.warning("ContentSequence가 비어있습니다.")
-                    return None
-            else:
-                self.logger.warning("ContentSequence를 찾을 수 없습니다. SR 문서가 아닐 수 있습니다.")
-                return None
-                
+            # iter_nodes가 노드를 부모의 children에 연결하므로 스트림을 끝까지 소비하면 트리가 완성됨
+            for _ in self.iter_nodes():
+                pass
+            return self.tree
+        
         except Exception as e:
             self.logger.error(f"SR 파싱 중 오류 발생: {e}")
             return None
     
-    def _parse_content_sequence(self, content_sequence, parent_children):
+    def iter_nodes(self):
         """
-        ContentSequence를 재귀적으로 파싱하여 트리 구조를 생성합니다.
+        로드된 DICOM SR 파일을 전위 순회하면서 노드를 하나씩 생성합니다.
+        
+        재귀 대신 명시적 스택을 사용하므로 중첩 깊이에 제한이 없습니다.
+        생성된 노드는 즉시 부모 노드의 children에 추가되며, 순회가 끝나면
+        self.tree에 루트 노드가, self.nodes에 파싱 순서대로 모든 노드가 저장됩니다.
+        노드 ID는 콘텐츠 아이템 위치 문자열(예: "1.2.3")이며, 노드를 만들 때마다
+        위치 → 노드 사전(self.path_index)과 부모 노드 번호 배열(self.parents)에 등록합니다.
+        노드의 코드 정보는 문서마다 새로 만드는 self.codes 코드 사전에 등록되며,
+        순회가 끝난 뒤 검색 인덱스(self.text_index, self.attribute_index)와 NUM 측정값 저장소
+        (self.measurements)를 만듭니다 (build_index가 True인 경우).
+        캐시가 설정되어 있고 파일에서 로드했으면 완성된 트리와 인덱스를 캐시에 저장합니다.
+        
+        parse_depth/parse_breadth가 설정되어 있으면 깊이가 parse_depth인 노드의 자식과 노드마다
+        parse_breadth개 이후의 자식은 만들지 않고 pydicom ContentSequence만 기억해 둡니다.
+        이 경우 검색 인덱스와 캐시는 iter_remaining()이 트리를 완성한 뒤에 만듭니다.
+        
+        Yields:
+            tuple: (path, depth, node) - path는 1부터 시작하는 콘텐츠 아이템 위치 튜플,
+                depth는 루트를 0으로 하는 깊이, node는 SRNode
+        """
+        if self.from_cache:
+            # 캐시에서 복원한 트리는 이미 완성되어 있으므로 순회만 함
+            if self.tree is not None:
+                yield from walk_tree(self.tree)
+            return
+        
+        self.tree = None
+        self.nodes = []
+        self.path_index = {}
+        self.parents = array('i')
+        self.codes = CodeTable()
+        self.text_index = None
+        self.attribute_index = None
+        self.measurements = None
+        self._pending = {}
+        self._extractor = None
+        self._partial = False
+        self._item_count = 0
+        if self.dataset is None:
+            self.logger.error("파싱할 DICOM 데이터가 없습니다. 먼저 파일을 로드하세요.")
+            return
+        
+        # Content Sequence가 있는지 확인
+        if not hasattr(self.dataset, 'ContentSequence'):
+            self.logger.warning("ContentSequence를 찾을 수 없습니다. SR 문서가 아닐 수 있습니다.")
+            return
+        if len(self.dataset.ContentSequence) == 0:
+            self.logger.warning("ContentSequence가 비어있습니다.")
+            return
+        
+        # 요소를 태그로 읽는 추출기 (문자열 요소는 문서의 문자 집합으로 직접 디코딩)
+        extractor = ContentItemExtractor(self.codes, text_encoding(self.dataset.get('SpecificCharacterSet')),
+                                         self.logger)
+        extract = extractor.extract
+        
+        path_index = self.path_index
+        parents = self.parents
+        pending = self._pending
+        parse_depth = self.parse_depth
+        parse_breadth = self.parse_breadth
+        
+        # 첫 번째 ContentItem을 루트 노드로 사용
+        # 스택 항목: (content_item, path, 노드 ID, 부모 노드)
+        stack = [(self.dataset.ContentSequence[0], (1,), '1', None)]
+        root_node = None
+        
+        # 프로파일링이 켜져 있을 때만 노드 생성 시간을 ValueType별로 누적
+        timing = profiler.enabled
+        perf_counter = time.perf_counter
+        
+        # 스트림으로 소비되면 소비하는 쪽의 처리 시간도 이 구간에 포함됨
+        with profiler.span('parse') as span:
+            while stack:
+                content_item, path, node_id, parent = stack.pop()
+                if timing:
+                    start = perf_counter()
+                    node, children = extract(content_item, node_id)
+                    profiler.add_time(f'handler.{node.type}', perf_counter() - start)
+                else:
+                    node, children = extract(content_item, node_id)
+                node.index = len(self.nodes)
+                self.nodes.append(node)
+                path_index[node_id] = node
+                
+                if parent is None:
+                    root_node = node
+                    parents.append(-1)
+                else:
+                    parent.children.append(node)
+                    parents.append(parent.index)
+                
+                yield path, len(path) - 1, node
+                
+                # 자식 노드를 역순으로 넣어 전위 순서대로 꺼내지도록 함
+                if children:
+                    count = len(children)
+                    if parse_depth is not None and len(path) > parse_depth:
+                        count = 0
+                    elif parse_breadth is not None and count > parse_breadth:
+                        count = parse_breadth
+                    if count < len(children):
+                        pending[node] = (children, path)
+                    for i in range(count - 1, -1, -1):
+                        stack.append((children[i], path + (i + 1,), f'{node_id}.{i + 1}', node))
+            span.count('items', len(self.nodes))
+        
+        self.tree = root_node
+        if pending:
+            # 인덱스와 캐시는 iter_remaining()이 트리를 완성한 뒤에 만듦
+            self._extractor = extractor
+            self._partial = True
+            # 메모리 추정에 쓰도록 아직 만들지 않은 아이템 수를 파싱 스레드에서 미리 셈
+            self._item_count = len(self.nodes) + count_content_items(
+                item for node, (children, _) in pending.items() for item in children[len(node.children):])
+            return
+        self._finish_tree()
+    
+    def _finish_tree(self):
+        """완성된 트리의 검색 인덱스를 만들고 캐시에 저장합니다."""
+        if self.build_index:
+            self._build_indexes()
+        
+        if self.cache is not None and self._fingerprint is not None:
+            with profiler.span('cache.store'):
+                self.cache.put(self.file_path, self._fingerprint,
+                               flatten_document(self.sop_instance_uid, self.nodes, self.codes,
+                                                self.text_index, self.attribute_index,
+                                                self.measurements))
+    
+    def is_complete(self):
+        """
+        모든 콘텐츠 아이템의 노드를 만들었는지 확인합니다.
+        
+        Returns:
+            bool: 깊이/너비 제한 파싱으로 아직 만들지 않은 서브트리가 없으면 True
+        """
+        return not self._partial
+    
+    def item_count(self):
+        """
+        문서의 콘텐츠 아이템 수를 반환합니다.
+        
+        Returns:
+            int: 깊이/너비 제한 파싱으로 아직 노드를 만들지 않은 아이템까지 포함한 콘텐츠 아이템 수
+        """
+        return max(len(self.nodes), self._item_count)
+    
+    def has_pending(self, node):
+        """
+        노드에 아직 만들지 않은 자식 노드가 있는지 확인합니다.
         
         Args:
-            content_sequence: DICOM ContentSequence
-            parent_children (list): 부모 노드의 children 리스트
+            node (SRNode): 이 문서의 노드
+        
+        Returns:
+            bool: 만들지 않은 자식 노드가 있으면 True
         """
-        for i, content_item in enumerate(content_sequence):
-            node = self._create_node_from_content_item(content_item, i)
-            parent_children.append(node)
-            
-            # 자식 노드가 있는 경우 재귀적으로 파싱
-            if hasattr(content_item, 'ContentSequence'):
-                self._parse_content_sequence(content_item.ContentSequence, node['children'])
+        return node in self._pending
     
-    def _create_node_from_content_item(self, content_item, index):
+    def child_count(self, node):
         """
-        ContentItem에서 노드 정보를 추출합니다.
+        아직 만들지 않은 자식 노드를 포함한 자식 콘텐츠 아이템 수를 반환합니다.
         
         Args:
-            content_item: DICOM ContentItem
-            index (int): 노드 인덱스
-            
+            node (Mapping): 이 문서의 노드
+        
         Returns:
-            dict: 노드 정보
-        """
-        node = {
-            'id': f'node_{index}',
-            'children': []
-        }
-        
-        if not hasattr(content_item, 'ValueType'):
-            node.update({
-                'type': 'UNKNOWN',
-                'value': 'Unknown content item'
-            })
-            return node
-            
-        node['type'] = content_item.ValueType
-        
-        # ConceptNameCodeSequence 정보 추출 (모든 타입에 공통)
-        name_info = self._extract_code_sequence_info(content_item, 'ConceptNameCodeSequence')
-        if name_info:
-            node.update({
-                'NameCodeMeaning': name_info['CodeMeaning'],
-                'NameCodeValue': name_info['CodeValue'],
-                'NameCodingSchemeDesignator': name_info['CodingSchemeDesignator']
-            })
-        
-        # ValueType별 처리
-        value_handlers = {
-            'TEXT': self._handle_text_value,
-            'CODE': self._handle_code_value,
-            'NUM': self._handle_num_value,
-            'CONTAINER': self._handle_container_value
-        }
-        
-        handler = value_handlers.get(content_item.ValueType, self._handle_default_value)
-        handler(content_item, node, name_info)
-        
-        # 관계 정보 추가
-        if hasattr(content_item, 'RelationshipType'):
-            node['relationship'] = content_item.RelationshipType
+            int: 자식 콘텐츠 아이템 수
+        """
+        entry = self._pending.get(node) if isinstance(node, SRNode) else None
+        if entry is not None:
+            return len(entry[0])
+        return len(node.get('children', []))
+    
+    def expand(self, node, count=None):
+        """
+        깊이/너비 제한 파싱에서 아직 만들지 않은 노드의 자식 노드를 만듭니다.
         
-        return node
+        한 단계만 만들며, 새로 만든 자식 노드의 자식은 다시 펼칠 때 만듭니다.
+        새 노드의 노드 번호는 만든 순서대로 매겨지며, 트리가 완성되면 트리 순서로 다시 매겨집니다.
+        
+        Args:
+            node (SRNode): 이 문서의 노드
+            count (int, optional): 자식 노드가 이 개수가 될 때까지만 만듦 (None이면 모두)
+        
+        Returns:
+            list: 새로 만든 (path, depth, node) 튜플 목록
+        """
+        # 이미 자식 노드를 다 만든 노드는 잠금 없이 바로 반환 (iter_remaining이 인덱스를 만드는 동안에도)
+        if node not in self._pending:
+            return []
+        with self._lock:
+            if node not in self._pending:
+                return []
+            with profiler.span('parse.expand') as span:
+                entries = self._expand_locked(node, count)
+                span.count('items', len(entries))
+            return entries
     
-    def _handle_text_value(self, content_item, node, name_info):
-        """TEXT 타입 값 처리"""
-        if hasattr(content_item, 'TextValue') and name_info:
-            node['value'] = f"{name_info['CodeMeaning']} : {content_item.TextValue} ({name_info['CodeValue']} {name_info['CodingSchemeDesignator']})"
-    
-    def _handle_code_value(self, content_item, node, name_info):
-        """CODE 타입 값 처리"""
-        code_info = self._extract_code_sequence_info(content_item, 'ConceptCodeSequence')
-        if code_info:
-            node.update({
-                'CodeMeaning': code_info['CodeMeaning'],
-                'CodeValue': code_info['CodeValue'],
-                'CodingSchemeDesignator': code_info['CodingSchemeDesignator']
-            })
-            if name_info:
-                node['value'] = f"{name_info['CodeMeaning']} ({name_info['CodeValue']} {name_info['CodingSchemeDesignator']}) : {code_info['CodeMeaning']} ({code_info['CodeValue']})"
-    
-    def _handle_num_value(self, content_item, node, name_info):
-        """NUM 타입 값 처리"""
-        if not hasattr(content_item, 'MeasuredValueSequence'):
-            return
-            
-        measured_value = content_item.MeasuredValueSequence[0]
-        if not hasattr(measured_value, 'NumericValue'):
-            return
-            
-        num_value = measured_value.NumericValue
+    def _expand_locked(self, node, count):
+        """잠금을 잡은 상태에서 노드의 자식 노드를 만듭니다 (expand와 iter_remaining의 공통 부분)."""
+        children, path = self._pending[node]
+        start = len(node.children)
+        end = len(children) if count is None else min(count, len(children))
+        extract = self._extractor.extract
+        
+        entries = []
+        for i in range(start, end):
+            child_path = path + (i + 1,)
+            child, grandchildren = extract(children[i], f'{node.id}.{i + 1}')
+            child.index = len(self.nodes)
+            self.nodes.append(child)
+            self.path_index[child.id] = child
+            self.parents.append(node.index)
+            if grandchildren:
+                self._pending[child] = (grandchildren, child_path)
+            # 다른 스레드가 children을 읽으므로 노드를 모두 등록한 뒤에 연결
+            node.children.append(child)
+            entries.append((child_path, len(child_path) - 1, child))
+        
+        if end >= len(children):
+            del self._pending[node]
+        return entries
+    
+    def iter_remaining(self):
+        """
+        깊이/너비 제한 파싱에서 아직 만들지 않은 노드를 모두 만들면서 하나씩 생성합니다.
+        
+        작업 스레드에서 소비하는 동안에도 GUI 스레드가 expand()를 호출할 수 있도록 잠금은
+        REMAINING_BATCH_SIZE개 노드를 만드는 동안만 잡습니다. 모든 노드를 만들면 노드 번호를
+        전체 파싱과 같은 트리 순서로 다시 매기고 검색 인덱스를 만든 뒤 캐시에 저장합니다.
+        중간에 close()되면 트리를 완성하지 않고 끝납니다.
+        
+        Yields:
+            tuple: (path, depth, node) - 새로 만든 노드 (트리 순서가 아님)
+        """
+        with profiler.span('parse.remaining') as span:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        break
+                    node = next(iter(self._pending))
+                    entries = self._expand_locked(node, len(node.children) + REMAINING_BATCH_SIZE)
+                span.count('items', len(entries))
+                yield from entries
         
-        # 단위 정보 추출
-        unit_info = self._extract_code_sequence_info(measured_value, 'MeasurementUnitsCodeSequence')
-        if unit_info:
-            node.update({
-                'UnitCodeMeaning': unit_info['CodeMeaning'],
-                'UnitCodeValue': unit_info['CodeValue'],
-                'UnitCodingSchemeDesignator': unit_info['CodingSchemeDesignator']
-            })
+        with self._lock:
+            if self._partial and self._extractor is not None:
+                self._renumber()
+                self._extractor = None
+                self._partial = False
+                self._finish_tree()
+    
+    def finish_parse(self):
+        """
+        깊이/너비 제한 파싱에서 아직 만들지 않은 노드를 모두 만들고 검색 인덱스를 만듭니다.
         
-        if name_info:
-            node['value'] = f"{name_info['CodeMeaning']} : {num_value} ({name_info['CodeValue']} {name_info['CodingSchemeDesignator']})"
+        Returns:
+            SRNode: 완성된 트리의 루트 노드
+        """
+        for _ in self.iter_remaining():
+            pass
+        return self.tree
     
-    def _handle_container_value(self, content_item, node, name_info):
-        """CONTAINER 타입 값 처리"""
-        if name_info:
-            node['value'] = f"{name_info['CodeMeaning']} ({name_info['CodeValue']} {name_info['CodingSchemeDesignator']})"
+    def _renumber(self):
+        """완성된 트리의 노드 번호와 부모 노드 번호 배열을 전위 순서로 다시 만듭니다."""
+        nodes = []
+        parents = array('i')
+        stack = [(self.tree, -1)]
+        while stack:
+            node, parent = stack.pop()
+            node.index = len(nodes)
+            nodes.append(node)
+            parents.append(parent)
+            children = node.children
+            for i in range(len(children) - 1, -1, -1):
+                stack.append((children[i], node.index))
+        self.nodes = nodes
+        self.parents = parents
     
-    def _handle_default_value(self, content_item, node, name_info):
-        """기본 ValueType 처리"""
-        node['value'] = f"ValueType: {content_item.ValueType}"
+    def _build_indexes(self):
+        """파싱된 노드에 대한 검색 인덱스를 만듭니다."""
+        with profiler.span('index.text', items=len(self.nodes)):
+            self.text_index = TextIndex(self.nodes)
+        with profiler.span('index.attribute', items=len(self.nodes)):
+            self.attribute_index = AttributeIndex(self.nodes)
+        with profiler.span('index.measurements') as span:
+            self.measurements = MeasurementStore(self.nodes, self.codes)
+            span.count('items', len(self.measurements))
     
     def get_tree(self):
         """
         파싱된 트리 구조를 반환합니다.
         
         Returns:
-            dict: 트리 구조로 변환된 DICOM SR 데이터
+            SRNode: 트리 구조로 변환된 DICOM SR 데이터 (dict 호환 루트 노드)
         """
         return self.tree
     
-    def search_in_tree(self, search_term):
+    def node_for_path(self, path):
         """
-        트리에서 특정 텍스트를 검색합니다.
+        콘텐츠 아이템 위치의 노드를 찾습니다.
+        
+        아직 만들지 않은 서브트리에 있는 노드이면 조상 노드를 펼쳐서 만듭니다.
         
         Args:
-            search_term (str): 검색할 텍스트
-            
+            path (str or tuple): 위치 문자열(예: "1.2.3") 또는 1부터 시작하는 위치 튜플
+        
         Returns:
-            list: 검색 결과 노드 리스트
+            SRNode: 노드 또는 None (위치에 노드가 없는 경우)
         """
-        if self.tree is None:
-            self.logger.error("검색할 트리가 없습니다. 먼저 SR을 파싱하세요.")
-            return []
+        if isinstance(path, tuple):
+            path = format_path(path)
+        node = self.path_index.get(path)
+        if node is None and self._pending:
+            node = self._expand_path(parse_path(path))
+        return node
+    
+    def _expand_path(self, path):
+        """
+        위치의 조상 노드를 위에서부터 필요한 만큼 펼쳐서 위치의 노드를 만듭니다.
+        
+        Returns:
+            SRNode: 노드 또는 None (위치에 콘텐츠 아이템이 없는 경우)
+        """
+        if path is None or path[0] != 1 or self.tree is None:
+            return None
         
-        results = []
-        self._search_node(self.tree, search_term.lower(), results)
-        return results
+        node = self.tree
+        for position in path[1:]:
+            if position > self.child_count(node):
+                return None
+            self.expand(node, position)
+            node = node.children[position - 1]
+        return node
     
-    def _search_node(self, node, search_term, results):
+    def parent_of(self, node):
         """
-        노드에서 재귀적으로 검색합니다.
+        노드의 부모 노드를 반환합니다.
         
         Args:
-            node (dict): 검색할 노드
-            search_term (str): 검색할 텍스트
-            results (list): 검색 결과를 저장할 리스트
-        """
-        # 현재 노드의 값에서 검색
-        if 'value' in node and isinstance(node['value'], str) and search_term in node['value'].lower():
-            results.append(node)
+            node (SRNode): 이 문서의 노드
         
-        # 자식 노드에서 재귀적으로 검색
-        if 'children' in node:
-            for child in node['children']:
-                self._search_node(child, search_term, results)
+        Returns:
+            SRNode: 부모 노드 또는 None (루트 노드인 경우)
+        """
+        parent = self.parents[node.index]
+        return self.nodes[parent] if parent >= 0 else None
     
-    def _extract_code_sequence_info(self, item, sequence_name):
+    def resolve_reference(self, node):
         """
-        CodeSequence에서 정보를 추출합니다.
+        참조로 연결된(by-reference) 아이템이 가리키는 노드를 찾습니다.
         
         Args:
-            item: DICOM 아이템
-            sequence_name (str): CodeSequence 이름
-            
+            node (SRNode): REFERENCE 타입 노드
+        
         Returns:
-            dict: 추출된 코드 정보 또는 None
+            SRNode: 참조 대상 노드 또는 None (참조가 아니거나 대상이 없는 경우)
         """
-        if not hasattr(item, sequence_name) or not getattr(item, sequence_name):
-            return None
-            
-        try:
-            code_seq = getattr(item, sequence_name)[0]
-            info = {}
-            
-            # CodeMeaning 체크
-            if (hasattr(code_seq, 'CodeMeaning') and 
-                code_seq.CodeMeaning is not None and 
-                str(code_seq.CodeMeaning).strip()):
-                info['CodeMeaning'] = str(code_seq.CodeMeaning).strip()
-            else:
-                info['CodeMeaning'] = ""
-                
-            # CodeValue 체크
-            if (hasattr(code_seq, 'CodeValue') and 
-                code_seq.CodeValue is not None and 
-                str(code_seq.CodeValue).strip()):
-                info['CodeValue'] = str(code_seq.CodeValue).strip()
-            else:
-                info['CodeValue'] = ""
-                
-            # CodingSchemeDesignator 체크
-            if (hasattr(code_seq, 'CodingSchemeDesignator') and 
-                code_seq.CodingSchemeDesignator is not None and 
-                str(code_seq.CodingSchemeDesignator).strip()):
-                info['CodingSchemeDesignator'] = str(code_seq.CodingSchemeDesignator).strip()
-            else:
-                info['CodingSchemeDesignator'] = ""
-                
-            return info;
-            
-        except Exception as e:
-            self.logger.error(f"Code Sequence 정보 추출 중 오류 발생: {e}")
+        reference = node.get('reference')
+        if reference is None:
             return None
+        target = self.node_for_path(reference)
+        if target is None:
+            self.logger.warning(f"참조 대상 아이템을 찾을 수 없습니다: {reference}")
+        return target
+    
+    def search_in_tree(self, search_term, mode='substring'):
+        """
+        트리에서 특정 텍스트를 검색합니다.
+        
+        파싱할 때 만든 역색인을 사용하므로 트리 전체를 순회하지 않습니다.
+        역색인이 없으면(build_index=False) 처음 검색할 때 만듭니다.
+        
+        Args:
+            search_term (str): 검색할 텍스트
+            mode (str, optional): 검색 방식 ('substring', 'exact', 'prefix')
+        
+        Returns:
+            list: 검색 결과 노드 리스트 (트리 순서)
+        """
+        if not self.ensure_searchable():
+            return []
+        return [self.nodes[i] for i in self.text_index.search(search_term, mode)]
+    
+    def ensure_searchable(self):
+        """
+        검색할 수 있는 상태로 만듭니다.
+        
+        깊이/너비 제한 파싱으로 만들지 않은 노드가 있으면 먼저 모두 만들고, build_index=False로
+        파싱했거나 인덱스 없이 캐시에서 복원한 경우처럼 검색 인덱스가 없으면 처음 검색할 때 만듭니다.
+        
+        Returns:
+            bool: 검색할 수 있으면 True (트리가 없거나 완성할 수 없으면 False)
+        """
+        if self.tree is None:
+            self.logger.error("검색할 트리가 없습니다. 먼저 SR을 파싱하세요.")
+            return False
+        
+        # 깊이/너비 제한 파싱이면 남은 노드를 모두 만든 뒤 검색
+        if self._partial:
+            self.finish_parse()
+            if self._partial:
+                self.logger.error("데이터셋이 해제되어 남은 서브트리를 파싱할 수 없습니다.")
+                return False
+        
+        if self.text_index is None or self.attribute_index is None or self.measurements is None:
+            with self._lock:
+                if self.text_index is None or self.attribute_index is None or self.measurements is None:
+                    self._build_indexes()
+        return True
@@ -0,0 +1,222 @@
+"""
+문서 관리 모듈
+여러 DICOM SR 문서를 동시에 열어 두고 메모리 예산을 넘으면 오래 사용하지 않은 문서를 해제합니다.
+"""
+
+from collections import OrderedDict
+import logging
+import sys
+
+# 기본 메모리 예산 (bytes)
+DEFAULT_MEMORY_BUDGET = 1024 * 1024 * 1024
+
+# 노드 하나의 고정 메모리 (SRNode 객체, children 리스트, 위치 사전과 부모 배열 항목, bytes)
+NODE_BYTES = 330
+
+# 노드 하나당 검색 인덱스 메모리 (TextIndex와 AttributeIndex, bytes)
+INDEX_BYTES_PER_NODE = 400
+
+# 파싱이 끝난 pydicom Dataset의 콘텐츠 아이템 하나당 메모리 (변환된 요소 포함, bytes)
+DATASET_BYTES_PER_ITEM = 5400
+
+def estimate_memory(sr_parser):
+    """
+    파싱된 문서의 메모리 사용량을 추정합니다.
+    
+    tracemalloc으로 측정한 노드, 인덱스, Dataset의 항목당 크기에 값 문자열의 실제 크기를 더합니다.
+    Dataset은 깊이/너비 제한 파싱으로 아직 노드를 만들지 않은 아이템도 모두 가지고 있으므로
+    만든 노드 수가 아니라 전체 콘텐츠 아이템 수로 계산합니다.
+    
+    Args:
+        sr_parser (DicomSRParser): 파싱이 끝난 파서
+    
+    Returns:
+        int: 추정 메모리 사용량 (bytes)
+    """
+    node_count = len(sr_parser.nodes)
+    total = node_count * NODE_BYTES
+    total += sum(sys.getsizeof(node.value) for node in sr_parser.nodes if node.value is not None)
+    if sr_parser.text_index is not None:
+        total += node_count * INDEX_BYTES_PER_NODE
+    if sr_parser.dataset is not None:
+        total += sr_parser.item_count() * DATASET_BYTES_PER_ITEM
+    return total
+
+class SRDocument:
+    """열려 있는 DICOM SR 문서 하나"""
+    
+    def __init__(self, file_path, sr_parser):
+        """
+        SRDocument 클래스 초기화
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+            sr_parser (DicomSRParser): 파싱이 끝난 파서 (트리, 인덱스, Dataset 보유)
+        """
+        self.file_path = file_path
+        self.sr_parser = sr_parser
+        self.node_count = len(sr_parser.nodes)
+        self.memory_bytes = estimate_memory(sr_parser)
+    
+    @property
+    def resident(self):
+        """문서의 트리와 Dataset이 메모리에 있는지 여부"""
+        return self.sr_parser is not None
+    
+    def release(self):
+        """트리, 검색 인덱스와 Dataset을 해제합니다. 다시 사용하려면 파일을 다시 로드해야 합니다."""
+        if self.sr_parser is not None:
+            # 다른 곳에서 파서를 참조하고 있어도 트리와 인덱스가 남지 않도록 파서 안의 문서도 비움
+            self.sr_parser.release()
+            self.sr_parser = None
+        self.memory_bytes = 0
+
+class DocumentManager:
+    """
+    열려 있는 문서를 최근 사용 순서로 관리하는 클래스
+    
+    메모리에 있는 문서들의 추정 메모리 합이 예산을 넘으면 가장 오래 사용하지 않은 문서부터
+    해제합니다. 해제된 문서도 목록에는 남아 있으므로 다시 열 때 파일 경로를 알 수 있으며,
+    가장 최근에 사용한 문서는 예산을 넘더라도 해제하지 않습니다.
+    """
+    
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        """
+        DocumentManager 클래스 초기화
+        
+        Args:
+            memory_budget (int, optional): 메모리 예산 (bytes)
+        """
+        self.logger = logging.getLogger('DocumentManager')
+        self.memory_budget = memory_budget
+        # 파일 경로 → SRDocument (앞쪽이 가장 오래 사용하지 않은 문서)
+        self._documents = OrderedDict()
+    
+    def add(self, file_path, sr_parser, recent=True):
+        """
+        파싱된 문서를 추가하고 가장 최근에 사용한 문서로 표시합니다.
+        같은 파일의 문서가 있으면 교체합니다.
+        
+        보고 있지 않은 탭의 문서처럼 recent가 False이면 가장 오래 사용하지 않은 문서로 추가하므로,
+        예산을 넘더라도 보고 있는 문서 대신 이 문서가 먼저 해제됩니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+            sr_parser (DicomSRParser): 파싱이 끝난 파서
+            recent (bool, optional): 가장 최근에 사용한 문서로 표시할지 여부
+        
+        Returns:
+            list: 메모리 예산 때문에 해제된 SRDocument 리스트
+        """
+        previous = self._documents.pop(file_path, None)
+        if previous is not None and previous.sr_parser is not sr_parser:
+            previous.release()
+        
+        self._documents[file_path] = SRDocument(file_path, sr_parser)
+        if not recent:
+            self._documents.move_to_end(file_path, last=False)
+        return self._evict()
+    
+    def get(self, file_path):
+        """
+        문서를 반환하고 가장 최근에 사용한 문서로 표시합니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+        
+        Returns:
+            SRDocument: 문서 또는 None (열려 있지 않은 경우). 해제된 문서일 수 있습니다.
+        """
+        document = self._documents.get(file_path)
+        if document is not None:
+            self._documents.move_to_end(file_path)
+        return document
+    
+    def is_resident(self, file_path):
+        """
+        문서가 메모리에 있는지 확인합니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+        
+        Returns:
+            bool: 메모리 상주 여부
+        """
+        document = self._documents.get(file_path)
+        return document is not None and document.resident
+    
+    def remove(self, file_path):
+        """
+        문서를 닫고 메모리를 해제합니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+        """
+        document = self._documents.pop(file_path, None)
+        if document is not None:
+            document.release()
+    
+    def refresh(self, file_path):
+        """
+        문서의 노드 수와 메모리 추정치를 다시 계산하고 필요하면 다른 문서를 해제합니다.
+        깊이/너비 제한 파싱에서 남은 노드를 모두 만든 뒤 호출합니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+        
+        Returns:
+            list: 메모리 예산 때문에 해제된 SRDocument 리스트
+        """
+        document = self._documents.get(file_path)
+        if document is None or not document.resident:
+            return []
+        document.node_count = len(document.sr_parser.nodes)
+        document.memory_bytes = estimate_memory(document.sr_parser)
+        return self._evict()
+    
+    def documents(self):
+        """
+        열려 있는 문서를 오래 사용하지 않은 순서로 반환합니다.
+        
+        Returns:
+            list: SRDocument 리스트
+        """
+        return list(self._documents.values())
+    
+    def memory_usage(self):
+        """
+        메모리에 있는 문서들의 추정 메모리 합을 반환합니다.
+        
+        Returns:
+            int: 추정 메모리 사용량 (bytes)
+        """
+        return sum(document.memory_bytes for document in self._documents.values())
+    
+    def set_memory_budget(self, memory_budget):
+        """
+        메모리 예산을 바꾸고 필요하면 문서를 해제합니다.
+        
+        Args:
+            memory_budget (int): 메모리 예산 (bytes)
+        
+        Returns:
+            list: 해제된 SRDocument 리스트
+        """
+        self.memory_budget = memory_budget
+        return self._evict()
+    
+    def _evict(self):
+        """메모리 예산을 넘는 동안 가장 오래 사용하지 않은 문서부터 해제합니다."""
+        evicted = []
+        usage = self.memory_usage()
+        # 가장 최근에 사용한 문서(마지막)는 해제하지 않음
+        for document in list(self._documents.values())[:-1]:
+            if usage <= self.memory_budget:
+                break
+            if not document.resident:
+                continue
+            usage -= document.memory_bytes
+            document.release()
+            evicted.append(document)
+            self.logger.info(f"메모리 예산 초과로 문서 해제: {document.file_path}")
+        return evicted
@@ -0,0 +1,177 @@
+"""
+측정값 저장소 모듈
+NUM 콘텐츠 아이템의 수치, 개념 이름 코드와 단위를 열(column) 배열로 저장하고
+NumPy 벡터 연산으로 범위/비교 검색을 제공합니다.
+"""
+
+from array import array
+
+# UCUM 단위 → (차원, 기준 단위로의 배율)
+# 길이는 mm, 넓이는 mm2, 부피는 mm3 기준으로 정규화
+UCUM_UNITS = {
+    'um': ('length', 0.001),
+    'mm': ('length', 1.0),
+    'cm': ('length', 10.0),
+    'dm': ('length', 100.0),
+    'm': ('length', 1000.0),
+    '[in_i]': ('length', 25.4),
+    'mm2': ('area', 1.0),
+    'cm2': ('area', 100.0),
+    'dm2': ('area', 10000.0),
+    'm2': ('area', 1000000.0),
+    'mm3': ('volume', 1.0),
+    'cm3': ('volume', 1000.0),
+    'dm3': ('volume', 1000000.0),
+    'm3': ('volume', 1000000000.0),
+    'uL': ('volume', 1.0),
+    'mL': ('volume', 1000.0),
+    'dL': ('volume', 100000.0),
+    'L': ('volume', 1000000.0),
+}
+
+# 검색어로 입력한 단위의 별칭 → UCUM_UNITS의 단위 코드
+# 문서의 단위 코드에는 적용하지 않으므로 UCUM_UNITS에 없는 표기는 정규화하지 않음
+UNIT_ALIASES = {
+    'ul': 'uL',
+    'ml': 'mL',
+    'dl': 'dL',
+    'l': 'L',
+}
+
+# 차원 이름 → 차원 번호 (-1은 정규화할 수 없는 단위)
+DIMENSIONS = {'length': 0, 'area': 1, 'volume': 2}
+
+# 비교 연산자 → NumPy ufunc 이름
+COMPARISONS = {
+    '<': 'less',
+    '<=': 'less_equal',
+    '>': 'greater',
+    '>=': 'greater_equal',
+    '=': 'equal',
+    '==': 'equal',
+    '!=': 'not_equal',
+}
+
+def normalize_unit(code_value, coding_scheme='UCUM'):
+    """
+    단위 코드를 기준 단위로의 차원과 배율로 변환합니다.
+    
+    Args:
+        code_value (str): 단위 CodeValue (예: 'cm', 'mL')
+        coding_scheme (str, optional): CodingSchemeDesignator (UCUM만 정규화)
+    
+    Returns:
+        tuple: (차원 이름, 배율) 또는 정규화할 수 없는 단위이면 None
+    """
+    if coding_scheme != 'UCUM':
+        return None
+    return UCUM_UNITS.get(code_value)
+
+class MeasurementStore:
+    """
+    NUM 측정값 열 저장소
+    
+    노드 번호, 원래 수치, 기준 단위로 정규화한 수치, 차원, 단위 코드 ID, 개념 이름 코드 ID를
+    NUM 노드 순서의 array로 저장합니다. array는 pickle로 그대로 캐시할 수 있고,
+    검색할 때 복사 없이 NumPy 배열로 보고 한 번의 벡터 연산으로 조건을 확인합니다.
+    NumPy는 처음 검색할 때 임포트합니다.
+    """
+    
+    def __init__(self, nodes, codes):
+        """
+        MeasurementStore 클래스 초기화
+        
+        Args:
+            nodes (list): 노드 번호(index) 순서의 SRNode 리스트
+            codes (CodeTable): 문서 코드 사전
+        """
+        self._node_ids = array('q')
+        self._values = array('d')
+        self._base_values = array('d')
+        self._dimensions = array('b')
+        self._unit_codes = array('q')
+        self._name_codes = array('q')
+        
+        # 단위 코드 ID → (차원 번호, 배율)
+        unit_scales = {}
+        for node in nodes:
+            numeric = node.numeric
+            if numeric is None:
+                continue
+            
+            unit_code = node.unit_code
+            scale = unit_scales.get(unit_code)
+            if scale is None:
+                normalized = None
+                if unit_code is not None:
+                    code_value, coding_scheme, _ = codes.get(unit_code)
+                    normalized = normalize_unit(code_value, coding_scheme)
+                scale = (DIMENSIONS[normalized[0]], normalized[1]) if normalized else (-1, 1.0)
+                unit_scales[unit_code] = scale
+            
+            self._node_ids.append(node.index)
+            self._values.append(numeric)
+            self._base_values.append(numeric * scale[1])
+            self._dimensions.append(scale[0])
+            self._unit_codes.append(-1 if unit_code is None else unit_code)
+            self._name_codes.append(-1 if node.name_code is None else node.name_code)
+    
+    def __len__(self):
+        return len(self._node_ids)
+    
+    def query(self, codes, minimum=None, maximum=None, unit=None, name_codes=None,
+              include_minimum=True, include_maximum=True, comparison=None, value=None):
+        """
+        조건을 만족하는 측정값의 노드 번호를 찾습니다.
+        
+        unit이 길이/넓이/부피 UCUM 단위이면 같은 차원의 측정값을 모두 기준 단위로 바꾸어 비교하고
+        (예: '1 cm'와 '10 mm'는 같은 값), 그 외의 단위이면 단위 코드가 같은 측정값의 원래 수치를 비교합니다.
+        unit이 없으면 단위와 관계없이 원래 수치를 비교합니다.
+        
+        Args:
+            codes (CodeTable): 문서 코드 사전 (단위 코드 조회용)
+            minimum (float, optional): 하한
+            maximum (float, optional): 상한
+            unit (str, optional): 기준값의 단위 UCUM 코드 (예: 'mm', 'cm2', 'mL') 또는 UNIT_ALIASES의 별칭
+            name_codes (iterable, optional): 허용하는 개념 이름 코드 ID
+            include_minimum (bool, optional): 하한 포함 여부
+            include_maximum (bool, optional): 상한 포함 여부
+            comparison (str, optional): 비교 연산자 ('<', '<=', '>', '>=', '=', '!=')
+            value (float, optional): comparison의 기준값
+        
+        Returns:
+            list: 오름차순 노드 번호 리스트
+        """
+        if not self._node_ids:
+            return []
+        
+        import numpy as np
+        
+        mask = np.ones(len(self._node_ids), dtype=bool)
+        values = np.frombuffer(self._values, dtype=np.float64)
+        scale = 1.0
+        
+        if unit is not None:
+            normalized = normalize_unit(UNIT_ALIASES.get(unit, unit))
+            if normalized is not None:
+                dimension, scale = normalized
+                values = np.frombuffer(self._base_values, dtype=np.float64)
+                mask &= np.frombuffer(self._dimensions, dtype=np.int8) == DIMENSIONS[dimension]
+            else:
+                unit_ids = list(codes.find(unit))
+                mask &= np.isin(np.frombuffer(self._unit_codes, dtype=np.int64), unit_ids)
+        
+        if name_codes is not None:
+            mask &= np.isin(np.frombuffer(self._name_codes, dtype=np.int64), list(name_codes))
+        
+        if comparison is not None:
+            ufunc = COMPARISONS.get(comparison)
+            if ufunc is None:
+                raise ValueError(f"지원하지 않는 비교 연산자입니다: {comparison}")
+            mask &= getattr(np, ufunc)(values, value * scale)
+        if minimum is not None:
+            mask &= (values >= minimum * scale) if include_minimum else (values > minimum * scale)
+        if maximum is not None:
+            mask &= (values <= maximum * scale) if include_maximum else (values < maximum * scale)
+        
+        return np.frombuffer(self._node_ids, dtype=np.int64)[mask].tolist()
@@ -0,0 +1,325 @@
+"""
+파싱 캐시 모듈
+파싱된 SR 트리를 디스크에 저장하여 같은 파일을 다시 열 때 DICOM 읽기와 파싱을 건너뜁니다.
+"""
+
+from array import array
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+
+from models.sr_tree import CodeTable, SRNode
+
+# 캐시 파일 형식 버전 (노드 구조, 노드 값 형식이나 인덱스 형식이 바뀌면 올려서 기존 항목을 무효화)
+CACHE_FORMAT_VERSION = 5
+
+# 캐시 파일 확장자
+CACHE_SUFFIX = '.srcache'
+
+# 기본 캐시 크기 상한 (bytes)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# 내용 해시 지문을 계산할 때 한 번에 읽는 크기 (bytes)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def default_cache_dir():
+    """
+    기본 캐시 디렉터리를 반환합니다 ($XDG_CACHE_HOME 또는 ~/.cache 아래).
+    
+    Returns:
+        str: 캐시 디렉터리 경로
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'dicom_sr_viewer', 'parse_cache')
+
+def flatten_document(sop_instance_uid, nodes, codes, text_index=None, attribute_index=None,
+                     measurements=None):
+    """
+    파싱된 문서를 재귀 없이 직렬화할 수 있는 평면 구조로 변환합니다.
+    
+    노드는 파싱 순서(전위 순서)의 열(column) 리스트로 저장하고 트리 구조는 부모 노드 번호로만
+    기록하므로, 트리가 아무리 깊어도 pickle이 재귀 한도에 걸리지 않습니다.
+    
+    Args:
+        sop_instance_uid (str): SOPInstanceUID
+        nodes (list): 파싱 순서의 SRNode 리스트
+        codes (CodeTable): 문서 코드 사전
+        text_index (TextIndex, optional): 텍스트 검색 인덱스
+        attribute_index (AttributeIndex, optional): 속성 버킷 인덱스
+        measurements (MeasurementStore, optional): NUM 측정값 저장소
+    
+    Returns:
+        dict: 평면 문서 구조
+    """
+    parents = array('i', [-1]) * len(nodes)
+    for node in nodes:
+        for child in node.children:
+            parents[child.index] = node.index
+    
+    return {
+        'sop_instance_uid': sop_instance_uid,
+        'codes': codes.codes,
+        'parents': parents,
+        'ids': [node.id for node in nodes],
+        'types': [node.type for node in nodes],
+        'values': [node.value for node in nodes],
+        'numerics': [node.numeric for node in nodes],
+        'relationships': [node.relationship for node in nodes],
+        'references': [node.reference for node in nodes],
+        'name_codes': [node.name_code for node in nodes],
+        'concept_codes': [node.concept_code for node in nodes],
+        'unit_codes': [node.unit_code for node in nodes],
+        'text_index': text_index,
+        'attribute_index': attribute_index,
+        'measurements': measurements,
+    }
+
+def restore_document(document):
+    """
+    flatten_document로 만든 평면 구조에서 노드 트리를 복원합니다.
+    
+    Args:
+        document (dict): 평면 문서 구조
+    
+    Returns:
+        tuple: (루트 노드 또는 None, 파싱 순서의 노드 리스트, CodeTable)
+    """
+    codes = CodeTable()
+    for code_value, coding_scheme, code_meaning in document['codes']:
+        codes.intern(code_value, coding_scheme, code_meaning)
+    
+    nodes = []
+    columns = zip(document['ids'], document['types'], document['values'], document['numerics'],
+                  document['relationships'], document['references'], document['name_codes'],
+                  document['concept_codes'], document['unit_codes'], document['parents'])
+    for index, (node_id, value_type, value, numeric, relationship, reference,
+                name_code, concept_code, unit_code, parent) in enumerate(columns):
+        node = SRNode(node_id, codes, index)
+        node.type = value_type
+        node.value = value
+        node.numeric = numeric
+        node.relationship = relationship
+        node.reference = reference
+        node.name_code = name_code
+        node.concept_code = concept_code
+        node.unit_code = unit_code
+        nodes.append(node)
+        
+        # 전위 순서이므로 부모는 항상 먼저 복원되어 있고 형제 순서도 유지됨
+        if parent >= 0:
+            nodes[parent].children.append(node)
+    
+    return (nodes[0] if nodes else None), nodes, codes
+
+class ParseCache:
+    """
+    파싱된 SR 문서의 디스크 캐시
+    
+    항목은 파일의 실제 경로로 찾고, 저장할 때의 파일 지문(크기와 수정 시각, 또는 내용 해시)이
+    현재 파일과 다르면 자동으로 무효화합니다. 항목에는 SOPInstanceUID도 함께 기록합니다.
+    캐시 적중 시 파일을 DICOM으로 읽지 않으므로 dcmread와 파싱을 모두 건너뜁니다.
+    
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+    (사용 시각은 항목 파일의 수정 시각으로 기록)
+    """
+    
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, use_hash=False):
+        """
+        ParseCache 클래스 초기화
+        
+        Args:
+            cache_dir (str, optional): 캐시 디렉터리 (기본값: default_cache_dir())
+            max_bytes (int, optional): 캐시 크기 상한 (bytes)
+            use_hash (bool, optional): 크기/수정 시각 대신 파일 내용 해시를 지문으로 사용할지 여부
+                (수정 시각을 믿을 수 없는 네트워크 드라이브용, 파일 전체를 읽어야 함)
+        """
+        self.logger = logging.getLogger('ParseCache')
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.use_hash = use_hash
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+    
+    def fingerprint(self, file_path):
+        """
+        파일 지문을 계산합니다.
+        
+        Args:
+            file_path (str): 파일 경로
+        
+        Returns:
+            tuple: 파일 지문 또는 None (파일을 읽을 수 없는 경우)
+        """
+        try:
+            stat = os.stat(file_path)
+            if not self.use_hash:
+                return ('stat', stat.st_size, stat.st_mtime_ns)
+            
+            digest = hashlib.blake2b(digest_size=20)
+            with open(file_path, 'rb') as fp:
+                for chunk in iter(lambda: fp.read(HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            return ('hash', stat.st_size, digest.hexdigest())
+        except OSError as e:
+            self.logger.warning(f"파일 지문 계산 실패: {e}")
+            return None
+    
+    def _entry_path(self, file_path):
+        """파일 경로에 해당하는 캐시 항목 파일 경로를 반환합니다."""
+        key = hashlib.sha1(os.path.realpath(file_path).encode('utf-8', 'surrogateescape')).hexdigest()
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+    
+    def get(self, file_path, fingerprint):
+        """
+        캐시된 문서를 찾습니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+            fingerprint (tuple): fingerprint()로 계산한 현재 파일 지문
+        
+        Returns:
+            dict: flatten_document 형식의 평면 문서 구조 또는 None (캐시 미스)
+        """
+        entry_path = self._entry_path(file_path)
+        try:
+            with open(entry_path, 'rb') as fp:
+                header = pickle.load(fp)
+                valid = (fingerprint is not None
+                         and header.get('version') == CACHE_FORMAT_VERSION
+                         and header.get('fingerprint') == fingerprint)
+                document = pickle.load(fp) if valid else None
+        except FileNotFoundError:
+            self._count('misses')
+            return None
+        except Exception as e:
+            self.logger.warning(f"손상된 캐시 항목 삭제: {entry_path} ({e})")
+            document = None
+        
+        if document is None:
+            # 파일이 바뀌었거나 형식이 다른 항목은 삭제
+            self._remove(entry_path)
+            self._count('invalidations')
+            self._count('misses')
+            return None
+        
+        # LRU 순서를 위해 사용 시각 갱신
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        self._count('hits')
+        return document
+    
+    def put(self, file_path, fingerprint, document):
+        """
+        문서를 캐시에 저장하고 크기 상한을 넘으면 오래된 항목을 삭제합니다.
+        
+        Args:
+            file_path (str): DICOM SR 파일 경로
+            fingerprint (tuple): 파일을 읽기 전에 계산한 파일 지문
+            document (dict): flatten_document 형식의 평면 문서 구조
+        
+        Returns:
+            bool: 저장 성공 여부
+        """
+        if fingerprint is None:
+            return False
+        
+        header = {
+            'version': CACHE_FORMAT_VERSION,
+            'fingerprint': fingerprint,
+            'path': os.path.realpath(file_path),
+            'sop_instance_uid': document.get('sop_instance_uid'),
+        }
+        entry_path = self._entry_path(file_path)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 다른 프로세스가 읽는 중에도 완전한 파일만 보이도록 임시 파일에 쓴 뒤 교체
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as fp:
+                    pickle.dump(header, fp, protocol=pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(document, fp, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, entry_path)
+            except BaseException:
+                self._remove(temp_path)
+                raise
+        except Exception as e:
+            self.logger.warning(f"캐시 저장 실패: {e}")
+            return False
+        
+        self._count('stores')
+        self._evict()
+        return True
+    
+    def _evict(self):
+        """전체 크기가 상한 이하가 될 때까지 가장 오래 사용하지 않은 항목을 삭제합니다."""
+        with self._lock:
+            entries = []
+            total = 0
+            try:
+                with os.scandir(self.cache_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith(CACHE_SUFFIX):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                            total += stat.st_size
+            except OSError:
+                return
+            
+            if total <= self.max_bytes:
+                return
+            
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if self._remove(path):
+                    total -= size
+                    self.evictions += 1
+    
+    def clear(self):
+        """모든 캐시 항목을 삭제합니다."""
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(CACHE_SUFFIX):
+                        self._remove(entry.path)
+        except OSError:
+            pass
+    
+    def stats(self):
+        """
+        캐시 통계를 반환합니다.
+        
+        Returns:
+            dict: hits, misses, stores, invalidations, evictions 카운터
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'invalidations': self.invalidations,
+                'evictions': self.evictions,
+            }
+    
+    def _count(self, name):
+        """카운터를 1 증가시킵니다. (여러 작업 스레드에서 같은 캐시를 사용할 수 있음)"""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+    
+    def _remove(self, path):
+        """파일을 삭제합니다. 이미 없으면 무시합니다."""
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
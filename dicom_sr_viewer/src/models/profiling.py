@@ -0,0 +1,350 @@
+"""
+프로파일링 모듈
+파이프라인 단계별 시간 구간(span)과 카운터를 기록하고 JSON 또는 플레임 그래프용 트레이스로 저장합니다.
+
+꺼져 있을 때는 span()이 미리 만든 빈 구간 객체를 반환하므로 거의 비용이 없습니다.
+환경 변수 DICOM_SR_PROFILE=1로 켜거나 profiler.enable()을 호출합니다.
+"""
+
+import json
+import os
+import threading
+import time
+
+class _NullSpan:
+    """프로파일링이 꺼져 있을 때 사용하는 아무 일도 하지 않는 구간"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+    
+    def count(self, name, value=1):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    """시작/종료 시각과 카운터를 기록하는 시간 구간"""
+    
+    __slots__ = ('profiler', 'name', 'counts', 'start', 'stack', 'child_time')
+    
+    def __init__(self, profiler, name, counts):
+        self.profiler = profiler
+        self.name = name
+        self.counts = counts
+        self.start = 0.0
+        self.stack = None
+        self.child_time = 0.0
+    
+    def __enter__(self):
+        stack = self.profiler._stack()
+        self.stack = tuple(span.name for span in stack) + (self.name,)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter()
+        stack = self.profiler._stack()
+        # 제너레이터 안의 구간은 다른 구간보다 늦게 닫힐 수 있으므로 자기 자신을 찾아 제거
+        if stack[-1] is self:
+            stack.pop()
+        else:
+            stack.remove(self)
+        duration = end - self.start
+        if stack:
+            stack[-1].child_time += duration
+        self.profiler._record(self, end, duration)
+        return False
+    
+    def count(self, name, value=1):
+        """
+        구간의 카운터를 증가시킵니다 (예: 아이템 수, bytes, 검색 결과 수).
+        
+        Args:
+            name (str): 카운터 이름
+            value (int, optional): 증가량
+        """
+        self.counts[name] = self.counts.get(name, 0) + value
+
+class Profiler:
+    """
+    단계별 시간 구간, 누적 시간과 카운터를 기록하는 프로파일러
+    
+    구간은 with profiler.span('이름'): 형태로 기록하며 스레드마다 중첩 관계를 유지합니다.
+    아이템마다 호출되는 짧은 구간은 add_time()으로 이름별 누적 시간만 기록합니다.
+    여러 스레드에서 동시에 사용할 수 있습니다.
+    """
+    
+    def __init__(self, enabled=False):
+        """
+        Profiler 클래스 초기화
+        
+        Args:
+            enabled (bool, optional): 기록 여부
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        # (이름, 시작, 길이, 자기 시간, 프로세스 ID, 스레드 ID, 스택, 카운터)
+        self._spans = []
+        self._counters = {}
+        # 이름 → [누적 시간, 호출 수]
+        self._times = {}
+    
+    def enable(self):
+        """기록을 시작합니다."""
+        self.enabled = True
+    
+    def disable(self):
+        """기록을 멈춥니다. 이미 기록된 내용은 유지됩니다."""
+        self.enabled = False
+    
+    def reset(self):
+        """기록된 구간, 누적 시간과 카운터를 모두 지웁니다."""
+        with self._lock:
+            self._spans = []
+            self._counters = {}
+            self._times = {}
+            self._origin = time.perf_counter()
+    
+    def now(self):
+        """
+        현재 시각을 반환합니다. summary(since=...)의 기준 시각으로 사용합니다.
+        
+        Returns:
+            float: perf_counter 시각
+        """
+        return time.perf_counter()
+    
+    def span(self, name, **counts):
+        """
+        시간 구간을 만듭니다.
+        
+        Args:
+            name (str): 구간 이름 (예: 'dcmread', 'index.text')
+            **counts: 구간의 초기 카운터
+        
+        Returns:
+            context manager: with 문에서 사용하는 구간 (꺼져 있으면 빈 구간)
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, counts)
+    
+    def count(self, name, value=1):
+        """
+        전역 카운터를 증가시킵니다.
+        
+        Args:
+            name (str): 카운터 이름
+            value (int, optional): 증가량
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+    
+    def add_time(self, name, seconds, calls=1):
+        """
+        이름별 누적 시간을 더합니다. 아이템마다 구간을 만들기에는 너무 짧은 작업에 사용합니다.
+        
+        Args:
+            name (str): 누적 시간 이름 (예: 'handler.TEXT')
+            seconds (float): 더할 시간 (초)
+            calls (int, optional): 더할 호출 수
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._times.get(name)
+            if entry is None:
+                self._times[name] = [seconds, calls]
+            else:
+                entry[0] += seconds
+                entry[1] += calls
+    
+    def _stack(self):
+        """현재 스레드의 열린 구간 스택을 반환합니다."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def _record(self, span, end, duration):
+        """끝난 구간을 기록합니다."""
+        with self._lock:
+            self._spans.append((span.name, span.start, duration, duration - span.child_time,
+                                os.getpid(), threading.get_ident(), span.stack, span.counts))
+    
+    def drain(self):
+        """
+        기록된 내용을 꺼내고 비웁니다. 작업 프로세스의 기록을 주 프로세스로 보낼 때 사용합니다.
+        
+        Returns:
+            dict: absorb()에 전달할 수 있는 기록 (pickle 가능)
+        """
+        with self._lock:
+            data = {'spans': self._spans, 'times': self._times, 'counters': self._counters}
+            self._spans = []
+            self._times = {}
+            self._counters = {}
+        return data
+    
+    def absorb(self, data):
+        """
+        다른 프로세스에서 drain()으로 꺼낸 기록을 합칩니다.
+        (perf_counter는 시스템 단조 시계이므로 같은 기기의 프로세스끼리 시각을 비교할 수 있음)
+        
+        Args:
+            data (dict): drain()의 반환값
+        """
+        with self._lock:
+            self._spans.extend(data['spans'])
+            for name, (seconds, calls) in data['times'].items():
+                entry = self._times.setdefault(name, [0.0, 0])
+                entry[0] += seconds
+                entry[1] += calls
+            for name, value in data['counters'].items():
+                self._counters[name] = self._counters.get(name, 0) + value
+    
+    def spans(self, since=None):
+        """
+        기록된 구간을 시작 시각 순서로 반환합니다.
+        
+        Args:
+            since (float, optional): 이 시각(now()) 이후에 시작한 구간만 반환
+        
+        Returns:
+            list: 구간 정보 dict 리스트 (시각은 프로파일러 기준 시각부터의 초)
+        """
+        with self._lock:
+            spans = list(self._spans)
+            origin = self._origin
+        spans.sort(key=lambda span: span[1])
+        return [{
+            'name': name,
+            'start': start - origin,
+            'duration': duration,
+            'self': self_time,
+            'process': process_id,
+            'thread': thread_id,
+            'stack': list(stack),
+            'counts': dict(counts),
+        } for name, start, duration, self_time, process_id, thread_id, stack, counts in spans
+            if since is None or start >= since]
+    
+    def summary(self, since=None):
+        """
+        구간 이름별 합계, 누적 시간과 카운터를 반환합니다.
+        
+        Args:
+            since (float, optional): 이 시각(now()) 이후에 시작한 구간만 합산 (누적 시간/카운터는 전체)
+        
+        Returns:
+            dict: {'stages': {이름: {seconds, calls, counts}}, 'times': {...}, 'counters': {...}}
+        """
+        stages = {}
+        for span in self.spans(since):
+            stage = stages.setdefault(span['name'], {'seconds': 0.0, 'calls': 0, 'counts': {}})
+            stage['seconds'] += span['duration']
+            stage['calls'] += 1
+            for key, value in span['counts'].items():
+                stage['counts'][key] = stage['counts'].get(key, 0) + value
+        
+        with self._lock:
+            times = {name: {'seconds': seconds, 'calls': calls} for name, (seconds, calls) in self._times.items()}
+            counters = dict(self._counters)
+        return {'stages': stages, 'times': times, 'counters': counters}
+    
+    def format_summary(self, since=None, limit=6):
+        """
+        상태 바에 표시할 한 줄 요약을 만듭니다 (오래 걸린 단계부터).
+        
+        Args:
+            since (float, optional): 이 시각(now()) 이후의 구간만 요약
+            limit (int, optional): 표시할 최대 단계 수
+        
+        Returns:
+            str: '단계 시간 · 단계 시간 ...' 형식의 요약
+        """
+        stages = self.summary(since)['stages']
+        ordered = sorted(stages.items(), key=lambda item: item[1]['seconds'], reverse=True)[:limit]
+        return ' · '.join(f"{name} {stage['seconds'] * 1000:.0f}ms" for name, stage in ordered)
+    
+    def to_dict(self):
+        """
+        기록 전체를 JSON으로 저장할 수 있는 dict로 반환합니다.
+        
+        Returns:
+            dict: {'spans': [...], 'summary': {...}}
+        """
+        return {'spans': self.spans(), 'summary': self.summary()}
+    
+    def dump_json(self, file_path):
+        """
+        기록 전체를 JSON 파일로 저장합니다.
+        
+        Args:
+            file_path (str): 저장할 파일 경로
+        """
+        with open(file_path, 'w', encoding='utf-8') as fp:
+            json.dump(self.to_dict(), fp, indent=2, ensure_ascii=False)
+    
+    def dump_chrome_trace(self, file_path):
+        """
+        구간을 Chrome 트레이스 이벤트 형식으로 저장합니다.
+        chrome://tracing, Perfetto, speedscope에서 타임라인과 플레임 그래프로 볼 수 있습니다.
+        
+        Args:
+            file_path (str): 저장할 파일 경로
+        """
+        events = [{
+            'name': span['name'],
+            'ph': 'X',
+            'ts': span['start'] * 1e6,
+            'dur': span['duration'] * 1e6,
+            'pid': span['process'],
+            'tid': span['thread'],
+            'args': span['counts'],
+        } for span in self.spans()]
+        with open(file_path, 'w', encoding='utf-8') as fp:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, fp)
+    
+    def dump_collapsed(self, file_path):
+        """
+        구간을 flamegraph.pl/speedscope가 읽는 접힌 스택 형식(스택;이름 자기시간us)으로 저장합니다.
+        
+        Args:
+            file_path (str): 저장할 파일 경로
+        """
+        totals = {}
+        for span in self.spans():
+            key = ';'.join(span['stack'])
+            totals[key] = totals.get(key, 0.0) + span['self']
+        with open(file_path, 'w', encoding='utf-8') as fp:
+            for key, seconds in sorted(totals.items()):
+                fp.write(f'{key} {int(seconds * 1e6)}\n')
+    
+    def dump(self, file_path):
+        """
+        파일 확장자에 따라 저장 형식을 골라 저장합니다.
+        ('.trace.json' 또는 '.trace' → Chrome 트레이스, '.folded'/'.collapsed' → 접힌 스택, 그 외 → JSON)
+        
+        Args:
+            file_path (str): 저장할 파일 경로
+        """
+        if file_path.endswith(('.trace.json', '.trace')):
+            self.dump_chrome_trace(file_path)
+        elif file_path.endswith(('.folded', '.collapsed')):
+            self.dump_collapsed(file_path)
+        else:
+            self.dump_json(file_path)
+
+# 애플리케이션 전체에서 공유하는 프로파일러
+profiler = Profiler(enabled=os.environ.get('DICOM_SR_PROFILE', '') not in ('', '0'))
@@ -3,6 +3,15 @@
 DICOM SR 데이터에서 텍스트 검색 기능을 제공합니다.
 """
 
+from models.profiling import profiler
+
+# search_by_code의 field 인자 → SRNode 코드 ID 슬롯
+CODE_FIELDS = {
+    'name': 'name_code',
+    'concept': 'concept_code',
+    'unit': 'unit_code',
+}
+
 class DicomSRSearcher:
     """DICOM SR 데이터에서 텍스트 검색 기능을 제공하는 클래스"""
     
@@ -24,20 +33,38 @@ class DicomSRSearcher:
         """
         self.sr_parser = sr_parser
     
-    def search(self, search_term):
+    def _ready(self):
+        """
+        검색할 트리가 있는지 확인합니다. 만들지 않은 노드나 검색 인덱스가 있으면 먼저 만듭니다.
+        
+        Returns:
+            bool: 검색할 수 있으면 True
+        """
+        if self.sr_parser is None or self.sr_parser.get_tree() is None:
+            return False
+        return self.sr_parser.ensure_searchable()
+    
+    def search(self, search_term, mode='substring'):
         """
         DICOM SR 데이터에서 텍스트를 검색합니다.
         
         Args:
             search_term (str): 검색할 텍스트
-            
+            mode (str, optional): 검색 방식
+                'substring' - 검색어를 포함하는 값 (기본값)
+                'exact' - 검색어의 모든 단어와 정확히 일치하는 단어가 있는 값
+                'prefix' - 검색어의 모든 단어로 시작하는 단어가 있는 값
+        
         Returns:
             list: 검색 결과 노드 리스트
         """
         if self.sr_parser is None:
             return []
         
-        return self.sr_parser.search_in_tree(search_term)
+        with profiler.span(f'search.{mode}') as span:
+            results = self.sr_parser.search_in_tree(search_term, mode)
+            span.count('matches', len(results))
+        return results
     
     def search_by_type(self, node_type):
         """
@@ -49,121 +76,191 @@ class DicomSRSearcher:
         Returns:
             list: 검색 결과 노드 리스트
         """
-        if self.sr_parser is None or self.sr_parser.get_tree() is None:
+        # advanced_search는 빈 조건을 '조건 없음'으로 보므로 빈 값은 여기서 처리
+        if not node_type:
             return []
-        
-        results = []
-        self._search_by_type_recursive(self.sr_parser.get_tree(), node_type.upper(), results)
-        return results
+        return self.advanced_search({'type': node_type})
     
-    def _search_by_type_recursive(self, node, node_type, results):
+    def search_by_relationship(self, relationship_type):
         """
-        노드에서 재귀적으로 특정 타입의 노드를 검색합니다.
+        특정 관계 타입의 노드를 검색합니다.
         
         Args:
-            node (dict): 검색할 노드
-            node_type (str): 검색할 노드 타입
-            results (list): 검색 결과를 저장할 리스트
-        """
-        # 현재 노드의 타입 확인
-        if 'type' in node and node['type'] == node_type:
-            results.append(node)
-        
-        # 자식 노드에서 재귀적으로 검색
-        if 'children' in node:
-            for child in node['children']:
-                self._search_by_type_recursive(child, node_type, results)
+            relationship_type (str): 검색할 관계 타입 (예: 'CONTAINS', 'HAS OBS CONTEXT')
+            
+        Returns:
+            list: 검색 결과 노드 리스트
+        """
+        # advanced_search는 빈 조건을 '조건 없음'으로 보므로 빈 값은 여기서 처리
+        if not relationship_type:
+            return []
+        return self.advanced_search({'relationship': relationship_type})
     
-    def search_by_relationship(self, relationship_type):
+    def search_by_code(self, code_value, coding_scheme=None, field='name'):
         """
-        특정 관계 타입의 노드를 검색합니다.
+        특정 코드를 가진 노드를 검색합니다.
+        
+        문서 코드 사전에서 코드 ID를 먼저 찾은 뒤 코드 ID별 버킷에서 노드를 가져옵니다.
         
         Args:
-            relationship_type (str): 검색할 관계 타입 (예: 'CONTAINS', 'HAS OBS CONTEXT')
+            code_value (str): 검색할 CodeValue (예: '121071')
+            coding_scheme (str, optional): CodingSchemeDesignator (예: 'DCM')
+            field (str, optional): 비교할 코드 ('name': ConceptName, 'concept': ConceptCode, 'unit': 측정 단위)
             
         Returns:
             list: 검색 결과 노드 리스트
         """
-        if self.sr_parser is None or self.sr_parser.get_tree() is None:
+        if not self._ready():
             return []
         
-        results = []
-        self._search_by_relationship_recursive(self.sr_parser.get_tree(), relationship_type.upper(), results)
-        return results
+        slot = CODE_FIELDS.get(field)
+        if slot is None:
+            raise ValueError(f"지원하지 않는 코드 필드입니다: {field}")
+        
+        code_ids = self.sr_parser.codes.find(code_value, coding_scheme)
+        node_ids = self.sr_parser.attribute_index.query({slot: code_ids})
+        return [self.sr_parser.nodes[i] for i in node_ids]
     
-    def _search_by_relationship_recursive(self, node, relationship_type, results):
+    def search_measurements(self, comparison, value, unit=None, concept_name=None):
         """
-        노드에서 재귀적으로 특정 관계 타입의 노드를 검색합니다.
+        수치 비교 조건을 만족하는 NUM 노드를 검색합니다 (예: Size > 10 mm).
+        
+        unit이 길이/넓이/부피 UCUM 단위이면 같은 차원의 측정값을 단위를 맞추어 비교하므로
+        '> 1 cm' 검색에 '15 mm' 측정값도 포함됩니다.
         
         Args:
-            node (dict): 검색할 노드
-            relationship_type (str): 검색할 관계 타입
-            results (list): 검색 결과를 저장할 리스트
-        """
-        # 현재 노드의 관계 타입 확인
-        if 'relationship' in node and node['relationship'] == relationship_type:
-            results.append(node)
-        
-        # 자식 노드에서 재귀적으로 검색
-        if 'children' in node:
-            for child in node['children']:
-                self._search_by_relationship_recursive(child, relationship_type, results)
+            comparison (str): 비교 연산자 ('<', '<=', '>', '>=', '=', '!=')
+            value (float): 기준값
+            unit (str, optional): 기준값의 UCUM 단위 (예: 'mm', 'cm2', 'mL', '%')
+            concept_name (str or tuple, optional): 측정 항목 CodeValue 또는 (CodeValue, CodingSchemeDesignator)
+        
+        Returns:
+            list: 검색 결과 노드 리스트
+        """
+        if not self._ready():
+            return []
+        
+        with profiler.span('search.measurements') as span:
+            node_ids = self._measurement_ids(concept_name, unit=unit, comparison=comparison, value=value)
+            span.count('matches', len(node_ids))
+        return [self.sr_parser.nodes[i] for i in node_ids]
+    
+    def search_measurement_range(self, minimum=None, maximum=None, unit=None, concept_name=None,
+                                 inclusive=True):
+        """
+        수치가 범위 안에 있는 NUM 노드를 검색합니다 (예: 5 mm 이상 10 mm 이하).
+        
+        Args:
+            minimum (float, optional): 하한 (None이면 제한 없음)
+            maximum (float, optional): 상한 (None이면 제한 없음)
+            unit (str, optional): 하한/상한의 UCUM 단위
+            concept_name (str or tuple, optional): 측정 항목 CodeValue 또는 (CodeValue, CodingSchemeDesignator)
+            inclusive (bool, optional): 하한과 상한을 포함할지 여부
+        
+        Returns:
+            list: 검색 결과 노드 리스트
+        """
+        if not self._ready():
+            return []
+        
+        with profiler.span('search.measurements') as span:
+            node_ids = self._measurement_ids(concept_name, unit=unit, minimum=minimum, maximum=maximum,
+                                             include_minimum=inclusive, include_maximum=inclusive)
+            span.count('matches', len(node_ids))
+        return [self.sr_parser.nodes[i] for i in node_ids]
+    
+    def _measurement_ids(self, concept_name=None, **conditions):
+        """
+        측정값 저장소에서 조건을 만족하는 노드 번호를 찾습니다.
+        
+        Args:
+            concept_name (str or tuple, optional): 측정 항목 CodeValue 또는 (CodeValue, CodingSchemeDesignator)
+            **conditions: MeasurementStore.query의 조건 인자
+        
+        Returns:
+            list: 오름차순 노드 번호 리스트
+        """
+        name_codes = None
+        if concept_name:
+            if isinstance(concept_name, str):
+                concept_name = (concept_name,)
+            name_codes = self.sr_parser.codes.find(*concept_name)
+            if not name_codes:
+                return []
+        return self.sr_parser.measurements.query(self.sr_parser.codes, name_codes=name_codes, **conditions)
     
     def advanced_search(self, criteria):
         """
         여러 기준으로 고급 검색을 수행합니다.
         
+        기준마다 미리 만든 버킷 인덱스에서 후보를 가져오고, 가장 작은 후보 집합을
+        기준으로 나머지 기준과의 교집합을 구합니다.
+        
         Args:
             criteria (dict): 검색 기준 (예: {'text': '검색어', 'type': 'TEXT', 'relationship': 'CONTAINS'})
+                'concept_name', 'concept_code' 기준에는 CodeValue 문자열 또는
+                (CodeValue, CodingSchemeDesignator) 튜플을 지정할 수 있습니다.
+                'numeric' 기준에는 (비교 연산자, 기준값) 또는 (비교 연산자, 기준값, UCUM 단위)
+                튜플을 지정합니다 (예: ('>', 10, 'mm')).
             
         Returns:
             list: 검색 결과 노드 리스트
         """
-        if self.sr_parser is None or self.sr_parser.get_tree() is None:
+        if not self._ready():
             return []
         
-        # 초기 결과는 모든 노드
-        all_nodes = []
-        self._collect_all_nodes(self.sr_parser.get_tree(), all_nodes)
-        
-        results = all_nodes
-        
-        # 텍스트 검색
-        if 'text' in criteria and criteria['text']:
-            text_results = []
-            for node in results:
-                if 'value' in node and isinstance(node['value'], str) and criteria['text'].lower() in node['value'].lower():
-                    text_results.append(node)
-            results = text_results
-        
-        # 타입 검색
-        if 'type' in criteria and criteria['type']:
-            type_results = []
-            for node in results:
-                if 'type' in node and node['type'] == criteria['type'].upper():
-                    type_results.append(node)
-            results = type_results
-        
-        # 관계 검색
-        if 'relationship' in criteria and criteria['relationship']:
-            rel_results = []
-            for node in results:
-                if 'relationship' in node and node['relationship'] == criteria['relationship'].upper():
-                    rel_results.append(node)
-            results = rel_results
-        
+        with profiler.span('search.advanced') as span:
+            results = self._advanced_search(criteria)
+            span.count('matches', len(results))
         return results
     
-    def _collect_all_nodes(self, node, nodes_list):
+    def _advanced_search(self, criteria):
         """
-        모든 노드를 수집합니다.
+        고급 검색 기준을 인덱스 조건으로 바꾸어 결과를 찾습니다.
         
         Args:
-            node (dict): 시작 노드
-            nodes_list (list): 노드를 저장할 리스트
+            criteria (dict): advanced_search와 같은 검색 기준
+        
+        Returns:
+            list: 검색 결과 노드 리스트
         """
-        nodes_list.append(node)
+        conditions = {}
+        
+        # 타입/관계 기준
+        if criteria.get('type'):
+            conditions['type'] = [criteria['type'].upper()]
+        if criteria.get('relationship'):
+            conditions['relationship'] = [criteria['relationship'].upper()]
+        
+        # 코드 기준
+        for key, slot in (('concept_name', 'name_code'), ('concept_code', 'concept_code')):
+            if criteria.get(key):
+                code = criteria[key]
+                if isinstance(code, str):
+                    code = (code,)
+                conditions[slot] = self.sr_parser.codes.find(*code)
+        
+        # 텍스트 기준은 역색인 결과를 후보로 사용
+        candidates = None
+        if criteria.get('text'):
+            candidates = self.sr_parser.text_index.search(criteria['text'])
+        
+        # 수치 기준은 측정값 저장소 결과를 후보로 사용 (텍스트 기준과 함께 쓰면 교집합)
+        if criteria.get('numeric'):
+            comparison, value, *unit = criteria['numeric']
+            node_ids = self._measurement_ids(unit=unit[0] if unit else None,
+                                             comparison=comparison, value=value)
+            if candidates is not None:
+                text_ids = set(candidates)
+                node_ids = [node_id for node_id in node_ids if node_id in text_ids]
+            candidates = node_ids
+        
+        if candidates is not None and not conditions:
+            return [self.sr_parser.nodes[i] for i in candidates]
+        
+        if not conditions and candidates is None:
+            # 기준이 없으면 모든 노드
+            return list(self.sr_parser.nodes)
         
-        if 'children' in node:
-            for child in node['children']:
-                self._collect_all_nodes(child, nodes_list)
+        node_ids = self.sr_parser.attribute_index.query(conditions, candidates)
+        return [self.sr_parser.nodes[i] for i in node_ids]
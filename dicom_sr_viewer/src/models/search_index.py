@@ -0,0 +1,291 @@
+"""
+검색 인덱스 모듈
+파싱된 DICOM SR 노드의 값 문자열 역색인과 속성별 버킷 인덱스를 제공합니다.
+"""
+
+from array import array
+import bisect
+import heapq
+import re
+
+# 값 문자열을 토큰으로 나눌 때 사용하는 패턴 (영문/숫자/한글 등 단어 문자)
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# 부분 문자열 검색에 사용하는 n-gram 길이
+NGRAM_SIZE = 3
+
+class TextIndex:
+    """
+    노드 값 문자열에 대한 역색인
+    
+    SR 문서에는 같은 값 문자열이 반복되는 경우가 많으므로 소문자로 정규화한 값 문자열을
+    한 번만 저장하고, 토큰 → 값 번호, n-gram → 값 번호 색인을 만듭니다.
+    검색은 색인에서 후보 값을 좁힌 뒤 후보만 확인하므로 트리 전체를 순회하지 않습니다.
+    
+    입력하는 대로 검색할 때처럼 부분 문자열 검색어가 직전 검색어를 포함하면
+    직전 결과 값들만 다시 확인하여 결과를 좁힙니다.
+    """
+    
+    # 직전 부분 문자열 검색 (소문자 검색어, 값 번호 리스트)
+    # 클래스 기본값으로 두어 이 속성이 없던 캐시 항목도 그대로 복원됨
+    _last_substring = None
+    
+    def __init__(self, nodes):
+        """
+        TextIndex 클래스 초기화
+        
+        Args:
+            nodes (list): 노드 번호(index) 순서의 노드 리스트
+        """
+        # 정규화된 값 문자열 → 그 값을 가진 노드 번호 리스트
+        value_nodes = {}
+        for node in nodes:
+            value = node.get('value')
+            if isinstance(value, str):
+                value_nodes.setdefault(value.lower(), []).append(node.index)
+        
+        self._values = list(value_nodes)
+        self._value_nodes = list(value_nodes.values())
+        
+        self._tokens = {}
+        self._ngrams = {}
+        for value_id, text in enumerate(self._values):
+            for token in set(TOKEN_PATTERN.findall(text)):
+                self._tokens.setdefault(token, []).append(value_id)
+            for ngram in {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}:
+                self._ngrams.setdefault(ngram, []).append(value_id)
+        
+        # 접두사 검색용 정렬된 토큰 목록
+        self._sorted_tokens = sorted(self._tokens)
+    
+    def search(self, search_term, mode='substring'):
+        """
+        검색어와 일치하는 노드 번호를 찾습니다.
+        
+        Args:
+            search_term (str): 검색할 텍스트 (대소문자 구분 없음)
+            mode (str, optional): 검색 방식
+                'substring' - 값 문자열에 검색어가 포함된 노드 (기존 검색과 동일)
+                'exact' - 검색어의 모든 단어가 값의 단어와 정확히 일치하는 노드
+                'prefix' - 검색어의 모든 단어로 시작하는 단어가 값에 있는 노드
+        
+        Returns:
+            list: 오름차순 노드 번호 리스트
+        """
+        search_term = search_term.lower()
+        
+        if mode == 'substring':
+            previous = self._last_substring
+            if previous is not None and previous[0] in search_term:
+                # 검색어가 길어지면 결과는 직전 결과의 부분집합
+                value_ids = [value_id for value_id in previous[1] if search_term in self._values[value_id]]
+            else:
+                value_ids = self._search_substring(search_term)
+            self._last_substring = (search_term, value_ids)
+        elif mode == 'exact':
+            value_ids = self._search_tokens(search_term, self._exact_postings)
+        elif mode == 'prefix':
+            value_ids = self._search_tokens(search_term, self._prefix_postings)
+        else:
+            raise ValueError(f"지원하지 않는 검색 방식입니다: {mode}")
+        
+        node_ids = []
+        for value_id in value_ids:
+            node_ids.extend(self._value_nodes[value_id])
+        node_ids.sort()
+        return node_ids
+    
+    def forget_last_search(self):
+        """직전 검색 결과를 잊어 다음 검색이 결과를 좁히지 않고 색인에서 새로 찾도록 합니다."""
+        self._last_substring = None
+    
+    def _search_substring(self, search_term):
+        """
+        검색어를 부분 문자열로 포함하는 값 번호를 찾습니다.
+        
+        Args:
+            search_term (str): 소문자로 정규화된 검색어
+        
+        Returns:
+            iterable: 값 번호
+        """
+        if len(search_term) < NGRAM_SIZE:
+            # n-gram보다 짧은 검색어는 서로 다른 값 문자열만 확인
+            return [value_id for value_id, text in enumerate(self._values) if search_term in text]
+        
+        ngrams = {search_term[i:i + NGRAM_SIZE] for i in range(len(search_term) - NGRAM_SIZE + 1)}
+        postings = []
+        for ngram in ngrams:
+            posting = self._ngrams.get(ngram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        
+        # 가장 짧은 목록을 후보로 삼고 나머지와 교집합한 뒤 실제 포함 여부 확인
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        
+        return [value_id for value_id in candidates if search_term in self._values[value_id]]
+    
+    def _search_tokens(self, search_term, postings_for):
+        """
+        검색어의 모든 단어를 만족하는 값 번호를 찾습니다.
+        
+        Args:
+            search_term (str): 소문자로 정규화된 검색어
+            postings_for (callable): 단어 하나에 대한 값 번호 집합을 반환하는 함수
+        
+        Returns:
+            set: 값 번호 집합
+        """
+        tokens = TOKEN_PATTERN.findall(search_term)
+        if not tokens:
+            return set()
+        
+        result = None
+        for token in tokens:
+            value_ids = postings_for(token)
+            result = value_ids if result is None else result & value_ids
+            if not result:
+                return set()
+        return result
+    
+    def _exact_postings(self, token):
+        """단어와 정확히 일치하는 토큰을 가진 값 번호 집합을 반환합니다."""
+        return set(self._tokens.get(token, ()))
+    
+    def _prefix_postings(self, token):
+        """단어로 시작하는 토큰을 가진 값 번호 집합을 반환합니다."""
+        value_ids = set()
+        start = bisect.bisect_left(self._sorted_tokens, token)
+        for i in range(start, len(self._sorted_tokens)):
+            candidate = self._sorted_tokens[i]
+            if not candidate.startswith(token):
+                break
+            value_ids.update(self._tokens[candidate])
+        return value_ids
+
+# AttributeIndex가 버킷을 만드는 SRNode 속성
+INDEX_FIELDS = ('type', 'relationship', 'name_code', 'concept_code', 'unit_code')
+
+class AttributeIndex:
+    """
+    노드 속성별 버킷 인덱스
+    
+    ValueType, RelationshipType, 개념 이름/개념 값/단위 코드 ID마다 해당 노드 번호를
+    오름차순 array로 저장합니다. 또한 노드 번호로 각 속성 값을 바로 확인할 수 있는
+    열(column) array를 함께 유지하므로, 여러 조건을 결합할 때 가장 작은 버킷만 훑으면서
+    나머지 조건은 열 값을 비교하여 교집합을 구합니다.
+    """
+    
+    def __init__(self, nodes):
+        """
+        AttributeIndex 클래스 초기화
+        
+        Args:
+            nodes (list): 노드 번호(index) 순서의 SRNode 리스트
+        """
+        # 속성 값(문자열 또는 코드 ID) → 속성별 연속 번호
+        self._key_ids = {field: {} for field in INDEX_FIELDS}
+        # 노드 번호 → 속성별 연속 번호 (-1은 값 없음)
+        self._columns = {field: array('i') for field in INDEX_FIELDS}
+        # 속성별 연속 번호 → 노드 번호 array
+        self._buckets = {field: [] for field in INDEX_FIELDS}
+        
+        for node in nodes:
+            for field in INDEX_FIELDS:
+                key = getattr(node, field)
+                if key is None:
+                    self._columns[field].append(-1)
+                    continue
+                
+                key_ids = self._key_ids[field]
+                key_id = key_ids.get(key)
+                if key_id is None:
+                    key_id = len(key_ids)
+                    key_ids[key] = key_id
+                    self._buckets[field].append(array('I'))
+                self._columns[field].append(key_id)
+                self._buckets[field][key_id].append(node.index)
+    
+    def keys(self, field):
+        """
+        속성에 나타나는 모든 값을 반환합니다.
+        
+        Args:
+            field (str): INDEX_FIELDS 중 하나
+        
+        Returns:
+            list: 속성 값 리스트
+        """
+        return list(self._key_ids[field])
+    
+    def count(self, field, key):
+        """
+        속성 값이 key인 노드 수를 반환합니다.
+        
+        Args:
+            field (str): INDEX_FIELDS 중 하나
+            key: 속성 값 (문자열 또는 코드 ID)
+        
+        Returns:
+            int: 노드 수
+        """
+        key_id = self._key_ids[field].get(key)
+        return 0 if key_id is None else len(self._buckets[field][key_id])
+    
+    def query(self, conditions, candidates=None):
+        """
+        모든 조건을 만족하는 노드 번호를 찾습니다.
+        
+        각 조건은 속성 하나와 허용하는 값들의 집합이며, 조건끼리는 AND로 결합됩니다.
+        가장 작은 후보 집합을 기준으로 나머지 조건을 확인합니다.
+        
+        Args:
+            conditions (dict): 속성 이름 → 허용하는 속성 값들 (iterable)
+            candidates (list, optional): 미리 좁힌 오름차순 노드 번호 (예: 텍스트 검색 결과)
+        
+        Returns:
+            list: 오름차순 노드 번호 리스트
+        """
+        # (후보 수, 속성 이름, 허용하는 연속 번호 집합)
+        resolved = []
+        for field, keys in conditions.items():
+            key_ids = self._key_ids[field]
+            allowed = {key_ids[key] for key in keys if key in key_ids}
+            if not allowed:
+                return []
+            size = sum(len(self._buckets[field][key_id]) for key_id in allowed)
+            resolved.append((size, field, allowed))
+        
+        if candidates is not None:
+            resolved.append((len(candidates), None, None))
+        if not resolved:
+            return []
+        
+        resolved.sort(key=lambda condition: condition[0])
+        _, base_field, base_allowed = resolved[0]
+        
+        if base_field is None:
+            base = candidates
+        elif len(base_allowed) == 1:
+            base = self._buckets[base_field][next(iter(base_allowed))]
+        else:
+            base = heapq.merge(*(self._buckets[base_field][key_id] for key_id in base_allowed))
+        
+        checks = [(self._columns[field], allowed) for _, field, allowed in resolved[1:] if field is not None]
+        candidate_set = None
+        if candidates is not None and base_field is not None:
+            candidate_set = set(candidates)
+        
+        results = []
+        for node_id in base:
+            if candidate_set is not None and node_id not in candidate_set:
+                continue
+            if all(column[node_id] in allowed for column, allowed in checks):
+                results.append(node_id)
+        return results
@@ -0,0 +1,197 @@
+"""
+SR 번들 모듈
+여러 DICOM 파일을 묶은 zip/tar 번들을 디스크에 풀지 않고 멤버 단위로 읽으며,
+파일 메타 정보의 SOP Class UID로 SR 인스턴스만 골라냅니다.
+"""
+
+import logging
+import struct
+
+# 번들로 취급하는 파일 확장자
+BUNDLE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+# 번들 경로와 멤버 이름을 잇는 구분자 (예: "bundle.zip!/DICOM/IM0001")
+MEMBER_SEPARATOR = '!/'
+
+# SR 저장 SOP Class UID 접두사 (Basic Text SR, Enhanced SR, Comprehensive SR, Key Object Selection,
+# 선량 보고서, CAD SR 등 SR 계열 SOP Class는 모두 이 접두사로 시작)
+SR_SOP_CLASS_PREFIX = '1.2.840.10008.5.1.4.1.1.88.'
+
+# 파일 메타 정보에서 값 길이를 4 bytes로 기록하는 VR (Explicit VR Little Endian)
+LONG_VRS = {b'OB', b'OD', b'OF', b'OL', b'OV', b'OW', b'SQ', b'SV', b'UC', b'UN', b'UR', b'UT', b'UV'}
+
+# 파일 메타 정보를 찾을 때 읽는 최대 크기 (bytes) - 헤더가 비정상적으로 크면 SR이 아닌 것으로 처리
+MAX_HEADER_SIZE = 64 * 1024
+
+# MediaStorageSOPClassUID (0002,0002)
+MEDIA_STORAGE_SOP_CLASS_UID = (0x0002, 0x0002)
+
+def is_bundle(path):
+    """
+    파일 이름으로 번들(zip/tar) 여부를 판단합니다.
+    
+    Args:
+        path (str): 파일 경로
+    
+    Returns:
+        bool: 번들 여부
+    """
+    return path.lower().endswith(BUNDLE_EXTENSIONS)
+
+def member_path(bundle_path, member_name):
+    """
+    번들 경로와 멤버 이름을 결과에 기록할 하나의 경로 문자열로 만듭니다.
+    
+    Args:
+        bundle_path (str): 번들 파일 경로
+        member_name (str): 번들 안의 멤버 이름
+    
+    Returns:
+        str: "번들 경로!/멤버 이름" 형식 문자열
+    """
+    return f'{bundle_path}{MEMBER_SEPARATOR}{member_name}'
+
+def is_sr_sop_class(sop_class_uid):
+    """
+    SOP Class UID가 SR 계열 저장 SOP Class인지 확인합니다.
+    
+    Args:
+        sop_class_uid (str): SOP Class UID
+    
+    Returns:
+        bool: SR 여부
+    """
+    return sop_class_uid is not None and sop_class_uid.startswith(SR_SOP_CLASS_PREFIX)
+
+def _read_exact(stream, size, header):
+    """스트림에서 size bytes를 읽어 header에 덧붙입니다. 스트림이 먼저 끝나면 False를 반환합니다."""
+    while size > 0:
+        chunk = stream.read(size)
+        if not chunk:
+            return False
+        header += chunk
+        size -= len(chunk)
+    return True
+
+def read_sop_class_uid(stream):
+    """
+    스트림 앞부분의 파일 메타 정보만 읽어 MediaStorageSOPClassUID를 찾습니다.
+    
+    파일 메타 정보(0002 그룹)는 항상 Explicit VR Little Endian이므로 pydicom 없이 직접 읽습니다.
+    이미 읽은 bytes는 버리지 않고 돌려주므로 스트림을 다시 열지 않고 나머지를 이어 읽을 수 있습니다.
+    
+    Args:
+        stream: 읽기 가능한 바이너리 스트림 (파일 처음에 위치)
+    
+    Returns:
+        tuple: (읽은 bytes (bytearray), SOP Class UID 또는 None (DICOM 파일이 아니거나 UID가 없는 경우))
+    """
+    header = bytearray()
+    if not _read_exact(stream, 132, header) or header[128:132] != b'DICM':
+        return header, None
+    
+    while len(header) < MAX_HEADER_SIZE:
+        start = len(header)
+        if not _read_exact(stream, 8, header):
+            return header, None
+        group, elem = struct.unpack_from('<HH', header, start)
+        if group != 0x0002:
+            # 파일 메타 정보가 끝남
+            return header, None
+        
+        vr = bytes(header[start + 4:start + 6])
+        if vr in LONG_VRS:
+            if not _read_exact(stream, 4, header):
+                return header, None
+            length = struct.unpack_from('<I', header, start + 8)[0]
+        else:
+            length = struct.unpack_from('<H', header, start + 6)[0]
+        
+        value_start = len(header)
+        if length > MAX_HEADER_SIZE or not _read_exact(stream, length, header):
+            return header, None
+        if (group, elem) == MEDIA_STORAGE_SOP_CLASS_UID:
+            uid = bytes(header[value_start:value_start + length]).rstrip(b'\x00 ').decode('ascii', 'replace')
+            return header, uid
+    return header, None
+
+class BundleReader:
+    """
+    zip/tar 번들의 멤버를 디스크에 풀지 않고 순서대로 읽는 클래스
+    
+    멤버마다 파일 메타 정보까지만 읽어 SR이 아닌 멤버(영상, DICOMDIR 등)는 나머지를 읽지 않고
+    건너뜁니다. tar 번들은 스트림 모드로 열기 때문에 압축된 tar도 앞에서부터 한 번만 읽습니다.
+    """
+    
+    def __init__(self, bundle_path, sr_only=True):
+        """
+        BundleReader 클래스 초기화
+        
+        Args:
+            bundle_path (str): 번들 파일 경로
+            sr_only (bool, optional): SR 계열 SOP Class 멤버만 반환할지 여부
+        """
+        self.logger = logging.getLogger('BundleReader')
+        self.bundle_path = bundle_path
+        self.sr_only = sr_only
+        # 읽은 파일 멤버 수와 SOP Class로 걸러 낸 멤버 수
+        self.member_count = 0
+        self.skipped_count = 0
+    
+    def __iter__(self):
+        """
+        조건을 만족하는 멤버의 내용을 읽어 반환합니다.
+        
+        Yields:
+            tuple: (멤버 이름, 멤버 내용 (bytearray))
+        """
+        for name, size, stream in self._members():
+            self.member_count += 1
+            header, sop_class_uid = read_sop_class_uid(stream)
+            if self.sr_only and not is_sr_sop_class(sop_class_uid):
+                self.skipped_count += 1
+                self.logger.debug(f"SR이 아닌 멤버 건너뜀: {name} ({sop_class_uid})")
+                continue
+            
+            # 헤더는 그대로 두고 나머지를 같은 버퍼에 이어 읽어 멤버 내용을 한 번만 복사
+            data = bytearray(max(size, len(header)))
+            data[:len(header)] = header
+            view = memoryview(data)
+            position = len(header)
+            while position < size:
+                count = stream.readinto(view[position:])
+                if not count:
+                    break
+                position += count
+            view.release()
+            if position < len(data):
+                del data[position:]
+            yield name, data
+    
+    def _members(self):
+        """
+        번들의 일반 파일 멤버를 순서대로 엽니다.
+        
+        Yields:
+            tuple: (멤버 이름, 멤버 크기, 읽기 스트림)
+        """
+        # 번들을 처리하지 않는 명령의 시작 시간을 늘리지 않도록 처음 읽을 때 임포트
+        import tarfile
+        import zipfile
+        
+        if zipfile.is_zipfile(self.bundle_path):
+            with zipfile.ZipFile(self.bundle_path) as bundle:
+                for info in bundle.infolist():
+                    if info.is_dir():
+                        continue
+                    with bundle.open(info) as stream:
+                        yield info.filename, info.file_size, stream
+            return
+        
+        # 스트림 모드('r|*')는 탐색 없이 앞에서부터 읽으며 압축 형식은 자동으로 판별
+        with open(self.bundle_path, 'rb') as fp, tarfile.open(fileobj=fp, mode='r|*') as bundle:
+            for member in bundle:
+                if not member.isfile():
+                    continue
+                stream = bundle.extractfile(member)
+                yield member.name, member.size, stream
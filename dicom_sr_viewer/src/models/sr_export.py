@@ -0,0 +1,339 @@
+"""
+내보내기 모듈
+파싱된 SR 트리를 중첩 JSON, DICOM JSON 모델, 아이템별 행(JSONL/CSV)으로 내보냅니다.
+트리와 출력 문자열 전체를 메모리에 만들지 않고 노드(요소)마다 바로 출력 스트림에 씁니다.
+"""
+
+import csv
+import json
+import struct
+
+from models.dicom_sr_parser import walk_tree
+from models.sr_extractor import ASCII_VRS, BINARY_VRS, TEXT_VRS, text_encoding
+from models.sr_tree import format_path
+
+# 내보내기 형식 → 설명
+EXPORT_FORMATS = {
+    'json': '중첩 JSON 트리',
+    'dicom-json': 'DICOM JSON 모델 (PS3.18 F.2)',
+    'jsonl': '아이템별 JSON 줄',
+    'csv': '아이템별 CSV 행',
+}
+
+# 내보내기 형식 → 저장할 때의 기본 확장자
+DEFAULT_EXTENSIONS = {
+    'json': '.json',
+    'dicom-json': '.dcm.json',
+    'jsonl': '.jsonl',
+    'csv': '.csv',
+}
+
+# 파일 확장자 → 내보내기 형식 (긴 확장자부터 비교)
+FORMAT_EXTENSIONS = (
+    ('.dcm.json', 'dicom-json'),
+    ('.dicom.json', 'dicom-json'),
+    ('.jsonl', 'jsonl'),
+    ('.csv', 'csv'),
+    ('.json', 'json'),
+)
+
+# 아이템별 행의 열 (CSV 헤더 순서)
+ROW_COLUMNS = (
+    'SOPInstanceUID', 'file', 'archive', 'member', 'path', 'depth',
+    'id', 'type', 'relationship', 'value', 'numeric', 'reference',
+    'NameCodeValue', 'NameCodingSchemeDesignator', 'NameCodeMeaning',
+    'CodeValue', 'CodingSchemeDesignator', 'CodeMeaning',
+    'UnitCodeValue', 'UnitCodingSchemeDesignator', 'UnitCodeMeaning',
+)
+
+# DICOM JSON에서 숫자로 기록하는 문자열 VR → 변환 함수
+NUMBER_STRING_VRS = {'DS': float, 'IS': int}
+
+# 백슬래시를 값 구분자로 쓰지 않는 문자열 VR (하나의 값)
+SINGLE_VALUE_VRS = frozenset(('LT', 'ST', 'UT', 'UR'))
+
+# 바이트를 직접 JSON 값으로 바꾸는 문자열 VR (PN은 구성 요소 객체로 기록하므로 pydicom 변환 사용)
+DIRECT_TEXT_VRS = (ASCII_VRS | TEXT_VRS | {'UR'}) - {'PN'}
+
+def format_for_path(file_path, default='jsonl'):
+    """
+    출력 파일 이름의 확장자로 내보내기 형식을 정합니다.
+    
+    Args:
+        file_path (str): 출력 파일 경로
+        default (str, optional): 알 수 없는 확장자일 때의 형식
+    
+    Returns:
+        str: EXPORT_FORMATS의 형식 이름
+    """
+    lower = file_path.lower()
+    for extension, export_format in FORMAT_EXTENSIONS:
+        if lower.endswith(extension):
+            return export_format
+    return default
+
+def item_record(sop_instance_uid, source, path, depth, node, fields=None):
+    """
+    노드 하나를 아이템별 행 dict로 변환합니다.
+    
+    Args:
+        sop_instance_uid (str): 문서의 SOPInstanceUID
+        source (str): 문서의 파일 경로 (또는 번들 멤버/메모리 문서 이름)
+        path (tuple): 콘텐츠 아이템 위치
+        depth (int): 루트를 0으로 하는 깊이
+        node (SRNode): 노드
+        fields (dict, optional): 함께 기록할 문서 단위 필드 (예: 'archive', 'member')
+    
+    Returns:
+        dict: 행 dict
+    """
+    record = {
+        'SOPInstanceUID': sop_instance_uid,
+        'file': source,
+        'path': format_path(path),
+        'depth': depth,
+    }
+    if fields:
+        record.update(fields)
+    record.update(node.to_dict())
+    return record
+
+class SRExportWriter:
+    """
+    SR 문서들을 하나의 출력 스트림으로 내보내는 클래스
+    
+    begin()으로 시작하고 문서마다 write_document()를 호출한 뒤 end()로 마칩니다.
+    중첩 JSON과 DICOM JSON은 문서들의 JSON 배열로, JSONL/CSV는 모든 문서의 아이템 행으로 출력합니다.
+    트리는 명시적 스택으로 순회하므로 중첩 깊이에 제한이 없고, 메모리는 트리 깊이만큼만 사용합니다.
+    """
+    
+    def __init__(self, out, export_format):
+        """
+        SRExportWriter 클래스 초기화
+        
+        Args:
+            out: 텍스트 출력 스트림 (CSV는 newline=''로 연 파일)
+            export_format (str): EXPORT_FORMATS의 형식 이름
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 내보내기 형식입니다: {export_format}")
+        self.out = out
+        self.export_format = export_format
+        self.document_count = 0
+        self._csv = None
+    
+    @property
+    def needs_dataset(self):
+        """파싱된 트리 대신 pydicom 데이터셋이 필요한 형식인지 여부 (DICOM JSON)"""
+        return self.export_format == 'dicom-json'
+    
+    def begin(self):
+        """출력을 시작합니다 (JSON 배열 시작 또는 CSV 헤더)."""
+        if self.export_format in ('json', 'dicom-json'):
+            self.out.write('[')
+        elif self.export_format == 'csv':
+            self._csv = csv.DictWriter(self.out, ROW_COLUMNS, extrasaction='ignore')
+            self._csv.writeheader()
+    
+    def end(self):
+        """출력을 마칩니다 (JSON 배열 끝)."""
+        if self.export_format in ('json', 'dicom-json'):
+            self.out.write(']\n')
+    
+    def write_document(self, sr_parser, fields=None):
+        """
+        로드된 문서 하나를 씁니다.
+        
+        DICOM JSON은 sr_parser.dataset을, 나머지 형식은 파싱된 트리(sr_parser.get_tree())를 사용합니다.
+        깊이/너비 제한 파싱으로 만들지 않은 노드가 있으면 먼저 모두 만듭니다.
+        
+        Args:
+            sr_parser (DicomSRParser): 문서를 로드한 파서
+            fields (dict, optional): 문서와 함께 기록할 필드 (예: 번들 경로 'archive'와 멤버 이름 'member')
+        
+        Returns:
+            int: 기록한 항목 수 (DICOM JSON은 데이터셋 수, 나머지는 노드 수)
+        """
+        if self.needs_dataset:
+            if sr_parser.dataset is None:
+                raise ValueError("DICOM JSON 내보내기에는 로드된 데이터셋이 필요합니다")
+        elif sr_parser.get_tree() is None:
+            raise ValueError("내보낼 파싱된 트리가 없습니다")
+        
+        if not self.needs_dataset and not sr_parser.is_complete():
+            sr_parser.finish_parse()
+            if not sr_parser.is_complete():
+                raise ValueError("데이터셋이 해제되어 트리를 완성할 수 없습니다")
+        
+        # JSON 배열의 두 번째 문서부터 구분자
+        if self.document_count and self.export_format in ('json', 'dicom-json'):
+            self.out.write(',\n')
+        
+        if self.needs_dataset:
+            count = self._write_dataset(sr_parser.dataset)
+        elif self.export_format == 'json':
+            count = self._write_tree(sr_parser.get_tree(), sr_parser.sop_instance_uid, sr_parser.file_path, fields)
+        else:
+            count = self._write_rows(sr_parser.get_tree(), sr_parser.sop_instance_uid, sr_parser.file_path, fields)
+        self.document_count += 1
+        return count
+    
+    def _write_rows(self, tree, sop_instance_uid, source, fields):
+        """문서의 아이템별 행을 JSONL 또는 CSV로 씁니다."""
+        write = self.out.write
+        count = 0
+        for path, depth, node in walk_tree(tree):
+            record = item_record(sop_instance_uid, source, path, depth, node, fields)
+            if self._csv is not None:
+                self._csv.writerow(record)
+            else:
+                write(json.dumps(record, ensure_ascii=False))
+                write('\n')
+            count += 1
+        return count
+    
+    def _write_tree(self, tree, sop_instance_uid, source, fields):
+        """
+        문서를 {"SOPInstanceUID", "file", ..., "content": 루트 노드} 형식의 중첩 JSON으로 씁니다.
+        
+        노드마다 'children'을 제외한 필드를 먼저 쓰고, 자식 노드를 모두 쓴 뒤 닫는 괄호를 씁니다.
+        """
+        write = self.out.write
+        header = {'SOPInstanceUID': sop_instance_uid, 'file': source}
+        if fields:
+            header.update(fields)
+        write(json.dumps(header, ensure_ascii=False)[:-1] + ', "content": ')
+        
+        write(self._node_head(tree))
+        count = 1
+        # (자식 노드 반복자, 이미 쓴 자식이 있는지 여부)
+        stack = [[iter(tree.children), False]]
+        while stack:
+            frame = stack[-1]
+            child = next(frame[0], None)
+            if child is None:
+                stack.pop()
+                write(']}')
+                continue
+            if frame[1]:
+                write(', ')
+            frame[1] = True
+            write(self._node_head(child))
+            count += 1
+            stack.append([iter(child.children), False])
+        write('}')
+        return count
+    
+    @staticmethod
+    def _node_head(node):
+        """노드의 필드와 자식 배열의 시작 부분 ('{..., "children": [')을 반환합니다."""
+        fields = json.dumps(node.to_dict(), ensure_ascii=False)
+        separator = ', ' if len(fields) > 2 else ''
+        return f'{fields[:-1]}{separator}"children": ['
+    
+    def _write_dataset(self, dataset):
+        """
+        pydicom 데이터셋을 DICOM JSON 모델로 씁니다 (파일 메타 정보 제외).
+        
+        시퀀스는 명시적 스택으로 아이템을 하나씩 쓰므로 ContentSequence 중첩 깊이에 제한이 없습니다.
+        아직 변환되지 않은 문자열/2진 수치 요소는 바이트에서 바로 JSON 값을 만들어 데이터셋에
+        변환된 요소가 쌓이지 않으며, 그 밖의 요소는 DataElement.to_json_dict()를 사용합니다.
+        바이너리 값은 InlineBinary(Base64)로 기록합니다.
+        """
+        write = self.out.write
+        write('{')
+        count = 1
+        encoding = text_encoding(dataset.get('SpecificCharacterSet'))
+        # (데이터셋, 반복자, 이미 쓴 항목이 있는지 여부, 닫는 문자열, 문자열 인코딩)
+        # 반복자는 데이터셋의 (태그, 요소) 또는 시퀀스의 아이템 (닫는 문자열이 '}'이면 데이터셋)
+        stack = [[dataset, iter(dataset.items()), False, '}', encoding]]
+        while stack:
+            frame = stack[-1]
+            entry = next(frame[1], None)
+            if entry is None:
+                stack.pop()
+                write(frame[3])
+                continue
+            if frame[2]:
+                write(',')
+            frame[2] = True
+            
+            if frame[3] != '}':
+                # 시퀀스의 아이템 - 아이템에 SpecificCharacterSet이 있으면 pydicom의 디코딩을 사용
+                write('{')
+                count += 1
+                item_encoding = None if 0x0008_0005 in entry else frame[4]
+                stack.append([entry, iter(entry.items()), False, '}', item_encoding])
+                continue
+            
+            tag, element = entry
+            if element.VR == 'SQ':
+                if getattr(element, 'is_raw', False):
+                    element = frame[0][tag]
+                write(f'"{tag:08X}":{{"vr":"SQ"')
+                if element.value:
+                    write(',"Value":[')
+                    stack.append([None, iter(element.value), False, ']}', frame[4]])
+                else:
+                    write('}')
+                continue
+            
+            value = _raw_json_value(element, frame[4])
+            if value is None:
+                value = frame[0][tag].to_json_dict(None, 0)
+            write(f'"{tag:08X}":{json.dumps(value, ensure_ascii=False)}')
+        return count
+
+def _raw_json_value(element, encoding):
+    """
+    아직 변환되지 않은 요소의 바이트에서 DICOM JSON 값 객체를 만듭니다.
+    
+    Args:
+        element: RawDataElement 또는 DataElement
+        encoding (str): 문자열 요소의 파이썬 인코딩 (None이면 ASCII VR만 직접 변환)
+    
+    Returns:
+        dict: {"vr": VR, "Value": [...]} 또는 None (pydicom 변환을 사용해야 하는 경우)
+    """
+    if not getattr(element, 'is_raw', False):
+        return None
+    raw = element.value
+    vr = element.VR
+    if not isinstance(raw, bytes):
+        return None
+    if not raw:
+        return {'vr': vr}
+    
+    if vr in BINARY_VRS:
+        code, size = BINARY_VRS[vr]
+        if len(raw) % size:
+            return None
+        order = '<' if element.is_little_endian else '>'
+        return {'vr': vr, 'Value': list(struct.unpack(f'{order}{len(raw) // size}{code}', raw))}
+    
+    if vr not in DIRECT_TEXT_VRS:
+        return None
+    if vr in ASCII_VRS:
+        text = raw.decode('ascii', 'replace')
+    elif encoding is not None:
+        text = raw.decode(encoding, 'replace')
+    else:
+        return None
+    
+    if vr in SINGLE_VALUE_VRS:
+        values = [text.rstrip(' \0')]
+    else:
+        values = [value.strip(' \0') for value in text.split('\\')]
+    if not any(values):
+        return {'vr': vr}
+    if '' in values:
+        # 빈 값이 섞인 다중 값은 pydicom과 같은 형식(null)으로 기록하도록 pydicom 변환 사용
+        return None
+    
+    number = NUMBER_STRING_VRS.get(vr)
+    if number is not None:
+        try:
+            values = [number(value) for value in values]
+        except ValueError:
+            return None
+    return {'vr': vr, 'Value': values}
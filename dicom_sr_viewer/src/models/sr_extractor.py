@@ -0,0 +1,448 @@
+"""
+콘텐츠 아이템 추출 모듈
+DICOM SR 콘텐츠 아이템의 요소를 태그로 직접 읽어 SRNode를 만드는 표 기반 추출기를 제공합니다.
+"""
+
+import math
+import struct
+import sys
+
+from models.sr_tree import SRNode, format_path
+
+# 콘텐츠 아이템에서 읽는 요소 태그 → 필드 이름
+ITEM_FIELDS = {
+    0x0008_1199: 'referenced_sop',       # ReferencedSOPSequence (IMAGE, COMPOSITE, WAVEFORM)
+    0x0040_A010: 'relationship',         # RelationshipType
+    0x0040_A040: 'value_type',           # ValueType
+    0x0040_A043: 'name',                 # ConceptNameCodeSequence
+    0x0040_A120: 'scalar',               # DateTime
+    0x0040_A121: 'scalar',               # Date
+    0x0040_A122: 'scalar',               # Time
+    0x0040_A123: 'scalar',               # PersonName
+    0x0040_A124: 'scalar',               # UID
+    0x0040_A130: 'temporal_range_type',  # TemporalRangeType
+    0x0040_A132: 'temporal_points',      # ReferencedSamplePositions
+    0x0040_A138: 'temporal_points',      # ReferencedTimeOffsets
+    0x0040_A13A: 'temporal_points',      # ReferencedDateTime
+    0x0040_A160: 'text',                 # TextValue
+    0x0040_A168: 'concept',              # ConceptCodeSequence
+    0x0040_A300: 'measured',             # MeasuredValueSequence
+    0x0040_A730: 'children',             # ContentSequence
+    0x0040_DB73: 'reference',            # ReferencedContentItemIdentifier (by-reference 관계)
+    0x0070_0022: 'graphic_data',         # GraphicData
+    0x0070_0023: 'graphic_type',         # GraphicType
+}
+
+# 코드 아이템 요소 태그 → 코드 튜플 안의 위치
+CODE_FIELDS = {
+    0x0008_0100: 0,   # CodeValue
+    0x0008_0102: 1,   # CodingSchemeDesignator
+    0x0008_0104: 2,   # CodeMeaning
+    0x0008_0119: 0,   # LongCodeValue
+    0x0008_0120: 0,   # URNCodeValue
+}
+
+# MeasuredValueSequence 아이템 요소 태그 → 필드 이름
+MEASURED_FIELDS = {
+    0x0040_08EA: 'unit',                 # MeasurementUnitsCodeSequence
+    0x0040_A161: 'floating',             # FloatingPointValue
+    0x0040_A30A: 'numeric',              # NumericValue
+}
+
+# ReferencedSOPSequence 아이템 요소 태그 → 필드 이름
+REFERENCE_FIELDS = {
+    0x0008_1155: 'instance',             # ReferencedSOPInstanceUID
+    0x0008_1160: 'frames',               # ReferencedFrameNumber
+    0x0062_000B: 'segments',             # ReferencedSegmentNumber
+}
+
+# GraphicData 좌표 수 (점 하나를 이루는 값의 수)
+GRAPHIC_DIMENSIONS = {'SCOORD': 2, 'SCOORD3D': 3}
+
+# 문자 집합과 관계없이 ASCII로 인코딩되는 VR
+ASCII_VRS = frozenset(('AE', 'AS', 'CS', 'DA', 'DS', 'DT', 'IS', 'TM', 'UI'))
+
+# SpecificCharacterSet에 따라 디코딩하는 문자열 VR
+TEXT_VRS = frozenset(('LO', 'LT', 'PN', 'SH', 'ST', 'UC', 'UT'))
+
+# 앞쪽 공백도 값에 포함되는 텍스트 VR (끝의 채움 문자만 제거)
+LONG_TEXT_VRS = frozenset(('LT', 'ST', 'UT'))
+
+# 2진 수치 VR → (struct 형식 문자, 값 하나의 크기)
+BINARY_VRS = {
+    'FD': ('d', 8),
+    'FL': ('f', 4),
+    'SL': ('l', 4),
+    'SS': ('h', 2),
+    'UL': ('L', 4),
+    'US': ('H', 2),
+}
+
+def value_count(value):
+    """
+    요소 값의 개수(Value Multiplicity)를 반환합니다.
+    
+    Args:
+        value: 요소 값 (디코딩한 다중 값 문자열은 백슬래시로 구분됨)
+    
+    Returns:
+        int: 값의 개수
+    """
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return value.count('\\') + 1
+    if isinstance(value, (int, float)):
+        return 1
+    return len(value)
+
+# 태그 → DICOM 사전의 VR (Implicit VR 요소용 캐시, 찾을 수 없거나 VR이 하나로 정해지지 않으면 None)
+_dictionary_vrs = {}
+
+def dictionary_vr(tag):
+    """
+    Implicit VR로 읽어 VR이 없는 요소의 VR을 DICOM 사전에서 찾습니다.
+    
+    Args:
+        tag (int): 요소 태그
+    
+    Returns:
+        str: VR 또는 None (사설 태그처럼 사전에 없거나 'US or SS'처럼 VR이 여러 개인 경우)
+    """
+    try:
+        return _dictionary_vrs[tag]
+    except KeyError:
+        pass
+    
+    from pydicom.datadict import dictionary_VR
+    
+    try:
+        vr = dictionary_VR(tag)
+    except KeyError:
+        vr = None
+    if vr is not None and ' or ' in vr:
+        vr = None
+    _dictionary_vrs[tag] = vr
+    return vr
+
+def text_encoding(specific_character_set):
+    """
+    SpecificCharacterSet에 해당하는 파이썬 인코딩을 반환합니다.
+    
+    ISO 2022 코드 확장(예: 'ISO 2022 IR 149')처럼 이스케이프 시퀀스로 문자 집합이 바뀌는
+    경우에는 바이트를 직접 디코딩할 수 없으므로 None을 반환합니다.
+    
+    Args:
+        specific_character_set (str or list): SpecificCharacterSet 값 (없으면 None)
+    
+    Returns:
+        str: 파이썬 인코딩 이름 또는 None
+    """
+    from pydicom.charset import default_encoding, python_encoding
+    
+    if not specific_character_set:
+        return default_encoding
+    if not isinstance(specific_character_set, str):
+        terms = [term for term in specific_character_set if term]
+        if len(terms) != 1:
+            return None
+        specific_character_set = terms[0]
+    
+    term = specific_character_set.strip()
+    if term.startswith('ISO 2022'):
+        return None
+    return python_encoding.get(term)
+
+class ContentItemExtractor:
+    """
+    콘텐츠 아이템 → SRNode 추출기
+    
+    ValueType별 값 처리 함수 표는 추출기를 만들 때 한 번만 만들고, 아이템마다 요소를
+    한 번만 훑으면서 태그 표(ITEM_FIELDS)에 있는 요소만 읽습니다. 키워드로 속성을 찾는
+    hasattr/getattr 대신 태그로 요소를 찾으며, 아직 변환되지 않은 문자열 요소(RawDataElement)는
+    pydicom의 값 변환을 거치지 않고 바이트를 바로 디코딩합니다.
+    """
+    
+    def __init__(self, codes, encoding='iso8859', logger=None):
+        """
+        ContentItemExtractor 클래스 초기화
+        
+        Args:
+            codes (CodeTable): 코드를 등록할 문서 코드 사전
+            encoding (str, optional): 문자열 요소를 디코딩할 파이썬 인코딩
+                (None이면 문자열 VR은 pydicom의 값 변환을 사용)
+            logger (logging.Logger, optional): 경고와 오류를 기록할 로거
+        """
+        self.codes = codes
+        self.encoding = encoding
+        self.logger = logger
+        
+        # ValueType → 값 처리 함수
+        self.value_handlers = {
+            'TEXT': self._text_value,
+            'CODE': self._code_value,
+            'NUM': self._num_value,
+            'CONTAINER': self._container_value,
+            'DATETIME': self._scalar_value,
+            'DATE': self._scalar_value,
+            'TIME': self._scalar_value,
+            'UIDREF': self._scalar_value,
+            'PNAME': self._scalar_value,
+            'IMAGE': self._reference_value,
+            'COMPOSITE': self._reference_value,
+            'WAVEFORM': self._reference_value,
+            'SCOORD': self._graphic_value,
+            'SCOORD3D': self._graphic_value,
+            'TCOORD': self._temporal_value,
+        }
+    
+    def extract(self, content_item, node_id):
+        """
+        콘텐츠 아이템에서 노드를 만듭니다.
+        
+        ValueType 없이 ReferencedContentItemIdentifier만 있는 아이템(by-reference 관계)은
+        REFERENCE 타입 노드가 되며, 가리키는 아이템의 위치 문자열을 reference에 가집니다.
+        
+        Args:
+            content_item: DICOM ContentItem (pydicom Dataset)
+            node_id (str): 노드 ID (콘텐츠 아이템 위치 문자열)
+        
+        Returns:
+            tuple: (SRNode, 자식 콘텐츠 아이템 시퀀스 또는 None)
+        """
+        fields = self.read_fields(content_item, ITEM_FIELDS)
+        children = fields.get('children')
+        
+        node = SRNode(node_id, self.codes)
+        relationship = fields.get('relationship')
+        if relationship:
+            node.relationship = sys.intern(relationship)
+        
+        value_type = fields.get('value_type')
+        if not value_type and 'reference' in fields:
+            reference = fields['reference']
+            node.type = 'REFERENCE'
+            node.reference = format_path((reference,) if isinstance(reference, int) else reference)
+            node.value = f"Reference : {node.reference}"
+            return node, children
+        if not value_type:
+            node.type = 'UNKNOWN'
+            node.value = 'Unknown content item'
+            return node, children
+        
+        # 반복되는 ValueType/RelationshipType 문자열은 intern하여 노드 간에 공유
+        node.type = sys.intern(value_type)
+        node.name_code = self._code_id(fields.get('name'))
+        
+        handler = self.value_handlers.get(value_type, self._default_value)
+        handler(fields, node)
+        return node, children
+    
+    def read_fields(self, dataset, field_tags):
+        """
+        데이터셋의 요소를 한 번 훑으면서 태그 표에 있는 요소의 값을 읽습니다.
+        
+        Args:
+            dataset: pydicom Dataset
+            field_tags (dict): 태그 → 필드 이름
+        
+        Returns:
+            dict: 필드 이름 → 값 (값이 비어 있는 요소는 제외)
+        """
+        fields = {}
+        for tag, element in dataset.items():
+            field = field_tags.get(tag)
+            if field is None:
+                continue
+            value = self._element_value(dataset, tag, element)
+            if value is not None and value != '':
+                fields[field] = value
+        return fields
+    
+    def _element_value(self, dataset, tag, element):
+        """
+        요소의 값을 반환합니다.
+        
+        읽기만 하고 아직 변환되지 않은 문자열과 2진 수치 요소는 바이트를 직접 디코딩하고,
+        그 밖의 요소(시퀀스, 2진 VR, 지연 로딩된 값 등)는 pydicom의 값 변환을 사용합니다.
+        Implicit VR로 읽은 요소는 DICOM 사전의 VR을 사용합니다.
+        
+        Args:
+            dataset: 요소가 속한 pydicom Dataset
+            tag (BaseTag): 요소 태그
+            element: DataElement 또는 RawDataElement
+        
+        Returns:
+            값 (문자열 요소는 앞뒤 공백을 제거한 str - LT/ST/UT는 끝의 공백만 제거,
+                다중 값 2진 수치 요소는 tuple)
+        """
+        vr = element.VR
+        if getattr(element, 'is_raw', False):
+            raw = element.value
+            if vr is None:
+                vr = dictionary_vr(tag)
+            if isinstance(raw, bytes):
+                if vr in ASCII_VRS:
+                    return raw.decode('ascii', 'replace').strip(' \0')
+                if vr in TEXT_VRS and self.encoding is not None:
+                    text = raw.decode(self.encoding, 'replace')
+                    return text.rstrip(' \0') if vr in LONG_TEXT_VRS else text.strip(' \0')
+                if vr in BINARY_VRS:
+                    code, size = BINARY_VRS[vr]
+                    order = '<' if element.is_little_endian else '>'
+                    values = struct.unpack(f'{order}{len(raw) // size}{code}', raw[:len(raw) - len(raw) % size])
+                    return values[0] if len(values) == 1 else values
+            converted = dataset[tag]
+            value, vr = converted.value, converted.VR
+        else:
+            value = element.value
+        
+        if value is None:
+            return None
+        if isinstance(value, str):
+            if vr in LONG_TEXT_VRS:
+                return value.rstrip(' \0')
+            return value.strip()
+        if vr == 'PN':
+            return str(value).strip()
+        return value
+    
+    def _code_id(self, code_sequence):
+        """
+        코드 시퀀스의 첫 번째 코드를 문서 코드 사전에 등록하고 코드 ID를 반환합니다.
+        
+        Args:
+            code_sequence: 코드 시퀀스 (없으면 None)
+        
+        Returns:
+            int: 코드 ID 또는 None
+        """
+        if not code_sequence:
+            return None
+        
+        try:
+            code = ['', '', '']
+            for tag, element in code_sequence[0].items():
+                position = CODE_FIELDS.get(tag)
+                if position is None or code[position]:
+                    continue
+                value = self._element_value(code_sequence[0], tag, element)
+                if value:
+                    code[position] = str(value)
+            return self.codes.intern(*code)
+        except Exception as e:
+            if self.logger is not None:
+                self.logger.error(f"Code Sequence 정보 추출 중 오류 발생: {e}")
+            return None
+    
+    def _label(self, node):
+        """
+        개념 이름 코드의 (CodeMeaning, 'CodeValue CodingSchemeDesignator')를 반환합니다.
+        
+        Returns:
+            tuple: (이름, 코드 문자열) 또는 개념 이름이 없으면 None
+        """
+        if node.name_code is None:
+            return None
+        name_value, name_scheme, name_meaning = self.codes.get(node.name_code)
+        return name_meaning, f"{name_value} {name_scheme}"
+    
+    def _set_detail(self, node, detail):
+        """
+        'CodeMeaning : 값 (CodeValue CodingSchemeDesignator)' 형식으로 노드 값을 설정합니다.
+        
+        개념 이름이 없으면 'ValueType : 값' 형식을 사용합니다.
+        """
+        label = self._label(node)
+        if label is None:
+            node.value = f"{node.type} : {detail}"
+        else:
+            node.value = f"{label[0]} : {detail} ({label[1]})"
+    
+    def _text_value(self, fields, node):
+        """TEXT 타입 값 처리"""
+        label = self._label(node)
+        if 'text' in fields and label is not None:
+            node.value = f"{label[0]} : {fields['text']} ({label[1]})"
+    
+    def _code_value(self, fields, node):
+        """CODE 타입 값 처리"""
+        concept_code = self._code_id(fields.get('concept'))
+        if concept_code is None:
+            return
+        node.concept_code = concept_code
+        label = self._label(node)
+        if label is not None:
+            code_value, _, code_meaning = self.codes.get(concept_code)
+            node.value = f"{label[0]} ({label[1]}) : {code_meaning} ({code_value})"
+    
+    def _num_value(self, fields, node):
+        """NUM 타입 값 처리"""
+        measured = fields.get('measured')
+        if not measured:
+            return
+        
+        measured = self.read_fields(measured[0], MEASURED_FIELDS)
+        num_value = measured.get('numeric')
+        if num_value is None:
+            return
+        
+        # 범위 검색용 수치 (DS 문자열보다 정밀한 FloatingPointValue가 있으면 우선 사용하되,
+        # NaN이나 무한대이면 NumericValue 사용)
+        try:
+            numeric = measured.get('floating')
+            if not numeric or not math.isfinite(numeric):
+                numeric = num_value
+            node.numeric = float(numeric)
+        except (TypeError, ValueError):
+            if self.logger is not None:
+                self.logger.warning(f"NumericValue를 수치로 변환할 수 없습니다: {num_value}")
+        
+        node.unit_code = self._code_id(measured.get('unit'))
+        
+        label = self._label(node)
+        if label is not None:
+            node.value = f"{label[0]} : {num_value} ({label[1]})"
+    
+    def _container_value(self, fields, node):
+        """CONTAINER 타입 값 처리"""
+        label = self._label(node)
+        if label is not None:
+            node.value = f"{label[0]} ({label[1]})"
+    
+    def _scalar_value(self, fields, node):
+        """DATETIME, DATE, TIME, UIDREF, PNAME 타입 값 처리"""
+        if 'scalar' in fields:
+            self._set_detail(node, fields['scalar'])
+        else:
+            self._default_value(fields, node)
+    
+    def _reference_value(self, fields, node):
+        """IMAGE, COMPOSITE, WAVEFORM 타입 값 처리 (참조하는 SOP Instance UID)"""
+        references = fields.get('referenced_sop')
+        if not references:
+            self._default_value(fields, node)
+            return
+        
+        reference = self.read_fields(references[0], REFERENCE_FIELDS)
+        detail = reference.get('instance', '')
+        for key, title in (('frames', 'frames'), ('segments', 'segments')):
+            if key in reference:
+                detail += f" [{title} {reference[key]}]"
+        self._set_detail(node, detail.strip())
+    
+    def _graphic_value(self, fields, node):
+        """SCOORD, SCOORD3D 타입 값 처리 (GraphicType과 점 수)"""
+        graphic_type = fields.get('graphic_type', '')
+        points = value_count(fields.get('graphic_data')) // GRAPHIC_DIMENSIONS[node.type]
+        self._set_detail(node, f"{graphic_type} ({points} points)".strip())
+    
+    def _temporal_value(self, fields, node):
+        """TCOORD 타입 값 처리 (TemporalRangeType과 참조 위치 수)"""
+        range_type = fields.get('temporal_range_type', '')
+        points = value_count(fields.get('temporal_points'))
+        self._set_detail(node, f"{range_type} ({points} points)".strip())
+    
+    def _default_value(self, fields, node):
+        """기본 ValueType 처리"""
+        node.value = f"ValueType: {node.type}"
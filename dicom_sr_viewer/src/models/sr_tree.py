@@ -0,0 +1,261 @@
+"""
+SR 트리 노드 모듈
+DICOM SR 콘텐츠 아이템을 적은 메모리로 표현하는 노드 클래스와 문서 단위 코드 사전을 제공합니다.
+"""
+
+import math
+from collections.abc import Mapping
+
+# dict 키 → 노드 슬롯 이름
+NODE_KEYS = {
+    'id': 'id',
+    'type': 'type',
+    'value': 'value',
+    'numeric': 'numeric',
+    'relationship': 'relationship',
+    'reference': 'reference',
+    'children': 'children',
+}
+
+# 코드 dict 키 → (코드 ID 슬롯, 코드 튜플 안의 위치)
+CODE_KEYS = {
+    'NameCodeMeaning': ('name_code', 2),
+    'NameCodeValue': ('name_code', 0),
+    'NameCodingSchemeDesignator': ('name_code', 1),
+    'CodeMeaning': ('concept_code', 2),
+    'CodeValue': ('concept_code', 0),
+    'CodingSchemeDesignator': ('concept_code', 1),
+    'UnitCodeMeaning': ('unit_code', 2),
+    'UnitCodeValue': ('unit_code', 0),
+    'UnitCodingSchemeDesignator': ('unit_code', 1),
+}
+
+def format_path(path):
+    """
+    콘텐츠 아이템 위치 튜플을 "1.2.3" 형식 문자열로 변환합니다.
+    
+    Args:
+        path (tuple): 1부터 시작하는 콘텐츠 아이템 위치
+    
+    Returns:
+        str: 점으로 구분한 위치 문자열
+    """
+    return '.'.join(map(str, path))
+
+def parse_path(text):
+    """
+    "1.2.3" 형식 위치 문자열을 위치 튜플로 변환합니다.
+    
+    Args:
+        text (str or tuple): 위치 문자열 (이미 튜플이면 그대로 반환)
+    
+    Returns:
+        tuple: 1부터 시작하는 콘텐츠 아이템 위치 또는 None (형식이 잘못된 경우)
+    """
+    if isinstance(text, tuple):
+        return text
+    try:
+        path = tuple(int(position) for position in str(text).split('.'))
+    except ValueError:
+        return None
+    if not path or min(path) < 1:
+        return None
+    return path
+
+class CodeTable:
+    """
+    문서 단위 코드 사전
+    
+    (CodeValue, CodingSchemeDesignator, CodeMeaning) 코드 튜플을 한 번만 저장하고
+    작은 정수 ID를 부여합니다. 노드는 코드 ID만 가지므로 같은 코드가 반복되어도
+    문자열은 한 벌만 유지되며, 코드 비교는 정수 비교로 이루어집니다.
+    """
+    
+    def __init__(self):
+        """CodeTable 클래스 초기화"""
+        self.codes = []
+        self._ids = {}
+        self._by_value = {}
+    
+    def intern(self, code_value, coding_scheme, code_meaning):
+        """
+        코드 튜플을 등록하고 ID를 반환합니다. 이미 등록된 코드는 기존 ID를 반환합니다.
+        
+        Args:
+            code_value (str): CodeValue
+            coding_scheme (str): CodingSchemeDesignator
+            code_meaning (str): CodeMeaning
+        
+        Returns:
+            int: 코드 ID
+        """
+        key = (code_value, coding_scheme, code_meaning)
+        code_id = self._ids.get(key)
+        if code_id is None:
+            code_id = len(self.codes)
+            self.codes.append(key)
+            self._ids[key] = code_id
+            self._by_value.setdefault(code_value, []).append(code_id)
+        return code_id
+    
+    def get(self, code_id):
+        """
+        코드 ID에 해당하는 코드 튜플을 반환합니다.
+        
+        Args:
+            code_id (int): 코드 ID
+        
+        Returns:
+            tuple: (CodeValue, CodingSchemeDesignator, CodeMeaning)
+        """
+        return self.codes[code_id]
+    
+    def find(self, code_value, coding_scheme=None):
+        """
+        CodeValue(와 CodingSchemeDesignator)가 일치하는 코드 ID를 찾습니다.
+        
+        같은 코드라도 CodeMeaning은 다르게 기록될 수 있으므로 비교하지 않습니다.
+        
+        Args:
+            code_value (str): CodeValue
+            coding_scheme (str, optional): CodingSchemeDesignator
+        
+        Returns:
+            set: 일치하는 코드 ID 집합
+        """
+        code_ids = self._by_value.get(code_value, [])
+        if coding_scheme is None:
+            return set(code_ids)
+        return {code_id for code_id in code_ids if self.codes[code_id][1] == coding_scheme}
+    
+    def __len__(self):
+        return len(self.codes)
+
+class SRNode(Mapping):
+    """
+    SR 콘텐츠 아이템 하나를 나타내는 노드
+    
+    __slots__를 사용하여 노드마다 dict를 만들지 않으며, 값이 없는 항목은 None으로 둡니다.
+    코드 정보는 문서의 CodeTable에 한 번만 저장하고 노드는 코드 ID만 가집니다.
+    노드 ID는 문서 안에서 유일한 콘텐츠 아이템 위치 문자열(예: "1.2.3")입니다.
+    기존 dict 노드와 같은 키('type', 'value', 'NameCodeMeaning', 'children' 등)로
+    읽을 수 있는 읽기 위주의 dict 호환 인터페이스를 제공하므로 검색기와 트리 뷰에서
+    dict 노드와 동일하게 사용할 수 있습니다. 값이 None인 키는 없는 키로 취급합니다.
+    
+    노드 비교는 dict와 달리 내용이 아닌 객체 동일성으로 이루어집니다.
+    """
+    
+    __slots__ = ('index', 'id', 'type', 'value', 'numeric', 'relationship', 'reference',
+                 'codes', 'name_code', 'concept_code', 'unit_code',
+                 'children')
+    
+    def __init__(self, node_id, codes, index=-1):
+        """
+        SRNode 클래스 초기화
+        
+        Args:
+            node_id (str): 노드 ID (콘텐츠 아이템 위치 문자열, 예: "1.2.3")
+            codes (CodeTable): 코드 ID를 해석할 문서의 코드 사전
+            index (int, optional): 문서 안에서의 노드 번호 (파싱 순서)
+        """
+        self.index = index
+        self.id = node_id
+        self.type = None
+        self.value = None
+        # NUM 아이템의 수치 (float)
+        self.numeric = None
+        self.relationship = None
+        # 참조로 연결된(by-reference) 아이템이 가리키는 콘텐츠 아이템 위치 문자열
+        self.reference = None
+        self.codes = codes
+        self.name_code = None
+        self.concept_code = None
+        self.unit_code = None
+        self.children = []
+    
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        # 코드 정보는 CodeTable을 통해서만 설정
+        slot = NODE_KEYS.get(key)
+        if slot is None:
+            raise KeyError(key)
+        setattr(self, slot, value)
+    
+    def get(self, key, default=None):
+        slot = NODE_KEYS.get(key)
+        if slot is not None:
+            value = getattr(self, slot)
+            return default if value is None else value
+        
+        code_key = CODE_KEYS.get(key)
+        if code_key is not None:
+            code_id = getattr(self, code_key[0])
+            if code_id is not None:
+                return self.codes.codes[code_id][code_key[1]]
+        return default
+    
+    def __contains__(self, key):
+        return self.get(key) is not None
+    
+    def __iter__(self):
+        for key, slot in NODE_KEYS.items():
+            if getattr(self, slot) is not None:
+                yield key
+        for key, (slot, _) in CODE_KEYS.items():
+            if getattr(self, slot) is not None:
+                yield key
+    
+    def __len__(self):
+        return sum(1 for _ in self)
+    
+    # dict 호환 인터페이스를 쓰더라도 비교와 해시는 객체 동일성 기준
+    __eq__ = object.__eq__
+    __ne__ = object.__ne__
+    __hash__ = object.__hash__
+    
+    def __repr__(self):
+        return f"SRNode({self.id!r}, type={self.type!r}, value={self.value!r})"
+    
+    def to_dict(self):
+        """
+        자식 노드를 제외한 노드 정보를 dict로 반환합니다.
+        
+        NaN이나 무한대인 수치는 JSON으로 쓸 수 있도록 None으로 바꿉니다.
+        
+        Returns:
+            dict: 'children'을 제외한 노드 정보
+        """
+        fields = {key: self[key] for key in self if key != 'children'}
+        if self.numeric is not None and not math.isfinite(self.numeric):
+            fields['numeric'] = None
+        return fields
+
+def tree_to_dicts(root):
+    """
+    노드 트리를 기존 형식의 중첩 dict 트리로 변환합니다.
+    
+    Args:
+        root (Mapping): 루트 노드
+    
+    Returns:
+        dict: 'children' 리스트를 포함하는 중첩 dict 트리
+    """
+    root_dict = {key: root[key] for key in root if key != 'children'}
+    root_dict['children'] = []
+    
+    # 재귀 없이 변환하도록 (원본 노드, 변환된 dict) 스택 사용
+    stack = [(root, root_dict)]
+    while stack:
+        node, node_dict = stack.pop()
+        for child in node.get('children', []):
+            child_dict = {key: child[key] for key in child if key != 'children'}
+            child_dict['children'] = []
+            node_dict['children'].append(child_dict)
+            stack.append((child, child_dict))
+    
+    return root_dict
@@ -0,0 +1,100 @@
+"""
+아카이브 검색 대화상자 모듈
+아카이브 전문 검색 인덱스에서 문서와 아이템을 찾고, 결과를 선택하면 해당 아이템을 엽니다.
+"""
+
+import os
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QLabel, QAbstractItemView)
+from PyQt5.QtCore import Qt, pyqtSignal
+
+from models.profiling import profiler
+
+# 한 번에 표시할 최대 결과 수
+ARCHIVE_RESULT_LIMIT = 500
+
+# 결과 표 열 제목
+RESULT_COLUMNS = ['파일', '위치', 'ValueType', '값']
+
+class ArchiveSearchDialog(QDialog):
+    """아카이브 인덱스 검색 대화상자"""
+    
+    # 결과를 선택했을 때 발생하는 시그널 (파일 경로, 아이템 위치 "1.2.3")
+    item_activated = pyqtSignal(str, str)
+    
+    def __init__(self, archive_index, parent=None):
+        """
+        ArchiveSearchDialog 클래스 초기화
+        
+        Args:
+            archive_index (ArchiveIndex): 검색할 아카이브 인덱스
+            parent (QWidget, optional): 부모 위젯
+        """
+        super().__init__(parent)
+        self.archive_index = archive_index
+        self.setWindowTitle('아카이브 검색')
+        self.resize(900, 500)
+        
+        layout = QVBoxLayout(self)
+        
+        # 검색어 입력창과 검색 버튼
+        input_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText('소견, 코드 의미 등 검색어 입력 (모든 단어 포함)')
+        self.search_input.returnPressed.connect(self.search)
+        input_layout.addWidget(self.search_input)
+        
+        self.search_button = QPushButton('검색')
+        self.search_button.clicked.connect(self.search)
+        input_layout.addWidget(self.search_button)
+        layout.addLayout(input_layout)
+        
+        # 결과 표 (행을 더블클릭하면 해당 아이템을 엶)
+        self.result_table = QTableWidget(0, len(RESULT_COLUMNS))
+        self.result_table.setHorizontalHeaderLabels(RESULT_COLUMNS)
+        self.result_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.result_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.result_table.horizontalHeader().setSectionResizeMode(len(RESULT_COLUMNS) - 1, QHeaderView.Stretch)
+        self.result_table.cellDoubleClicked.connect(self._on_cell_double_clicked)
+        layout.addWidget(self.result_table)
+        
+        self.status_label = QLabel(f'인덱스: {archive_index.db_path}')
+        layout.addWidget(self.status_label)
+    
+    def search(self):
+        """입력된 검색어로 아카이브를 검색하여 결과 표를 채웁니다."""
+        text = self.search_input.text().strip()
+        if not text:
+            self.status_label.setText('검색어를 입력하세요')
+            return
+        
+        with profiler.span('archive.query') as span:
+            results = self.archive_index.query(text, prefix=True, limit=ARCHIVE_RESULT_LIMIT)
+            span.count('matches', len(results))
+        
+        self.result_table.setRowCount(len(results))
+        for row, result in enumerate(results):
+            file_item = QTableWidgetItem(os.path.basename(result['file']))
+            file_item.setToolTip(result['file'])
+            # 선택 시 사용할 전체 경로는 첫 번째 열에 저장
+            file_item.setData(Qt.UserRole, result['file'])
+            self.result_table.setItem(row, 0, file_item)
+            self.result_table.setItem(row, 1, QTableWidgetItem(result['path']))
+            self.result_table.setItem(row, 2, QTableWidgetItem(result['type'] or ''))
+            self.result_table.setItem(row, 3, QTableWidgetItem(result['value'] or ''))
+        
+        suffix = ' (최대 개수까지만 표시)' if len(results) >= ARCHIVE_RESULT_LIMIT else ''
+        self.status_label.setText(f'검색 결과: {len(results)}개 항목{suffix} - 더블클릭하면 해당 항목을 엽니다')
+    
+    def _on_cell_double_clicked(self, row, column):
+        """
+        결과 행 더블클릭 이벤트 핸들러
+        
+        Args:
+            row (int): 행 번호
+            column (int): 열 번호
+        """
+        file_path = self.result_table.item(row, 0).data(Qt.UserRole)
+        item_path = self.result_table.item(row, 1).text()
+        self.item_activated.emit(file_path, item_path)
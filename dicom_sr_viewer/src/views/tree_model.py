@@ -0,0 +1,421 @@
+"""
+DICOM SR 트리 모델 모듈
+파싱된 SR 트리를 QTreeView에 연결하는 지연 로딩 아이템 모델을 제공합니다.
+"""
+
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt
+from PyQt5.QtGui import QBrush
+
+from models.sr_tree import parse_path
+
+# fetchMore 한 번에 노출할 자식 행 수
+FETCH_BATCH_SIZE = 256
+
+# 열 머리글
+HEADER_LABELS = ["값", "항목"]
+
+class DicomSRTreeModel(QAbstractItemModel):
+    """
+    파싱된 SR 트리를 그대로 사용하는 아이템 모델
+    
+    노드마다 위젯 아이템을 만들지 않고, 뷰가 펼친 노드의 자식 행만
+    canFetchMore/fetchMore로 필요한 만큼 노출합니다. QModelIndex의 internalPointer는
+    트리 노드 객체(SRNode 또는 dict)를 가리킵니다.
+    
+    파서가 깊이/너비 제한 파싱으로 자식 노드를 아직 만들지 않은 노드는 set_expander로 설정한
+    파서를 통해 펼치거나 더 가져올 때 필요한 만큼만 만듭니다.
+    """
+    
+    def __init__(self, parent=None):
+        """DicomSRTreeModel 클래스 초기화"""
+        super().__init__(parent)
+        self._root = None
+        # 노드 객체 id → 노출된 자식 행 수
+        self._fetched = {}
+        # 노출된 노드 객체 id → (부모 노드, 행 번호)
+        self._parents = {}
+        # 노출 여부와 관계없는 전체 부모 사전 (index_for_node에서 처음 필요할 때 생성)
+        self._all_parents = None
+        # 하이라이트된 노드 객체 id → 노드
+        self._highlighted = {}
+        # 스트림으로 받은 노드의 깊이별 조상 노드
+        self._stream_stack = []
+        # 만들지 않은 자식 노드를 만드는 파서 (has_pending/expand 제공, 없으면 None)
+        self._expander = None
+        self._highlight_brush = QBrush(Qt.yellow)
+    
+    def set_root(self, root):
+        """
+        모델의 루트 노드를 설정합니다.
+        
+        Args:
+            root (Mapping): 루트 노드 (None이면 빈 모델)
+        """
+        self.beginResetModel()
+        self._root = root
+        self._fetched = {}
+        self._parents = {}
+        self._all_parents = None
+        self._highlighted = {}
+        self._stream_stack = []
+        self._expander = None
+        if root is not None:
+            self._parents[id(root)] = (None, 0)
+        self.endResetModel()
+    
+    def set_expander(self, expander):
+        """
+        자식 노드를 아직 만들지 않은 노드를 펼칠 때 사용할 파서를 설정합니다.
+        
+        Args:
+            expander (DicomSRParser): has_pending(node)와 expand(node, count)를 제공하는 파서 (None이면 사용하지 않음)
+        """
+        # 노출된 행의 펼침 표시(hasChildren)를 다시 확인하도록 배치만 갱신
+        self.layoutAboutToBeChanged.emit()
+        self._expander = expander
+        self.layoutChanged.emit()
+    
+    def root(self):
+        """
+        모델의 루트 노드를 반환합니다.
+        
+        Returns:
+            Mapping: 루트 노드 또는 None
+        """
+        return self._root
+    
+    def node_for_index(self, index):
+        """
+        인덱스에 연결된 노드를 반환합니다.
+        
+        Args:
+            index (QModelIndex): 모델 인덱스
+        
+        Returns:
+            Mapping: 노드 또는 None
+        """
+        if not index.isValid():
+            return None
+        return index.internalPointer()
+    
+    def node_for_path(self, path):
+        """
+        트리 위치에 있는 노드를 찾습니다.
+        
+        Args:
+            path (tuple or str): 1부터 시작하는 콘텐츠 아이템 위치 (예: (1, 2, 3) 또는 "1.2.3")
+        
+        Returns:
+            Mapping: 노드 또는 None (위치에 노드가 없는 경우)
+        """
+        path = parse_path(path)
+        if self._root is None or not path or path[0] != 1:
+            return None
+        
+        node = self._root
+        for position in path[1:]:
+            self._expand_to(node, position)
+            children = node.get('children', [])
+            if not 1 <= position <= len(children):
+                return None
+            node = children[position - 1]
+        return node
+    
+    def _children(self, node):
+        """노드의 자식 리스트를 반환합니다."""
+        return node.get('children', [])
+    
+    def _has_pending(self, node):
+        """노드에 파서가 아직 만들지 않은 자식 노드가 있는지 확인합니다."""
+        return self._expander is not None and self._expander.has_pending(node)
+    
+    def _expand_to(self, node, count):
+        """노드의 자식 노드가 count개가 될 때까지 파서에서 만듭니다."""
+        if self._has_pending(node):
+            self._expander.expand(node, count)
+    
+    # QAbstractItemModel 인터페이스
+    
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        
+        if not parent.isValid():
+            return self.createIndex(row, column, self._root)
+        
+        child = self._children(parent.internalPointer())[row]
+        return self.createIndex(row, column, child)
+    
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        
+        parent_node, _ = self._parents[id(index.internalPointer())]
+        if parent_node is None:
+            return QModelIndex()
+        
+        _, parent_row = self._parents[id(parent_node)]
+        return self.createIndex(parent_row, 0, parent_node)
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        if not parent.isValid():
+            return 0 if self._root is None else 1
+        return self._fetched.get(id(parent.internalPointer()), 0)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return len(HEADER_LABELS)
+    
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return self._root is not None
+        if parent.column() > 0:
+            return False
+        node = parent.internalPointer()
+        return len(self._children(node)) > 0 or self._has_pending(node)
+    
+    def canFetchMore(self, parent):
+        if not parent.isValid():
+            return False
+        node = parent.internalPointer()
+        return self._fetched.get(id(node), 0) < len(self._children(node)) or self._has_pending(node)
+    
+    def fetchMore(self, parent):
+        if not parent.isValid():
+            return
+        node = parent.internalPointer()
+        start = self._fetched.get(id(node), 0)
+        self._expand_to(node, start + FETCH_BATCH_SIZE)
+        children = self._children(node)
+        end = min(start + FETCH_BATCH_SIZE, len(children))
+        if start >= end:
+            return
+        self._expose_rows(parent, node, start, end)
+    
+    def is_exposed(self, node):
+        """
+        노드가 뷰에 행으로 노출되어 있는지 확인합니다.
+        
+        Args:
+            node (Mapping): 트리 노드
+        
+        Returns:
+            bool: 노출 여부
+        """
+        return id(node) in self._parents
+    
+    def open_node(self, node):
+        """
+        노출된 노드의 자식 행을 첫 묶음까지 노출하고, 스트림으로 이어서 들어오는 자식도
+        첫 묶음 크기까지는 바로 추가되도록 표시합니다.
+        
+        Args:
+            node (Mapping): 노출된 트리 노드
+        
+        Returns:
+            QModelIndex: 노드의 인덱스
+        """
+        index = self._index_of_exposed(node)
+        self._fetched.setdefault(id(node), 0)
+        if self.canFetchMore(index):
+            self.fetchMore(index)
+        return index
+    
+    def _expose_rows(self, parent_index, node, start, end):
+        """부모 노드의 자식 행 [start, end)를 뷰에 노출합니다."""
+        children = self._children(node)
+        self.beginInsertRows(parent_index, start, end - 1)
+        for row in range(start, end):
+            self._parents[id(children[row])] = (node, row)
+        self._fetched[id(node)] = end
+        self.endInsertRows()
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        
+        if role == Qt.DisplayRole:
+            if node is self._root:
+                if index.column() == 0:
+                    return str(node.get('value', 'DICOM SR Document'))
+                return ""
+            
+            if index.column() == 0:
+                return str(node.get('value', ''))
+            
+            # 관계 정보가 있으면 표시
+            node_type = node.get('type', '')
+            relationship = node.get('relationship', '')
+            if relationship:
+                return f"{relationship}: {node_type}"
+            return f"{node_type}"
+        
+        if role == Qt.BackgroundRole and id(node) in self._highlighted:
+            return self._highlight_brush
+        
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return HEADER_LABELS[section]
+        return None
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+    
+    # 노드 ↔ 인덱스 변환
+    
+    def index_for_node(self, node):
+        """
+        노드의 인덱스를 반환합니다. 아직 노출되지 않은 노드이면 조상 행을 먼저 노출합니다.
+        
+        Args:
+            node (Mapping): 트리 노드
+        
+        Returns:
+            QModelIndex: 노드의 인덱스 (트리에 없는 노드이면 잘못된 인덱스)
+        """
+        if id(node) not in self._parents:
+            chain = self._ancestor_chain(node)
+            if chain is None:
+                return QModelIndex()
+            
+            # 위에서부터 내려가며 필요한 행까지 노출
+            for parent_node, child_row in chain:
+                fetched = self._fetched.get(id(parent_node), 0)
+                if fetched <= child_row:
+                    parent_index = self._index_of_exposed(parent_node)
+                    self._expose_rows(parent_index, parent_node, fetched, child_row + 1)
+        
+        return self._index_of_exposed(node)
+    
+    def _index_of_exposed(self, node):
+        """이미 노출된 노드의 인덱스를 반환합니다."""
+        _, row = self._parents[id(node)]
+        return self.createIndex(row, 0, node)
+    
+    def _ancestor_chain(self, node):
+        """
+        루트에서 노드까지의 (부모 노드, 자식 행 번호) 목록을 반환합니다.
+        
+        노드 ID가 콘텐츠 아이템 위치 문자열이면 루트에서 위치를 따라 내려가므로 트리 깊이만큼만
+        확인하고, 그렇지 않은 노드(dict 트리 등)만 트리 전체의 부모 사전을 사용합니다.
+        
+        Returns:
+            list: 위에서부터의 (부모 노드, 자식 행 번호) 목록 또는 None
+        """
+        chain = self._path_chain(node)
+        if chain is not None:
+            return chain
+        
+        if self._all_parents is None:
+            self._build_all_parents()
+        
+        chain = []
+        while id(node) in self._all_parents:
+            parent_node, row = self._all_parents[id(node)]
+            if parent_node is None:
+                chain.reverse()
+                return chain
+            chain.append((parent_node, row))
+            node = parent_node
+        return None
+    
+    def _path_chain(self, node):
+        """
+        노드 ID(위치 문자열)를 따라 루트에서 내려가며 (부모 노드, 자식 행 번호) 목록을 만듭니다.
+        
+        Returns:
+            list: 위에서부터의 (부모 노드, 자식 행 번호) 목록 또는 None (ID가 위치가 아니거나 다른 노드인 경우)
+        """
+        path = parse_path(node.get('id', ''))
+        if self._root is None or path is None or path[0] != 1:
+            return None
+        
+        chain = []
+        current = self._root
+        for position in path[1:]:
+            self._expand_to(current, position)
+            children = self._children(current)
+            if position > len(children):
+                return None
+            chain.append((current, position - 1))
+            current = children[position - 1]
+        return chain if current is node else None
+    
+    def _build_all_parents(self):
+        """트리 전체를 한 번 순회하여 부모 사전을 만듭니다."""
+        self._all_parents = {}
+        if self._root is None:
+            return
+        
+        self._all_parents[id(self._root)] = (None, 0)
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for row, child in enumerate(self._children(node)):
+                self._all_parents[id(child)] = (node, row)
+                stack.append(child)
+    
+    # 스트리밍
+    
+    def append_nodes(self, entries):
+        """
+        파서 스트림에서 새로 만들어진 노드를 모델에 반영합니다.
+        
+        노드는 이미 부모의 children에 연결되어 있으므로, 자식 행을 노출 중인 부모에
+        바로 이어지는 행만 첫 묶음 크기까지 추가하고 나머지는 canFetchMore로 필요할 때 노출합니다.
+        
+        Args:
+            entries (iterable): 전위 순서의 (path, depth, node) 튜플 목록
+        """
+        for path, depth, node in entries:
+            # 현재 깊이보다 깊은 조상 노드는 더 이상 부모가 될 수 없음
+            del self._stream_stack[depth:]
+            self._stream_stack.append(node)
+            
+            if depth == 0:
+                self.set_root(node)
+                self._stream_stack = [node]
+                continue
+            
+            parent_node = self._stream_stack[depth - 1]
+            row = path[-1] - 1
+            if self._all_parents is not None:
+                self._all_parents[id(node)] = (parent_node, row)
+            
+            fetched = self._fetched.get(id(parent_node))
+            if fetched == row and row < FETCH_BATCH_SIZE and id(parent_node) in self._parents:
+                self._expose_rows(self._index_of_exposed(parent_node), parent_node, row, row + 1)
+    
+    # 하이라이트
+    
+    def set_highlighted(self, nodes):
+        """
+        하이라이트할 노드를 설정하고, 이전 결과와 달라진 노출 행만 갱신합니다.
+        
+        Args:
+            nodes (iterable): 하이라이트할 노드
+        
+        Returns:
+            list: 새로 하이라이트된 노드 리스트
+        """
+        highlighted = {id(node): node for node in nodes}
+        
+        changed = [node for key, node in self._highlighted.items() if key not in highlighted]
+        added = [node for key, node in highlighted.items() if key not in self._highlighted]
+        self._highlighted = highlighted
+        
+        last_column = len(HEADER_LABELS) - 1
+        for node in changed + added:
+            # 노출되지 않은 행은 나중에 노출될 때 data()에서 반영됨
+            if id(node) in self._parents:
+                _, row = self._parents[id(node)]
+                self.dataChanged.emit(self.createIndex(row, 0, node),
+                                      self.createIndex(row, last_column, node),
+                                      [Qt.BackgroundRole])
+        return added
@@ -3,166 +3,203 @@ DICOM SR 트리 뷰 모듈
 DICOM SR 데이터를 트리 형태로 시각화하는 기능을 제공합니다.
 """
 
-from PyQt5.QtWidgets import QTreeWidget, QTreeWidgetItem, QWidget, QVBoxLayout, QLabel
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import QTreeView, QWidget, QVBoxLayout
+from PyQt5.QtCore import QPoint, pyqtSignal
+
+from models.profiling import profiler
+from views.tree_model import DicomSRTreeModel
+
+# 처음 표시할 때 펼쳐 둘 깊이 (루트가 0)
+DEFAULT_EXPAND_DEPTH = 2
 
 class DicomSRTreeView(QWidget):
     """DICOM SR 데이터를 트리 형태로 시각화하는 위젯"""
     
     # 노드 선택 시 발생하는 시그널
-    node_selected = pyqtSignal(dict)
+    node_selected = pyqtSignal(object)
+    
+    # 참조 대상 아이템이 트리에 없을 때 발생하는 시그널 (참조 위치 문자열)
+    reference_not_found = pyqtSignal(str)
     
     def __init__(self, parent=None):
         """DicomSRTreeView 클래스 초기화"""
         super().__init__(parent)
-        self.tree_widget = QTreeWidget()
-        self.tree_widget.setHeaderLabels(["값", "항목"])
-        self.tree_widget.setColumnWidth(0, 300)
+        self.model = DicomSRTreeModel(self)
+        self.tree_view = QTreeView()
+        self.tree_view.setModel(self.model)
+        self.tree_view.setColumnWidth(0, 300)
+        self.tree_view.setUniformRowHeights(True)
         
         # 레이아웃 설정
         layout = QVBoxLayout()
-        layout.addWidget(self.tree_widget)
+        layout.addWidget(self.tree_view)
         self.setLayout(layout)
         
         # 트리 아이템 선택 시 이벤트 연결
-        self.tree_widget.itemClicked.connect(self._on_item_clicked)
+        self.tree_view.clicked.connect(self._on_item_clicked)
         
-        # 노드 데이터를 저장할 딕셔너리
-        self.node_data = {}
+        # 참조로 연결된 아이템을 더블클릭하면 참조 대상으로 이동
+        self.tree_view.doubleClicked.connect(self._on_item_double_clicked)
+        
+        # 스크롤이 끝에 닿으면 일부만 노출된 자식 행을 더 가져옴
+        self.tree_view.verticalScrollBar().valueChanged.connect(self._on_scrolled)
     
     def set_tree_data(self, tree_data):
         """
-        트리 데이터를 설정하고 트리 위젯을 업데이트합니다.
+        트리 데이터를 설정하고 트리 뷰를 업데이트합니다.
+        
+        노드마다 위젯 아이템을 만들지 않고, 펼쳐진 노드의 자식만 모델이 필요할 때 노출합니다.
         
         Args:
-            tree_data (dict): 트리 구조의 DICOM SR 데이터
+            tree_data (Mapping): 트리 구조의 DICOM SR 데이터 (SRNode 또는 dict)
         """
         if tree_data is None:
             return
         
-        # 트리 위젯 초기화
-        self.tree_widget.clear()
-        self.node_data = {}
-        
-        # 루트 노드 생성
-        root_item = QTreeWidgetItem(self.tree_widget)
-        root_item.setText(0, tree_data.get('value', 'DICOM SR Document'))
-        root_item.setText(1, "")
-        
-        # 노드 ID와 트리 아이템 연결
-        self.node_data[id(root_item)] = tree_data
-        
-        # 자식 노드 추가
-        if 'children' in tree_data:
-            self._add_children(root_item, tree_data['children'])
-        
-        # 트리 확장
-        self.tree_widget.expandAll()
+        with profiler.span('tree_view.populate'):
+            # 트리 뷰 초기화
+            self.clear()
+            self.model.set_root(tree_data)
+            
+            # 처음 몇 단계만 펼침 (노출된 노드만 순회)
+            stack = [(tree_data, 0)]
+            while stack:
+                node, depth = stack.pop()
+                if depth >= DEFAULT_EXPAND_DEPTH or not self.model.is_exposed(node):
+                    continue
+                self._expand_node(node)
+                for child in node.get('children', []):
+                    stack.append((child, depth + 1))
     
-    def _add_children(self, parent_item, children):
+    def append_nodes(self, entries):
         """
-        부모 아이템에 자식 노드를 추가합니다.
+        전위 순서의 (path, depth, node) 목록을 트리에 추가합니다.
         
         Args:
-            parent_item (QTreeWidgetItem): 부모 트리 아이템
-            children (list): 자식 노드 리스트
+            entries (iterable): (path, depth, node) 튜플 목록
         """
-        for child in children:
-            item = QTreeWidgetItem(parent_item)
-            
-            # 노드 타입과 값 표시
-            node_type = child.get('type', '')
-            node_value = child.get('value', '')
-            
-            # 관계 정보가 있으면 표시
-            relationship = child.get('relationship', '')
-            NodeType = f"{node_type}"
-            if relationship:
-                NodeType = f"{relationship}: {NodeType}"
+        entries = list(entries)
+        with profiler.span('tree_view.append', items=len(entries)):
+            self.model.append_nodes(entries)
             
-            item.setText(0, str(node_value))
-            item.setText(1, NodeType)
-            
-            # 노드 ID와 트리 아이템 연결
-            self.node_data[id(item)] = child
-            
-            # 자식 노드가 있으면 재귀적으로 추가
-            if 'children' in child and child['children']:
-                self._add_children(item, child['children'])
+            # 처음 몇 단계의 노드는 노출되는 대로 펼침
+            for _, depth, node in entries:
+                if depth < DEFAULT_EXPAND_DEPTH and self.model.is_exposed(node):
+                    self._expand_node(node)
+    
+    def set_expander(self, expander):
+        """
+        깊이/너비 제한 파싱으로 자식 노드를 아직 만들지 않은 노드를 펼칠 때 사용할 파서를 설정합니다.
+        
+        Args:
+            expander (DicomSRParser): 트리를 파싱한 파서 (None이면 사용하지 않음)
+        """
+        self.model.set_expander(expander)
+    
+    def _expand_node(self, node):
+        """노출된 노드의 자식 행을 가져오고 펼칩니다."""
+        index = self.model.open_node(node)
+        self.tree_view.expand(index)
+    
+    def clear(self):
+        """트리 뷰를 초기화합니다."""
+        self.model.set_root(None)
     
-    def _on_item_clicked(self, item, column):
+    def _on_item_clicked(self, index):
         """
         트리 아이템 클릭 이벤트 핸들러
         
         Args:
-            item (QTreeWidgetItem): 클릭된 트리 아이템
-            column (int): 클릭된 컬럼 인덱스
+            index (QModelIndex): 클릭된 아이템의 인덱스
         """
-        # 아이템에 연결된 노드 데이터 가져오기
-        node_data = self.node_data.get(id(item))
-        if node_data:
+        # 인덱스에 연결된 노드 데이터 가져오기
+        node_data = self.model.node_for_index(index)
+        if node_data is not None:
             # 노드 선택 시그널 발생
             self.node_selected.emit(node_data)
     
-    def highlight_search_results(self, search_results):
+    def _on_item_double_clicked(self, index):
         """
-        검색 결과를 하이라이트합니다.
+        트리 아이템 더블클릭 이벤트 핸들러 - 참조로 연결된 아이템이면 참조 대상 아이템을 선택합니다.
         
         Args:
-            search_results (list): 검색 결과 노드 리스트
+            index (QModelIndex): 더블클릭된 아이템의 인덱스
         """
-        # 모든 아이템의 배경색 초기화
-        self._reset_highlight()
-        
-        if not search_results:
+        node_data = self.model.node_for_index(index)
+        if node_data is None or not node_data.get('reference'):
             return
         
-        # 검색 결과에 해당하는 아이템 찾아서 하이라이트
-        for item in self._get_all_items():
-            node_data = self.node_data.get(id(item))
-            if node_data in search_results:
-                # 검색 결과 하이라이트
-                item.setBackground(0, Qt.yellow)
-                item.setBackground(1, Qt.yellow)
-                
-                # 부모 아이템들 확장
-                parent = item.parent()
-                while parent:
-                    parent.setExpanded(True)
-                    parent = parent.parent()
-    
-    def _reset_highlight(self):
-        """모든 아이템의 배경색을 초기화합니다."""
-        for item in self._get_all_items():
-            item.setBackground(0, Qt.transparent)
-            item.setBackground(1, Qt.transparent)
+        if not self.select_path(node_data['reference']):
+            self.reference_not_found.emit(node_data['reference'])
     
-    def _get_all_items(self):
+    def _on_scrolled(self, value):
         """
-        트리 위젯의 모든 아이템을 반환합니다.
+        스크롤 이벤트 핸들러
         
-        Returns:
-            list: 모든 트리 아이템 리스트
+        화면 맨 아래 행의 조상 중 자식 행이 일부만 노출된 노드가 있으면 다음 묶음을 노출합니다.
+        
+        Args:
+            value (int): 스크롤 위치
+        """
+        if value < self.tree_view.verticalScrollBar().maximum():
+            return
+        
+        viewport = self.tree_view.viewport()
+        index = self.tree_view.indexAt(QPoint(1, viewport.height() - 1))
+        while index.isValid():
+            parent = index.parent()
+            if parent.isValid() and self.model.canFetchMore(parent):
+                self.model.fetchMore(parent)
+            index = parent
+    
+    def select_path(self, path):
         """
-        all_items = []
+        트리 위치의 노드를 선택하고 화면에 보이도록 조상 노드를 펼친 뒤 스크롤합니다.
         
-        # 루트 아이템 가져오기
-        for i in range(self.tree_widget.topLevelItemCount()):
-            top_item = self.tree_widget.topLevelItem(i)
-            all_items.append(top_item)
-            self._get_child_items(top_item, all_items)
+        Args:
+            path (tuple or str): 1부터 시작하는 콘텐츠 아이템 위치 (예: (1, 2, 3) 또는 "1.2.3")
         
-        return all_items
+        Returns:
+            bool: 노드를 찾았으면 True
+        """
+        node = self.model.node_for_path(path)
+        if node is None:
+            return False
+        
+        index = self.model.index_for_node(node)
+        parent = index.parent()
+        while parent.isValid():
+            self.tree_view.expand(parent)
+            parent = parent.parent()
+        
+        self.tree_view.setCurrentIndex(index)
+        self.tree_view.scrollTo(index, QTreeView.PositionAtCenter)
+        self.node_selected.emit(node)
+        return True
     
-    def _get_child_items(self, parent_item, items_list):
+    def highlight_search_results(self, search_results):
         """
-        부모 아이템의 모든 자식 아이템을 재귀적으로 가져옵니다.
+        검색 결과를 하이라이트합니다.
+        
+        이전 결과와 달라진 행만 갱신하고, 새로 추가된 결과의 조상 노드만 펼칩니다.
         
         Args:
-            parent_item (QTreeWidgetItem): 부모 트리 아이템
-            items_list (list): 아이템을 추가할 리스트
+            search_results (list): 검색 결과 노드 리스트
         """
-        for i in range(parent_item.childCount()):
-            child = parent_item.child(i)
-            items_list.append(child)
-            self._get_child_items(child, items_list)
+        with profiler.span('tree_view.highlight') as span:
+            added = self.model.set_highlighted(search_results or [])
+            span.count('added', len(added))
+            if not added:
+                return
+            
+            # 펼칠 때마다 화면 배치를 다시 계산하지 않도록 배치를 한 번으로 미룸
+            self.tree_view.scheduleDelayedItemsLayout()
+            
+            for node in added:
+                index = self.model.index_for_node(node)
+                
+                # 부모 아이템들 확장
+                parent = index.parent()
+                while parent.isValid():
+                    self.tree_view.expand(parent)
+                    parent = parent.parent()